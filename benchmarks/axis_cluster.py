@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+
+# The package sits one level up and common.py next to this script,
+# make both importable however the script is started
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pyaccelstepper.accel_stepper import AccelStepper, InterfaceType
+from pyaccelstepper.axis_server import AxisServer, AxisCoordinator
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+def make_stepper():
+    """Stepper of a node, its steps only call an empty function.
+
+    Returns:
+        AccelStepper: Stepper.
+    """
+
+    def step():
+        pass
+
+    stepper = AccelStepper(cb_cw=[step], cb_ccw=[step],
+        interface=InterfaceType.FUNCTION, enable=True)
+    stepper.max_speed = 2000.0
+    stepper.acceleration = 2000.0
+
+    return stepper
+
+def serve(axes, addresses):
+    """Node process, hosts its axes until the coordinator closes it.
+
+    Args:
+        axes (int): Axes of the node.
+        addresses (Queue): The node puts its address here.
+    """
+
+    server = AxisServer([make_stepper() for _ in range(axes)])
+    addresses.put(server.address)
+    server.serve_forever()
+
+def main():
+    """Main function
+    """
+
+    parser = argparse.ArgumentParser(description="Synchronized moves over local axis server nodes.")
+    parser.add_argument("--nodes", type=int, default=3, help="Node processes.")
+    parser.add_argument("--axes", type=int, default=6, help="Axes per node.")
+    parser.add_argument("--moves", type=int, default=5, help="Moves to run.")
+    parser.add_argument("--lead", type=float, default=0.05, help="Seconds from the plan to the start.")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed of the targets.")
+    args = parser.parse_args()
+
+    addresses = multiprocessing.Queue()
+    nodes = [multiprocessing.Process(target=serve, args=(args.axes, addresses))
+        for _ in range(args.nodes)]
+    for node in nodes:
+        node.start()
+
+    coordinator = AxisCoordinator([addresses.get() for _ in nodes], timeout=60.0)
+    print(f"{args.nodes} nodes, {sum(coordinator.axes)} axes")
+
+    for index, result in enumerate(coordinator.ping()):
+        print(f"node {index}: round trip {result['round_trip'] * 1e6:8.1f} us, "
+            f"clock offset {result['offset'] * 1e6:8.1f} us")
+
+    generator = random.Random(args.seed)
+    start_skews = []
+    arrival_skews = []
+    for _ in range(args.moves):
+        targets = [generator.randint(-1000, 1000) for _ in range(sum(coordinator.axes))]
+        result = coordinator.run_to(targets, args.lead)
+        positions = [position for node in result["nodes"] for position in node["positions"]]
+        start_skews.append(result["start_skew"])
+        arrival_skews.append(result["arrival_skew"])
+        print(f"move {result['duration']:6.3f} s, start late {result['start_late'] * 1e6:8.1f} us, "
+            f"start skew {result['start_skew'] * 1e6:8.1f} us, "
+            f"arrival skew {result['arrival_skew'] * 1e6:8.1f} us, "
+            f"on target {positions == targets}")
+
+    print(f"median start skew {statistics.median(start_skews) * 1e6:.1f} us, "
+        f"median arrival skew {statistics.median(arrival_skews) * 1e6:.1f} us")
+
+    coordinator.close(shutdown=True)
+    for node in nodes:
+        node.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import time
+
+from pyaccelstepper.accel_stepper import IController
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class NullController(IController):
+    """Controller that drops every signal."""
+
+    def pin_mode(self, pin, mode):
+        pass
+
+    def digital_write(self, pin, state):
+        pass
+
+class CountingController(IController):
+    """Controller that only counts the signals."""
+
+    def __init__(self, config={}):
+        super().__init__(config)
+        self.writes = 0
+
+    def pin_mode(self, pin, mode):
+        pass
+
+    def digital_write(self, pin, state):
+        self.writes += 1
+
+class FakeClock:
+    """Clock that moves a fixed tick on every reading."""
+
+    def __init__(self, tick):
+        self.now = 0.0
+        self.tick = tick
+
+    def __call__(self):
+        self.now += self.tick
+        return self.now
+
+def best_ns_per_call(function, calls, repeats=15, budget_ns=5000000):
+    """Time a function and keep the best of the repeats.
+
+    Slow functions get fewer calls, so a repeat stays inside the budget.
+
+    Args:
+        function (function): Function without arguments.
+        calls (int): Most calls per repeat.
+        repeats (int, optional): Repeats. Defaults to 15.
+        budget_ns (int, optional): Time budget of a repeat. Defaults to 5 ms.
+
+    Returns:
+        float: Nanoseconds per call.
+    """
+
+    start = time.perf_counter_ns()
+    function()
+    estimate = max(time.perf_counter_ns() - start, 1)
+    calls = max(min(calls, budget_ns // estimate), 10)
+
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            function()
+        elapsed = time.perf_counter_ns() - start
+        if (best is None) or (elapsed < best):
+            best = elapsed
+
+    return best / calls
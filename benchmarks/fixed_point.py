@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import gc
+import os
+import sys
+import time
+
+# The package sits one level up and common.py next to this script,
+# make both importable however the script is started
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pyaccelstepper.accel_stepper import AccelStepper, InterfaceType
+from pyaccelstepper.fixed_point import FixedPointStepper
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+STEPS = 20000
+"""Steps per engine."""
+
+DISTANCE = 2000
+"""Length of the back and forth moves in steps."""
+
+#endregion
+
+class FloatClock:
+    """Clock of the float path, jumps a millisecond per reading."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 0.001
+        return self.now
+
+class TicksClock:
+    """Clock of the fixed point path, jumps a millisecond per reading."""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1000
+        return self.now
+
+def elapsed_us(start):
+    if hasattr(time, "ticks_us"):
+        return time.ticks_diff(time.ticks_us(), start)
+    return (time.perf_counter_ns() // 1000) - start
+
+def now_us():
+    if hasattr(time, "ticks_us"):
+        return time.ticks_us()
+    return time.perf_counter_ns() // 1000
+
+def mem_free():
+    if hasattr(gc, "mem_free"):
+        return gc.mem_free()
+    return None
+
+def benchmark(name, stepper):
+    """Run back and forth moves and measure the step rate and the heap drift.
+
+    Args:
+        name (str): Engine name.
+        stepper (object): AccelStepper or FixedPointStepper.
+    """
+
+    # Fast enough that every run() steps, so the engine cost is measured.
+    stepper.max_speed = 1000000.0
+    stepper.acceleration = 1000000.0
+
+    gc.collect()
+    gc.disable()
+    free_before = mem_free()
+
+    steps = 0
+    target = DISTANCE
+    start = now_us()
+    while steps < STEPS:
+        stepper.move_to(target)
+        while stepper.run():
+            steps += 1
+        target = -target
+    duration = elapsed_us(start)
+
+    free_after = mem_free()
+    gc.enable()
+
+    drift = "n/a"
+    if free_before is not None:
+        drift = free_before - free_after
+
+    print("{}\t{:10.0f}\t{}".format(name.ljust(12), steps * 1000000.0 / duration, drift))
+
+def main():
+    """Main function"""
+
+    print("engine\t\tsteps/s\t\tgc.mem_free() drift [bytes]")
+    benchmark("float", AccelStepper(interface=InterfaceType.FUNCTION, clock=FloatClock()))
+    benchmark("fixed point", FixedPointStepper(interface=InterfaceType.FUNCTION, ticks=TicksClock()))
+
+if __name__ == "__main__":
+    main()
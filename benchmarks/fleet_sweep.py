@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# The package sits one level up and common.py next to this script,
+# make both importable however the script is started
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pyaccelstepper import fleet
+from pyaccelstepper.fleet import Fleet
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+def make_moves(count, seed):
+    """Random moves for the sweep.
+
+    Args:
+        count (int): Number of moves.
+        seed (int): Random seed.
+
+    Returns:
+        tuple: Distances, maximum speeds, accelerations and decelerations.
+    """
+
+    generator = random.Random(seed)
+    distances = [generator.randint(1, 4000) for _ in range(count)]
+    max_speeds = [generator.uniform(100.0, 3000.0) for _ in range(count)]
+    accelerations = [generator.uniform(100.0, 5000.0) for _ in range(count)]
+    decelerations = [generator.choice([0.0, generator.uniform(20.0, 5000.0)]) for _ in range(count)]
+
+    return distances, max_speeds, accelerations, decelerations
+
+def mismatches(reference, results):
+    """Moves where the results differ from the reference.
+
+    Args:
+        reference (dict): Results of AccelStepper.
+        results (dict): Results to check.
+
+    Returns:
+        list: Indices of the moves.
+    """
+
+    return [index for index in range(len(reference["steps"]))
+        if any(reference[key][index] != results[key][index] for key in fleet.RESULT_KEYS)]
+
+def report(name, count, duration):
+    print("{}\t{:10.3f} s\t{:10.0f} moves/s".format(name.ljust(22), duration, count / duration))
+
+def main():
+    """Main function"""
+
+    parser = argparse.ArgumentParser(description="Batch fleet simulation throughput.")
+    parser.add_argument("--moves", type=int, default=4000, help="Number of moves.")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed.")
+    args = parser.parse_args()
+
+    moves = make_moves(args.moves, args.seed)
+
+    start = time.perf_counter()
+    reference = Fleet.simulate(*moves, vectorize=False)
+    report("AccelStepper", args.moves, time.perf_counter() - start)
+
+    if fleet.numpy is not None:
+        start = time.perf_counter()
+        results = Fleet.simulate(*moves)
+        report("NumPy", args.moves, time.perf_counter() - start)
+
+        # The vectorized copy of the state machine must step as AccelStepper does.
+        different = mismatches(reference, results)
+        if different:
+            print("NumPy differs from AccelStepper in {} moves, first {}".format(len(different), different[0]))
+            sys.exit(1)
+
+    processes = 1
+    while processes <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        Fleet.simulate_parallel(*moves, processes=processes)
+        report("pool of {}".format(processes), args.moves, time.perf_counter() - start)
+        processes *= 2
+
+if __name__ == "__main__":
+    main()
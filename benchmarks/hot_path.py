@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+# The package sits one level up and common.py next to this script,
+# make both importable however the script is started
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pyaccelstepper.accel_stepper import AccelStepper, InterfaceType, MultiStepper
+from pyaccelstepper.simulation import VirtualClock
+
+from common import NullController, FakeClock, best_ns_per_call
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+CALLS = 20000
+"""Calls per repeat."""
+
+AXES = [1, 6, 10]
+"""MultiStepper sizes."""
+
+FAR = 10 ** 9
+"""Target that is never reached during a benchmark."""
+
+#endregion
+
+def interfaces():
+    """All interface types by name."""
+
+    names = []
+    for name in dir(InterfaceType):
+        if not name.startswith("_"):
+            names.append((name, getattr(InterfaceType, name)))
+
+    return sorted(names, key=lambda item: item[1])
+
+def create_stepper(interface, inverted, clock):
+    stepper = AccelStepper(
+        interface=interface,
+        controller=NullController(),
+        clock=clock,
+        pins=[4, 5, 6, 7],
+        pins_inverted=[inverted, inverted, inverted, inverted],
+        enable=True
+        )
+    stepper.min_pulse_width = 0
+    stepper.max_speed = 100000.0
+    stepper.acceleration = 1000000.0
+
+    return stepper
+
+def bench_stepper(interface, inverted):
+    """Benchmark the single axis hot path.
+
+    Returns:
+        dict: Nanoseconds per call by metric name.
+    """
+
+    results = {}
+
+    # No step is due, the cost of polling.
+    stepper = create_stepper(interface, inverted, VirtualClock())
+    stepper.move_to(FAR)
+    results["run_idle"] = best_ns_per_call(stepper.run, CALLS)
+
+    # A step on every call, the cost of a step with the speed update.
+    stepper = create_stepper(interface, inverted, FakeClock(1.0))
+    stepper.move_to(FAR)
+    results["run_step"] = best_ns_per_call(stepper.run, CALLS)
+
+    # A constant speed step on every call.
+    stepper = create_stepper(interface, inverted, FakeClock(1.0))
+    stepper.move_to(FAR)
+    stepper.speed = 1000.0
+    results["run_speed_step"] = best_ns_per_call(stepper.run_speed, CALLS)
+
+    # The speed update alone.
+    stepper = create_stepper(interface, inverted, VirtualClock())
+    stepper.move_to(FAR)
+    results["compute_new_speed"] = best_ns_per_call(
+        stepper._AccelStepper__compute_new_speed, CALLS)
+
+    return results
+
+def bench_multi_stepper(interface, inverted, axes):
+    """Benchmark MultiStepper.run with every axis stepping on every call.
+
+    Returns:
+        float: Nanoseconds per call.
+    """
+
+    clock = FakeClock(1.0)
+    multi_stepper = MultiStepper()
+    for _ in range(axes):
+        multi_stepper.add(create_stepper(interface, inverted, clock))
+    multi_stepper.move_to([FAR] * axes)
+
+    return best_ns_per_call(multi_stepper.run, CALLS // axes)
+
+def run_suite():
+    """Run every benchmark.
+
+    Returns:
+        dict: Nanoseconds per call by benchmark name.
+    """
+
+    results = {}
+
+    for name, interface in interfaces():
+        for inverted in [False, True]:
+            prefix = "{}/{}".format(name, "inverted" if inverted else "plain")
+
+            for metric, value in bench_stepper(interface, inverted).items():
+                results["{}/{}".format(prefix, metric)] = value
+
+            for axes in AXES:
+                results["{}/multi_stepper_run_{}".format(prefix, axes)] = \
+                    bench_multi_stepper(interface, inverted, axes)
+
+    return results
+
+def compare(results, baseline, tolerance):
+    """Compare against a baseline.
+
+    Args:
+        results (dict): Current results.
+        baseline (dict): Baseline results.
+        tolerance (float): Allowed slow down, 0.2 is 20 %.
+
+    Returns:
+        list: Regressions as (name, baseline, current).
+    """
+
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        if value > baseline[name] * (1.0 + tolerance):
+            regressions.append((name, baseline[name], value))
+
+    return regressions
+
+def main():
+    """Main function"""
+
+    parser = argparse.ArgumentParser(description="Stepping hot path micro benchmarks.")
+    parser.add_argument("--output", help="Save the results as JSON.")
+    parser.add_argument("--baseline", help="Fail if slower than this saved JSON.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slow down, 0.25 is 25 %%.")
+    args = parser.parse_args()
+
+    results = run_suite()
+
+    for name in sorted(results):
+        print("{}\t{:10.0f} ns".format(name.ljust(48), results[name]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "python": sys.version,
+                "platform": platform.platform(),
+                "results": results,
+                }, f, indent=4, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["results"]
+
+        regressions = compare(results, baseline, args.tolerance)
+        for name, before, after in regressions:
+            print("REGRESSION {}: {:.0f} ns -> {:.0f} ns".format(name, before, after))
+
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import gc
+import os
+import sys
+import time
+
+# The package sits one level up and common.py next to this script,
+# make both importable however the script is started, os.path is not on MicroPython
+if sys.implementation.name != "micropython":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+REPEATS = 5
+"""Fresh interpreters per configuration, the best time is kept."""
+
+#endregion
+
+def step():
+    pass
+
+def core():
+    import pyaccelstepper.accel_stepper
+
+def function():
+    from pyaccelstepper.accel_stepper import AccelStepper
+    from pyaccelstepper.constants import InterfaceType
+    AccelStepper(interface=InterfaceType.FUNCTION, cb_cw=[step], cb_ccw=[step])
+
+def driver():
+    from pyaccelstepper.accel_stepper import AccelStepper
+    from pyaccelstepper.constants import InterfaceType
+    AccelStepper(interface=InterfaceType.DRIVER, pins=[0, 1])
+
+def coils():
+    from pyaccelstepper.accel_stepper import AccelStepper
+    from pyaccelstepper.constants import InterfaceType
+    AccelStepper(interface=InterfaceType.HALF4WIRE, pins=[0, 1, 2, 3])
+
+def multi_stepper():
+    from pyaccelstepper.accel_stepper import AccelStepper
+    from pyaccelstepper.constants import InterfaceType
+    from pyaccelstepper.multi_stepper import MultiStepper
+    group = MultiStepper()
+    for _ in range(2):
+        group.add(AccelStepper(interface=InterfaceType.DRIVER, pins=[0, 1]))
+
+def s_curve():
+    from pyaccelstepper.accel_stepper import AccelStepper
+    from pyaccelstepper.constants import InterfaceType, ProfileType
+    stepper = AccelStepper(interface=InterfaceType.DRIVER, pins=[0, 1],
+        profile_type=ProfileType.SCURVE, jerk=10000.0)
+    stepper.max_speed = 1000.0
+    stepper.acceleration = 1000.0
+    stepper.move_to(100)
+
+def rig():
+    from pyaccelstepper.rig import Rig
+    Rig({"axes": {"x": {"interface": "DRIVER", "pins": [0, 1]},
+        "y": {"interface": "DRIVER", "pins": [2, 3]}}, "groups": {"xy": ["x", "y"]}})
+
+CONFIGURATIONS = (
+    ("core", core),
+    ("function", function),
+    ("driver", driver),
+    ("coils", coils),
+    ("multi_stepper", multi_stepper),
+    ("s_curve", s_curve),
+    ("rig", rig),
+    )
+"""Configurations, each imports and builds only what it uses."""
+
+def now_us():
+    if hasattr(time, "ticks_us"):
+        return time.ticks_us()
+    return time.perf_counter_ns() // 1000
+
+def elapsed_us(start):
+    if hasattr(time, "ticks_us"):
+        return time.ticks_diff(time.ticks_us(), start)
+    return (time.perf_counter_ns() // 1000) - start
+
+def purge():
+    """Forget the loaded modules of the package, the next import loads them again."""
+
+    for name in [name for name in sys.modules if name.startswith("pyaccelstepper")]:
+        del sys.modules[name]
+
+def modules():
+    return sorted([name[15:] for name in sys.modules
+        if name.startswith("pyaccelstepper.")])
+
+def measure(build, memory=True):
+    """Import and build a configuration.
+
+    Args:
+        build (function): Configuration.
+        memory (bool, optional): Measure the heap. Defaults to True.
+
+    Returns:
+        tuple: Microseconds, bytes or None, loaded modules.
+    """
+
+    purge()
+    gc.collect()
+
+    tracemalloc = None
+    free_before = None
+    if memory:
+        if hasattr(gc, "mem_free"):
+            free_before = gc.mem_free()
+        else:
+            # CPython, it slows the imports down so the time is measured apart.
+            import tracemalloc
+            tracemalloc.start()
+
+    start = now_us()
+    build()
+    duration = elapsed_us(start)
+
+    used = None
+    if memory:
+        gc.collect()
+        if free_before is not None:
+            used = free_before - gc.mem_free()
+        else:
+            used = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+    return duration, used, modules()
+
+def child(name, memory):
+    """Run a configuration in a fresh interpreter, CPython keeps the standard modules loaded.
+
+    Args:
+        name (str): Configuration name.
+        memory (bool): Measure the heap.
+
+    Returns:
+        tuple: Microseconds, bytes or None, loaded modules.
+    """
+
+    import json
+    import subprocess
+
+    output = subprocess.check_output([sys.executable, __file__, name, str(int(memory))])
+
+    return tuple(json.loads(output))
+
+def main():
+    """Main function"""
+
+    builds = dict(CONFIGURATIONS)
+
+    if len(sys.argv) == 3:
+        import json
+        print(json.dumps(measure(builds[sys.argv[1]], sys.argv[2] == "1")))
+        return
+
+    fresh = sys.implementation.name != "micropython"
+
+    print("configuration\timport [us]\theap [bytes]\tmodules")
+    for name, build in CONFIGURATIONS:
+        if fresh:
+            # The first run writes the bytecode caches.
+            child(name, False)
+            duration = min([child(name, False)[0] for _ in range(REPEATS)])
+            _, used, loaded = child(name, True)
+        else:
+            duration, used, loaded = measure(build)
+        print("{}\t{:10d}\t{:10}\t{}".format(name.ljust(14), duration, used, " ".join(loaded)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# The package sits one level up and common.py next to this script,
+# make both importable however the script is started
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pyaccelstepper.accel_stepper import AccelStepper, InterfaceType, MultiStepper, ProfileType
+from pyaccelstepper.simulation import VirtualClock
+
+from common import CountingController
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+POLL_PERIOD = 0.00002
+"""Simulated time of one pass of the step loop in seconds."""
+
+PULSE_US = 2
+"""Step pulse half period of the example in microseconds."""
+
+TASKS = [
+    # a1, a2, a3, a5 (the base, shoulder, elbow and gripper joints)
+    ("above pick", (0.35, 0.12, 0.12, 0.35)),
+    ("down to pick", (0.35, 0.30, 0.25, 0.35)),
+    ("grip", (0.35, 0.30, 0.25, 0.05)),
+    ("lift", (0.35, 0.12, 0.12, 0.05)),
+    ("above place", (-0.40, 0.12, 0.12, 0.05)),
+    ("down to place", (-0.40, 0.28, 0.22, 0.05)),
+    ("release", (-0.40, 0.28, 0.22, 0.35)),
+    ("lift", (-0.40, 0.12, 0.12, 0.35)),
+    ("home", (0.0, 0.0, 0.0, 0.0)),
+    ]
+"""Pick and place task list in joint units of examples/robko01_kin_ex.py."""
+
+WRIST_TASKS = [
+    ("pitch", (200, 200)),
+    ("roll", (-200, 200)),
+    ("back", (-200, -200)),
+    ("unroll", (200, -200)),
+    ]
+"""Differential wrist moves of the ld / rd pair in steps."""
+
+#endregion
+
+class SimulatedRobot():
+    """Robko01 of examples/robko01_kin_ex.py on a simulated controller."""
+
+    S1 = -59800 / 90
+    S2 = 59200 / 90
+    S3 = -36100 / 90.7
+    S5 = 500
+    S5A2 = -(55000 / 90) * 0.04
+    S5A3 = (55000 / 90) * 0.7
+
+    def __init__(self, clock, profile_type, jerk):
+
+        self.__clock = clock
+        self.__controller = CountingController()
+        self.__pins = {
+            "base": (4, 0),
+            "shoulder": (17, 16),
+            "elbow": (12, 13),
+            "ld": (27, 14),
+            "rd": (25, 26),
+            "gripper": (32, 33),
+            }
+
+        self.__positions = [0, 0, 0, 0]
+        self.__a5_offset_a2_a3_ = 0
+        self.__oldA2 = 0
+        self.__oldA3 = 0
+
+        self.__base = self.__create("base", 1000.0, 1000.0)
+        self.__shoulder = self.__create("shoulder", 500.0, 500.0)
+        self.__elbow = self.__create("elbow", 500.0, 500.0)
+        self.__gripper = self.__create("gripper", 500.0, 500.0)
+        self.__ld = self.__create("ld", 1500.0, 1000.0)
+        self.__rd = self.__create("rd", 1500.0, 1000.0)
+
+        self.__kinematics_controller = MultiStepper(profile_type, jerk)
+        self.__kinematics_controller.add(self.__elbow)
+        self.__kinematics_controller.add(self.__shoulder)
+        self.__kinematics_controller.add(self.__base)
+        self.__kinematics_controller.add(self.__gripper)
+        self.kinematic_axes = [self.__elbow, self.__shoulder, self.__base, self.__gripper]
+
+        self.__pr_controller = MultiStepper(profile_type, jerk)
+        self.__pr_controller.add(self.__ld)
+        self.__pr_controller.add(self.__rd)
+        self.wrist_axes = [self.__ld, self.__rd]
+
+    @property
+    def writes(self):
+        return self.__controller.writes
+
+    def __pulse(self, axis, direction):
+        dir_pin, step_pin = self.__pins[axis]
+        self.__controller.digital_write(dir_pin, direction)
+        self.__controller.digital_write(step_pin, 1)
+        self.__clock.now += PULSE_US / 1000000
+        self.__controller.digital_write(step_pin, 0)
+        self.__clock.now += PULSE_US / 1000000
+        self.__controller.digital_write(step_pin, 1)
+
+    def __create(self, axis, max_speed, acceleration):
+        stepper = AccelStepper(
+            cb_cw=[lambda: self.__pulse(axis, 1)],
+            cb_ccw=[lambda: self.__pulse(axis, 0)],
+            interface=InterfaceType.FUNCTION,
+            clock=self.__clock,
+            enable=True
+            )
+        stepper.speed_scale = 1
+        stepper.max_speed = max_speed
+        stepper.acceleration = acceleration
+        stepper.speed = 1.0
+
+        return stepper
+
+    def joint_targets(self, a1, a2, a3, a5):
+        """Step targets of a task, as send_task_to_steppers() computes them."""
+
+        a5 = a5 * SimulatedRobot.S5
+
+        self.__a5_offset_a2_a3_ = self.__a5_offset_a2_a3_ + SimulatedRobot.S5A2 * (a2 - self.__oldA2) + SimulatedRobot.S5A3 * (a3 - self.__oldA3)
+        a5 = a5 + self.__a5_offset_a2_a3_
+        self.__oldA2 = a2
+        self.__oldA3 = a3
+
+        self.__positions[0] = round(a1 * SimulatedRobot.S1)
+        self.__positions[1] = round(a2 * SimulatedRobot.S2)
+        self.__positions[2] = round(a3 * SimulatedRobot.S3)
+        self.__positions[3] = round(a5)
+
+        return list(self.__positions)
+
+    def move(self, controller, axes, positions):
+        """Run one synchronized move to the end.
+
+        Returns:
+            tuple: Duration and arrival skew in seconds.
+        """
+
+        start = self.__clock.now
+        controller.move_to(positions)
+
+        arrivals = [None] * len(axes)
+        for index in range(len(axes)):
+            if axes[index].distance_to_go == 0:
+                arrivals[index] = start
+
+        while controller.run():
+            self.__clock.now += POLL_PERIOD
+            for index in range(len(axes)):
+                if (arrivals[index] is None) and (axes[index].distance_to_go == 0):
+                    arrivals[index] = self.__clock.now
+
+        end = self.__clock.now
+        for index in range(len(axes)):
+            if arrivals[index] is None:
+                arrivals[index] = end
+
+        # Reset position controllers for the next round, as the example does.
+        for axis in axes:
+            axis.set_current_position(0)
+
+        moved = [arrivals[index] for index in range(len(axes)) if positions[index] != 0]
+        skew = 0.0
+        if moved:
+            skew = max(moved) - min(moved)
+
+        return end - start, skew
+
+    def run_cycle(self):
+        """Run the pick and place task list and the wrist moves.
+
+        Returns:
+            list: (name, duration, skew) per move.
+        """
+
+        report = []
+
+        for name, joints in TASKS:
+            positions = self.joint_targets(*joints)
+            duration, skew = self.move(self.__kinematics_controller, self.kinematic_axes, positions)
+            report.append((name, duration, skew))
+
+        for name, positions in WRIST_TASKS:
+            duration, skew = self.move(self.__pr_controller, self.wrist_axes, list(positions))
+            report.append((name, duration, skew))
+
+        return report
+
+def main():
+    """Main function"""
+
+    parser = argparse.ArgumentParser(description="Robko01 pick and place cycle time on a simulated controller.")
+    parser.add_argument("--jerk", type=float, default=0.0, help="Use synchronized S-curves with this jerk.")
+    args = parser.parse_args()
+
+    profile_type = ProfileType.TRAPEZOID
+    if args.jerk > 0.0:
+        profile_type = ProfileType.SCURVE
+
+    clock = VirtualClock()
+    robot = SimulatedRobot(clock, profile_type, args.jerk)
+
+    cpu_start = time.process_time()
+    report = robot.run_cycle()
+    cpu_time = time.process_time() - cpu_start
+
+    print("move\t\tduration [s]\tskew [ms]")
+    for name, duration, skew in report:
+        print("{}\t{:10.3f}\t{:10.3f}".format(name.ljust(14), duration, skew * 1000))
+
+    cycle_time = clock.now
+    print("")
+    print("simulated cycle time:\t\t{:.3f} s".format(cycle_time))
+    print("host CPU per simulated second:\t{:.3f} s".format(cpu_time / cycle_time))
+    print("max arrival skew:\t\t{:.3f} ms".format(max([skew for name, duration, skew in report]) * 1000))
+    print("pin writes:\t\t\t{}".format(robot.writes))
+
+if __name__ == "__main__":
+    main()
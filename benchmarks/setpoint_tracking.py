@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import math
+import os
+import sys
+import time
+
+# The package sits one level up and common.py next to this script,
+# make both importable however the script is started
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pyaccelstepper.accel_stepper import AccelStepper, InterfaceType
+from pyaccelstepper.simulation import VirtualClock
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+UPDATE_RATE = 1000.0
+"""Setpoint update rate in Hz."""
+
+POLL_PERIOD = 0.00002
+"""Simulated time between two run() calls in seconds."""
+
+DURATION = 4.0
+"""Simulated length of the run in seconds."""
+
+AMPLITUDE = 2000.0
+"""Setpoint amplitude in steps."""
+
+PERIOD = 1.5
+"""Setpoint period in seconds."""
+
+#endregion
+
+def create_stepper(clock):
+    stepper = AccelStepper(interface=InterfaceType.FUNCTION, clock=clock)
+    stepper.max_speed = 20000.0
+    stepper.acceleration = 100000.0
+    return stepper
+
+def benchmark(mode):
+    """Follow a sine setpoint and measure the tracking error and the update cost.
+
+    Args:
+        mode (str): "move_to", "track" or "track_velocity".
+
+    Returns:
+        dict: Results.
+    """
+
+    clock = VirtualClock()
+    stepper = create_stepper(clock)
+
+    polls_per_update = int(round(1.0 / (UPDATE_RATE * POLL_PERIOD)))
+    updates = int(DURATION * UPDATE_RATE)
+    omega = 2.0 * math.pi / PERIOD
+
+    errors = []
+    update_ns = 0
+
+    for update in range(updates):
+        t = update / UPDATE_RATE
+        setpoint = round(AMPLITUDE * math.sin(omega * t))
+        velocity = AMPLITUDE * omega * math.cos(omega * t)
+
+        errors.append(abs(setpoint - stepper.current_position))
+
+        begin = time.perf_counter_ns()
+        if mode == "move_to":
+            stepper.move_to(setpoint)
+        elif mode == "track":
+            stepper.track(setpoint)
+        else:
+            stepper.track(setpoint, velocity)
+        update_ns += time.perf_counter_ns() - begin
+
+        for _ in range(polls_per_update):
+            clock.now += POLL_PERIOD
+            stepper.run()
+
+    # Skip the first period while the axis catches up from rest.
+    settled = errors[int(PERIOD * UPDATE_RATE):]
+
+    return {
+        "mode": mode,
+        "rms_error": math.sqrt(sum([e * e for e in settled]) / len(settled)),
+        "max_error": max(settled),
+        "ns_per_update": update_ns / updates,
+        }
+
+def main():
+    """Main function"""
+
+    print("mode\t\trms [steps]\tmax [steps]\tupdate [ns]")
+    for mode in ["move_to", "track", "track_velocity"]:
+        result = benchmark(mode)
+        print("{}\t{:10.1f}\t{:10d}\t{:10.0f}".format(
+            result["mode"].ljust(14),
+            result["rms_error"],
+            result["max_error"],
+            result["ns_per_update"]))
+
+if __name__ == "__main__":
+    main()
@@ -29,7 +29,7 @@ SOFTWARE.
 import signal
 import time
 
-from pyaccelstepper.accel_stepper import AccelStepper, InterfaceType
+from pyaccelstepper.accel_stepper import AccelStepper, InterfaceType, Deferred
 
 #region File Attributes
 
@@ -69,15 +69,12 @@ __time_to_stop = False
 
 #endregion
 
-def cw():
-    global __motor_controller
+def cw(position, direction, due):
+    # Deferred, printing in the step loop would cap the step rate.
+    print(f"CW\t{position}\t{due}\t{time.time()}")
 
-    print(f"CW\t{__motor_controller.current_position}\t{time.time()}")
-
-def ccw():
-    global __motor_controller
-
-    print(f"CCW\t{__motor_controller.current_position}\t{time.time()}")
+def ccw(position, direction, due):
+    print(f"CCW\t{position}\t{due}\t{time.time()}")
 
 def interrupt_handler(signum, frame):
     """Interrupt handler."""
@@ -105,8 +102,8 @@ def main():
     interface=InterfaceType.FUNCTION
 
     __motor_controller = AccelStepper(
-        cb_cw=[cw],
-        cb_ccw=[ccw],
+        cb_cw=[Deferred(cw)],
+        cb_ccw=[Deferred(ccw)],
         interface=interface,
         pins=[4,5,6,7],
         pins_inverted=[False, False, False, False],
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import os
+import time
+
+from pyaccelstepper.rig import Rig
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+def make_functions(names):
+    """Step callbacks that print the axis and the direction.
+
+    Args:
+        names (list): Axis names.
+
+    Returns:
+        dict: Callbacks by name.
+    """
+
+    functions = {}
+    for name in names:
+        functions[name + "_cw"] = lambda name=name: print(f"{name}\tCW")
+        functions[name + "_ccw"] = lambda name=name: print(f"{name}\tCCW")
+
+    return functions
+
+def main():
+    """Main function
+    """
+
+    path = os.path.join(os.path.dirname(__file__), "robko01_rig.json")
+
+    start = time.perf_counter()
+    rig = Rig(path, functions=make_functions(
+        ["base", "shoulder", "elbow", "gripper", "ld", "rd"]))
+    print(f"Rig {rig.config_hash[:8]} built in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    kinematics = rig["kinematics"]
+    kinematics.move_to([3, -2, 4, 1])
+    kinematics.run_speed_to_position()
+
+if __name__ == "__main__":
+    main()
@@ -28,7 +28,12 @@ SOFTWARE.
 
 import time
 import math
-import platform
+from array import array
+
+from pyaccelstepper.clock import Clock, PlatformType
+from pyaccelstepper.constants import Direction, HookEvent, InterfaceType, \
+    MotionPhase, PreflightMode, ProfileType
+from pyaccelstepper.controller import Edge, IController, PinMode, PinState, Utils
 
 #region File Attributes
 
@@ -56,122 +61,71 @@ __email__ = "robko01@8bitclub.com"
 __status__ = "Debug"
 """File status."""
 
-#endregion
-
-class Utils:
-    """Utilities"""
-
-    @staticmethod
-    def constrain(value, min, max):
-
-        output = value
-
-        if value < min:
-            output = min
-
-        elif value > max:
-            output = max
+__all__ = ["AccelStepper", "Clock", "Deferred", "Direction", "Edge", "HookEvent",
+    "IController", "InterfaceType", "MotionPhase", "MultiStepper", "PinMode", "PinState",
+    "PlatformType", "PreflightMode", "ProfileType", "Utils"]
+"""Names of a star import, MultiStepper still loads only when it is asked for."""
 
-        return output
-
-class PinMode:
-    Output = 1
-    Input = 2
-
-class PinState:
-    Low = 0
-    High = 15
-
-class IController(object):
-    """Interface class for the controllers.
-
-    Args:
-        object (object): Instance of the object.
-    """
+#endregion
 
-#region Variables
+class Deferred:
+    """Marks a step callback to run away from the step loop.
 
-    _config = None
-    """Config
+    Put it in cb_cw or cb_ccw around a callback that is not timing
+    critical, the FUNCTION interface then only queues it on the
+    dispatcher of the stepper. The callback is called with the position,
+    the direction and the time the step was due.
     """
 
-#endregion
-
-#region Constructor
+    __slots__ = ("callback",)
 
-    def __init__(self, config={}):
+    def __init__(self, callback):
         """Constructor
 
         Args:
-            config (dict, optional): Configuration objects. Defaults to {}.
-        """
-
-        self._config = config
-
-#endregion
-
-#region Public Methods
-
-    def pin_mode(self, pin, mode):
-        """Set the pin mode.
-
-        Args:
-            pin (int): Pin index.
-            mode (int): Mode.
-        """
-
-        pass
-
-    def digital_write(self, pin, state):
-        """Set the pin.
-
-        Args:
-            pin (int): Pin index.
-            state (int): State.
+            callback (function): Called with position, direction and time.
         """
 
-        pass
-
-#endregion
-
-class PlatformType:
-    NONE = 0
-    WINDOWS = 1
-    LINUX = 2
-    MICRO_PYTHON = 3
+        self.callback = callback
 
-    @staticmethod
-    def get():
-        platform_info = platform.platform()
-        platform_type = PlatformType.NONE    
-        if "Windows" in platform_info:
-            platform_type = PlatformType.WINDOWS
-        elif "MicroPython" in platform_info:
-            platform_type = PlatformType.MICRO_PYTHON
-        return platform_type
-
-class InterfaceType:
-    """Driver interface type.
+class AccelStepper:
+    """Stepper Motor Controller
     """
 
-    FUNCTION = 1
-    DRIVER = 2
-    FULL2WIRE = 3
-    FULL3WIRE = 4
-    FULL4WIRE = 5
-    HALF3WIRE = 6
-    HALF4WIRE = 7
+    __slots__ = (
+        "__platform_type", "__clock", "__interface", "__forward", "__backward",
+        "__enable_pin", "__pins", "__pins_inverted", "__enable_inverted",
+        "__controller", "__speed", "__max_speed", "__acceleration",
+        "__deceleration", "__decel", "__current_pos", "__target_pos",
+        "__step_interval", "__min_pulse_width", "__last_step_time",
+        "__direction", "__n", "__sqrt_twoa", "__c0", "__cn", "__cmin",
+        "__scale", "__profile_type", "__jerk", "__profile_cache", "__profile",
+        "__profile_index", "__step_fn", "__digital_write", "__pin_writes",
+        "__coil_writes", "__coil_count", "__forward_fns", "__backward_fns",
+        "__max_step_rate", "__preflight", "__preflight_margin",
+        "__compute_fn", "__raw_clock", "__stats", "__trace", "__hooks",
+        "__dispatcher", "__forward_deferred", "__backward_deferred",
+        "__trigger_positions", "__trigger_actions", "__trigger_lo", "__trigger_hi",
+        "__sleep", "__unclamped_speed", "__profile_fn")
+
+    COIL_INTERFACES = (InterfaceType.FULL2WIRE, InterfaceType.FULL3WIRE,
+        InterfaceType.FULL4WIRE, InterfaceType.HALF3WIRE, InterfaceType.HALF4WIRE)
+    """Interfaces that drive the coils, their sequences are in pyaccelstepper.coils.
+    """
 
-class Direction:
-    """Directions
+    BOUND_SETTINGS = ("interface", "controller", "pins", "pins_inverted", "cb_cw",
+        "cb_ccw", "dispatcher", "enable_inverted", "clock")
+    """Settings that change the bound step path.
     """
 
-    NONE = 0
-    CW = 1
-    CCW = 2
+    SETTINGS = BOUND_SETTINGS + ("profile_type", "jerk", "profile_cache", "preflight",
+        "preflight_margin", "min_pulse_width", "sleep", "max_step_rate", "speed_scale",
+        "max_speed", "acceleration", "deceleration", "speed", "enable")
+    """Settings configure() accepts.
+    """
 
-class AccelStepper:
-    """Stepper Motor Controller
+    PIN_TABLES = {}
+    """Pin writes of every output mask, shared by the axes with the same pins.
     """
 
 #region Constructor
@@ -184,6 +138,14 @@ class AccelStepper:
         """Platform type.
         """        
 
+        self.__clock = Clock.get(self.__platform_type)
+        """Time source of the step timing.
+        """
+
+        self.__sleep = time.sleep
+        """Delay of the DRIVER step pulse, a simulation passes one that returns at once.
+        """
+
         self.__interface = InterfaceType.FUNCTION
         """Signals interface.
         """
@@ -228,6 +190,14 @@ class AccelStepper:
         """Acceleration
         """
 
+        self.__deceleration = 0
+        """Deceleration, 0 to brake with the acceleration.
+        """
+
+        self.__decel = 0
+        """Effective deceleration.
+        """
+
         self.__current_pos = 0
         """Axis current position.
         """
@@ -266,12 +236,152 @@ class AccelStepper:
 
         self.__scale = 1.0 # 1000000.0 # 3.0
 
+        self.__profile_type = ProfileType.TRAPEZOID
+        """Motion profile of the moves from stop.
+        """
+
+        self.__jerk = 0.0
+        """Maximum jerk of the S-curve profile.
+        """
+
+        self.__profile_cache = None
+        """Cache of planned step interval profiles.
+        """
+
+        self.__profile = None
+        """Step intervals of the move being played back.
+        """
+
+        self.__profile_index = 0
+        """Index of the current step interval in the profile.
+        """
+
+        self.__step_fn = None
+        """Step function bound for the interface.
+        """
+
+        self.__digital_write = None
+        """Pin writer bound for the controller.
+        """
+
+        self.__pin_writes = ()
+        """Pin and state pairs of every output mask.
+        """
+
+        self.__coil_writes = ()
+        """Pin and state pairs of every coil step.
+        """
+
+        self.__coil_count = 1
+        """Modulus of the coil steps.
+        """
+
+        self.__forward_fns = ()
+        """Forward callbacks without the empty entries.
+        """
+
+        self.__backward_fns = ()
+        """Backward callbacks without the empty entries.
+        """
+
+        self.__max_step_rate = 0.0
+        """Steps per clock unit the host can deliver, 0 when not calibrated.
+        """
+
+        self.__preflight = PreflightMode.NONE
+        """Check of the moves against the step rate of the host.
+        """
+
+        self.__preflight_margin = 0.8
+        """Part of the calibrated step rate the moves may use.
+        """
+
+        self.__unclamped_speed = None
+        """Configured maximum speed while a CLAMP preflight limits the move, else None.
+        """
+
+        self.__compute_fn = None
+        """State machine bound for run(), wrapped while collecting statistics.
+        """
+
+        self.__profile_fn = None
+        """Profile playback bound for run(), wrapped by the plan and phase hooks.
+        """
+
+        self.__raw_clock = None
+        """Clock as configured, the step path reads it through self.__clock.
+        """
+
+        self.__stats = None
+        """Runtime statistics, None when switched off.
+        """
+
+        self.__trace = None
+        """Ring of the last steps, None when switched off.
+        """
+
+        self.__hooks = {}
+        """Profiling hooks per event.
+        """
+
+        self.__dispatcher = None
+        """Dispatcher of the deferred callbacks, the shared one when None.
+        """
+
+        self.__forward_deferred = ()
+        """Deferred forward callbacks.
+        """
+
+        self.__backward_deferred = ()
+        """Deferred backward callbacks.
+        """
+
+        self.__trigger_positions = []
+        """Sorted positions with triggers.
+        """
+
+        self.__trigger_actions = []
+        """Callback and direction pairs of every trigger position.
+        """
+
+        self.__trigger_lo = -math.inf
+        """Nearest trigger position below the current position.
+        """
+
+        self.__trigger_hi = math.inf
+        """Nearest trigger position above the current position.
+        """
+
+        if "dispatcher" in config and config["dispatcher"] is not None:
+            self.__dispatcher = config["dispatcher"]
+
         if "interface" in config and config["interface"] is not None:
             self.__interface = config["interface"]
 
         if "controller" in config and config["controller"] is not None:
             self.__controller = config["controller"]
 
+        if "clock" in config and config["clock"] is not None:
+            self.__clock = config["clock"]
+
+        if "sleep" in config and config["sleep"] is not None:
+            self.__sleep = config["sleep"]
+
+        if "profile_type" in config and config["profile_type"] is not None:
+            self.__profile_type = config["profile_type"]
+
+        if "jerk" in config and config["jerk"] is not None:
+            self.__jerk = abs(config["jerk"])
+
+        if "profile_cache" in config and config["profile_cache"] is not None:
+            self.__profile_cache = config["profile_cache"]
+
+        if "preflight" in config and config["preflight"] is not None:
+            self.__preflight = config["preflight"]
+
+        if "preflight_margin" in config and config["preflight_margin"] is not None:
+            self.__preflight_margin = config["preflight_margin"]
+
         if "cb_cw" in config and config["cb_cw"] is not None:
             self.__forward = config["cb_cw"]
 
@@ -294,8 +404,12 @@ class AccelStepper:
         if "enable_inverted" in config and config["enable_inverted"] is not None:
             self.__enable_inverted = config["enable_inverted"]
 
+        self.__raw_clock = self.__clock
+
+        self.__bind()
+
         # Some reasonable default
-        self.set_acceleration = 1
+        self.acceleration = 1
         self.speed = 0.0
         self.max_speed = 1.0
         self.enable_outputs(enable)
@@ -314,6 +428,132 @@ class AccelStepper:
 
         return self.__direction
 
+    @property
+    def interface(self):
+        """Signals interface.
+
+        Returns:
+            int: Interface type.
+        """
+
+        return self.__interface
+
+    @interface.setter
+    def interface(self, interface):
+        """Set the signals interface.
+
+        Args:
+            interface (int): Interface type.
+        """
+
+        self.__interface = interface
+        self.__bind()
+
+    @property
+    def controller(self):
+        """Controller that passes the signals to the pins.
+
+        Returns:
+            IController: Controller.
+        """
+
+        return self.__controller
+
+    @controller.setter
+    def controller(self, controller):
+        """Set the controller that passes the signals to the pins.
+
+        Args:
+            controller (IController): Controller.
+        """
+
+        self.__controller = controller
+        self.__bind()
+
+    @property
+    def pins(self):
+        """Pins that signals will go to.
+
+        Returns:
+            list: Pin indexes.
+        """
+
+        return self.__pins
+
+    @pins.setter
+    def pins(self, pins):
+        """Set the pins that signals will go to.
+
+        Args:
+            pins (list): Pin indexes.
+        """
+
+        self.__pins = pins
+        self.__bind()
+
+    @property
+    def pins_inverted(self):
+        """Inverted pins mask.
+
+        Returns:
+            list: Inverted flag per pin.
+        """
+
+        return self.__pins_inverted
+
+    @pins_inverted.setter
+    def pins_inverted(self, pins_inverted):
+        """Set the inverted pins mask.
+
+        Args:
+            pins_inverted (list): Inverted flag per pin.
+        """
+
+        self.__pins_inverted = pins_inverted
+        self.__bind()
+
+    @property
+    def cb_cw(self):
+        """Forward list of callbacks.
+
+        Returns:
+            list: Callbacks.
+        """
+
+        return self.__forward
+
+    @cb_cw.setter
+    def cb_cw(self, callbacks):
+        """Set the forward list of callbacks.
+
+        Args:
+            callbacks (list): Callbacks.
+        """
+
+        self.__forward = callbacks
+        self.__bind()
+
+    @property
+    def cb_ccw(self):
+        """Backward list of callbacks.
+
+        Returns:
+            list: Callbacks.
+        """
+
+        return self.__backward
+
+    @cb_ccw.setter
+    def cb_ccw(self, callbacks):
+        """Set the backward list of callbacks.
+
+        Args:
+            callbacks (list): Callbacks.
+        """
+
+        self.__backward = callbacks
+        self.__bind()
+
     @property
     def distance_to_go(self):
         """Distance to go.
@@ -322,7 +562,7 @@ class AccelStepper:
             int: Distance to go in steps.
         """
 
-        return self.target_position - self.current_position
+        return self.__target_pos - self.__current_pos
 
     @property
     def target_position(self):
@@ -356,6 +596,20 @@ class AccelStepper:
             return
         
         self.__current_pos = current_position
+        self.__seek_triggers(current_position)
+
+    @property
+    def next_step_time(self):
+        """Clock reading at which the next step is due.
+
+        Returns:
+            float: Time in clock units, None when no step is pending.
+        """
+
+        if self.__step_interval <= 0.0:
+            return None
+
+        return self.__last_step_time + self.__step_interval
 
     @property
     def speed(self):
@@ -380,6 +634,10 @@ class AccelStepper:
 
         speed = Utils.constrain(speed, -self.__max_speed, self.__max_speed)
 
+        # A start from rest has no last step for the statistics to be late from.
+        if (self.__speed == 0.0) and (self.__stats is not None):
+            self.__stats.last_step = None
+
         if speed == 0.0:
             self.__step_interval = 0
         else:
@@ -396,6 +654,9 @@ class AccelStepper:
     def max_speed(self):
         """Returns maximum speed.
 
+        A move clamped by PreflightMode.CLAMP runs below the configured
+        maximum speed, it comes back when the move ends.
+
         Returns:
             float: Maximum speed.
         """
@@ -404,23 +665,14 @@ class AccelStepper:
 
     @max_speed.setter
     def max_speed(self, speed):
-        """Set maximum speed.
+        """Set maximum speed, it replaces a clamp of the current move.
 
         Args:
             speed (float): Float speed.
         """
 
-        if speed < 0.0:
-            speed = -speed
-
-        if self.__max_speed != speed:
-            self.__max_speed = speed
-            self.__cmin = self.__scale / speed
-
-        # Recompute self.__n from current speed and adjust speed if accelerating or cruising
-        if self.__n > 0:
-            self.__n = ((self.__speed * self.__speed) / (2.0 * self.__acceleration)) # Equation 16
-            self.__compute_new_speed()
+        self.__unclamped_speed = None
+        self.__set_max_speed(speed)
 
     @property
     def speed_scale(self):
@@ -466,323 +718,1416 @@ class AccelStepper:
         if acceleration < 0.0:
             acceleration = -acceleration
 
+        self.__drop_profile()
+
         if self.__acceleration != acceleration:
-            # Recompute self.__n per Equation 17
-            self.__n = self.__n * (self.__acceleration / acceleration)
+            # Recompute self.__n per Equation 17, braking only follows without own deceleration
+            if (self.__n > 0) or (self.__deceleration == 0):
+                self.__n = self.__n * (self.__acceleration / acceleration)
             # New c0 per Equation 7, with correction per Equation 15
             self.__c0 = 0.676 * math.sqrt(2.0 / acceleration) * self.__scale # Equation 15
             self.__acceleration = acceleration
-            self.__compute_new_speed()
+            if self.__deceleration == 0:
+                self.__decel = acceleration
+            self.__compute_fn()
 
     @property
-    def min_pulse_width(self):
-        """Return minimum pulse width.
+    def deceleration(self):
+        """Returns deceleration.
+
+        Returns:
+            float: Deceleration.
         """
 
-        return self.__min_pulse_width
+        return self.__decel
 
-    @min_pulse_width.setter
-    def min_pulse_width(self, value):
-        """Set minimum pulse width.
+    @deceleration.setter
+    def deceleration(self, deceleration):
+        """Set deceleration, used for braking in place of the acceleration.
 
         Args:
-            value (float): Pulse width.
+            deceleration (float): Deceleration, 0 to brake with the acceleration.
         """
 
-        self.__min_pulse_width = value
+        if deceleration < 0.0:
+            deceleration = -deceleration
+
+        self.__drop_profile()
+
+        self.__deceleration = deceleration
+        if deceleration == 0:
+            deceleration = self.__acceleration
+
+        if self.__decel != deceleration:
+            # Recompute self.__n per Equation 17 when decelerating
+            if (self.__n < 0) and (self.__decel != 0):
+                self.__n = self.__n * (self.__decel / deceleration)
+            self.__decel = deceleration
+            self.__compute_fn()
 
     @property
-    def enable_pin(self):
-        """Return enable pin.
+    def profile_type(self):
+        """Motion profile of the moves from stop.
+
+        Returns:
+            int: Profile type.
         """
 
-        return self.__enable_pin
+        return self.__profile_type
 
-    @enable_pin.setter
-    def senable_pin(self, value):
-        """Set enable pin.
+    @profile_type.setter
+    def profile_type(self, profile_type):
+        """Set the motion profile of the moves from stop.
+
+        The S-curve profile is precomputed when the move starts, retargeting
+        a running axis continues with the trapezoid of the state machine.
 
         Args:
-            value (int): Enable pin index.
+            profile_type (int): Profile type.
         """
 
-        self.__enable_pin = value
+        self.__profile_type = profile_type
 
+    @property
+    def jerk(self):
+        """Maximum jerk of the S-curve profile.
 
-#endregion
+        Returns:
+            float: Jerk.
+        """
 
-#region Private Methods
+        return self.__jerk
 
-    def __step_0(self):
-        """0 pin step function (ie for functional usage)"""
+    @jerk.setter
+    def jerk(self, jerk):
+        """Set the maximum jerk of the S-curve profile.
 
-        if self.__speed > 0:
-            if self.__forward is not None:
-                for item in self.__forward:
-                    if item is not None:
-                        item()
-        else:
-            if self.__backward is not None:
-                for item in self.__backward:
-                    if item is not None:
-                        item()
+        Args:
+            jerk (float): Jerk.
+        """
 
-    def __step_1(self):
-        """1 pin step function (ie for stepper drivers)
-            This is passed the current step number (0 to 7)
-            Subclasses can override"""
+        self.__jerk = abs(jerk)
 
-        # self.__pins[0] is step, self.__pins[1] is direction
-        if self.__direction == Direction.CCW:
-            self.__set_output_pins(0b10) # Set direction first else get rogue pulses
-            self.__set_output_pins(0b11) # step HIGH
+    @property
+    def profile_cache(self):
+        """Cache of planned step interval profiles.
 
-        elif self.__direction == Direction.CW:
-            self.__set_output_pins(0b00) # Set direction first else get rogue pulses
-            self.__set_output_pins(0b00) # step HIGH
+        Returns:
+            ProfileCache: Profile cache, None when disabled.
+        """
 
-        # Caution 200ns setup time
-        # Delay the minimum allowed pulse width
-        time.sleep(self.__min_pulse_width)
+        return self.__profile_cache
 
-        if self.__direction == Direction.CCW:
+    @profile_cache.setter
+    def profile_cache(self, profile_cache):
+        """Set the cache of planned step interval profiles.
+
+        Args:
+            profile_cache (ProfileCache): Profile cache, None to disable.
+        """
+
+        self.__profile_cache = profile_cache
+
+    @property
+    def min_pulse_width(self):
+        """Return minimum pulse width.
+        """
+
+        return self.__min_pulse_width
+
+    @min_pulse_width.setter
+    def min_pulse_width(self, value):
+        """Set minimum pulse width.
+
+        Args:
+            value (float): Pulse width in seconds, 0 skips the pulse sleep.
+        """
+
+        self.__min_pulse_width = value
+
+    @property
+    def enable_pin(self):
+        """Return enable pin.
+        """
+
+        return self.__enable_pin
+
+    @enable_pin.setter
+    def senable_pin(self, value):
+        """Set enable pin.
+
+        Args:
+            value (int): Enable pin index.
+        """
+
+        self.__enable_pin = value
+
+    @property
+    def stats(self):
+        """Returns the runtime statistics.
+
+        Returns:
+            StepStats: Statistics, None when switched off.
+        """
+
+        return self.__stats
+
+    @stats.setter
+    def stats(self, stats):
+        """Switch the runtime statistics on or off.
+
+        Args:
+            stats (StepStats): Statistics to collect into, None to switch off.
+        """
+
+        self.__stats = stats
+        self.__bind()
+
+    @property
+    def trace(self):
+        """Returns the step trace.
+
+        Returns:
+            StepTrace: Trace, None when switched off.
+        """
+
+        return self.__trace
+
+    @trace.setter
+    def trace(self, trace):
+        """Switch the step trace on or off.
+
+        Args:
+            trace (StepTrace): Trace to record into, None to switch off.
+        """
+
+        self.__trace = trace
+        self.__bind()
+
+    @property
+    def dispatcher(self):
+        """Returns the dispatcher of the deferred callbacks.
+
+        Returns:
+            CallbackDispatcher: Dispatcher, None before a deferred callback is set.
+        """
+
+        return self.__dispatcher
+
+    @dispatcher.setter
+    def dispatcher(self, dispatcher):
+        """Set the dispatcher of the deferred callbacks.
+
+        Args:
+            dispatcher (CallbackDispatcher): Dispatcher, None for the shared one.
+        """
+
+        self.__dispatcher = dispatcher
+        self.__bind()
+
+    @property
+    def max_step_rate(self):
+        """Returns the step rate the host can deliver.
+
+        Returns:
+            float: Steps per clock unit, 0 when not calibrated.
+        """
+
+        return self.__max_step_rate
+
+    @max_step_rate.setter
+    def max_step_rate(self, rate):
+        """Set the step rate the host can deliver, e.g. from an earlier calibration.
+
+        Args:
+            rate (float): Steps per clock unit, 0 to disable the preflight.
+        """
+
+        self.__max_step_rate = abs(rate)
+
+    @property
+    def preflight(self):
+        """Returns the preflight mode.
+
+        Returns:
+            int: Preflight mode.
+        """
+
+        return self.__preflight
+
+    @preflight.setter
+    def preflight(self, mode):
+        """Set the preflight mode.
+
+        Args:
+            mode (int): PreflightMode.NONE, REJECT or CLAMP.
+        """
+
+        self.__preflight = mode
+
+    @property
+    def preflight_margin(self):
+        """Returns the part of the calibrated step rate the moves may use.
+
+        Returns:
+            float: Margin, 0 to 1.
+        """
+
+        return self.__preflight_margin
+
+    @preflight_margin.setter
+    def preflight_margin(self, margin):
+        """Set the part of the calibrated step rate the moves may use.
+
+        Args:
+            margin (float): Margin, 0 to 1.
+        """
+
+        self.__preflight_margin = margin
+
+
+#endregion
+
+#region Private Methods
+
+    def __bind(self):
+        """Bind the step function and the pin writes for the interface.
+
+        Called when the interface, the controller, the pins or the callbacks
+        change, so the step path does no dispatching of its own.
+        """
+
+        self.__digital_write = self.__controller.digital_write
+
+        num_pins = 2
+
+        if (self.__interface == InterfaceType.FULL4WIRE) or \
+            (self.__interface == InterfaceType.HALF4WIRE):
+
+            num_pins = 4
+
+        elif (self.__interface == InterfaceType.FULL3WIRE) or \
+            (self.__interface == InterfaceType.HALF3WIRE):
+
+            num_pins = 3
+
+        try:
+            key = (tuple(self.__pins[:num_pins]), tuple(self.__pins_inverted[:num_pins]))
+            self.__pin_writes = AccelStepper.PIN_TABLES.get(key)
+        except TypeError:
+            # Pins that can not be hashed are not shared.
+            key = None
+            self.__pin_writes = None
+
+        if self.__pin_writes is None:
+            pin_writes = []
+            for mask in range(1 << num_pins):
+                writes = []
+                for index in range(num_pins):
+                    if mask & (1 << index):
+                        state = not self.__pins_inverted[index] == 0
+                    else:
+                        state = self.__pins_inverted[index] == 0
+                    writes.append((self.__pins[index], state))
+                pin_writes.append(tuple(writes))
+            self.__pin_writes = tuple(pin_writes)
+            if key is not None:
+                AccelStepper.PIN_TABLES[key] = self.__pin_writes
+
+        self.__forward_fns, self.__forward_deferred = \
+            AccelStepper.__split_callbacks(self.__forward)
+
+        self.__backward_fns, self.__backward_deferred = \
+            AccelStepper.__split_callbacks(self.__backward)
+
+        if self.__interface in AccelStepper.COIL_INTERFACES:
+            from pyaccelstepper.coils import coil_writes
+            self.__coil_writes, self.__coil_count = \
+                coil_writes(self.__interface, self.__pin_writes)
+            self.__step_fn = self.__step_coils
+
+        elif self.__interface == InterfaceType.DRIVER:
+            self.__step_fn = self.__step_1
+
+        elif self.__forward_deferred or self.__backward_deferred:
+            if self.__dispatcher is None:
+                from pyaccelstepper.dispatcher import CallbackDispatcher
+                self.__dispatcher = CallbackDispatcher.shared()
+            self.__step_fn = self.__step_0_deferred
+
+        else:
+            self.__step_fn = self.__step_0
+
+        if self.__trigger_positions:
+            self.__attach_triggers()
+
+        self.__compute_fn = self.__compute_new_speed
+        self.__profile_fn = self.__next_profile_step
+        self.__clock = self.__raw_clock
+
+        if self.__stats is not None:
+            self.__instrument()
+
+        if self.__trace is not None:
+            self.__attach_trace()
+
+        if self.__hooks:
+            self.__attach_hooks()
+
+    def __find_trigger(self, position):
+        """Index of the first trigger position not below a position.
+
+        Args:
+            position (int): Position in steps.
+
+        Returns:
+            int: Index into the trigger positions.
+        """
+
+        positions = self.__trigger_positions
+        low = 0
+        high = len(positions)
+        while low < high:
+            middle = (low + high) // 2
+            if positions[middle] < position:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def __seek_triggers(self, position):
+        """Find the nearest triggers around a position.
+
+        Args:
+            position (int): Position in steps.
+
+        Returns:
+            int: Index of the trigger at the position, -1 when there is none.
+        """
+
+        positions = self.__trigger_positions
+        index = self.__find_trigger(position)
+
+        if (index < len(positions)) and (positions[index] == position):
+            # On a trigger the next step in either way leaves it and seeks again.
+            self.__trigger_lo = position
+            self.__trigger_hi = position
+            return index
+
+        self.__trigger_lo = positions[index - 1] if index > 0 else -math.inf
+        self.__trigger_hi = positions[index] if index < len(positions) else math.inf
+
+        return -1
+
+    def __attach_triggers(self):
+        """Wrap the step function with the position triggers.
+
+        Between two trigger positions a step costs one comparison, the
+        index is only searched when a step lands on one of them.
+        """
+
+        step_fn = self.__step_fn
+
+        def triggered_step(position):
+            step_fn(position)
+            if self.__trigger_lo < position < self.__trigger_hi:
+                return
+
+            direction = Direction.CW if position > self.__trigger_lo else Direction.CCW
+            at = self.__seek_triggers(position)
+            if at >= 0:
+                for callback, when in self.__trigger_actions[at]:
+                    if (when == Direction.NONE) or (when == direction):
+                        callback(position, direction)
+
+        self.__seek_triggers(self.__current_pos)
+        self.__step_fn = triggered_step
+
+    @staticmethod
+    def __split_callbacks(callbacks):
+        """Split the callbacks into the inline and the deferred ones.
+
+        Args:
+            callbacks (list): Callbacks, Deferred entries go to the dispatcher.
+
+        Returns:
+            tuple: Inline and deferred callbacks without the empty entries.
+        """
+
+        inline = []
+        deferred = []
+        if callbacks is not None:
+            for item in callbacks:
+                if isinstance(item, Deferred):
+                    deferred.append(item.callback)
+                elif item is not None:
+                    inline.append(item)
+
+        return tuple(inline), tuple(deferred)
+
+    def __instrument(self):
+        """Wrap the clock, the step function and the state machine to collect the statistics.
+
+        Only called with statistics switched on, so they cost nothing otherwise.
+        """
+
+        stats = self.__stats
+        timer = stats.timer
+        elapsed = stats.elapsed
+        raw_clock = self.__raw_clock
+        step_fn = self.__step_fn
+        compute_fn = self.__compute_fn
+
+        def clock():
+            stats.polls += 1
+            reading = raw_clock()
+            stats.last_reading = reading
+            return reading
+
+        def step(position):
+            reading = stats.last_reading
+            # The first step from rest has no deadline to be late for, the
+            # starts of the moves clear stats.last_step.
+            if self.__last_step_time == stats.last_step:
+                stats.add_lateness(reading - self.__last_step_time - self.__step_interval)
+            stats.last_step = reading
+            start = timer()
+            step_fn(position)
+            stats.controller_time += elapsed(start, timer())
+            stats.steps += 1
+
+        def compute():
+            start = timer()
+            compute_fn()
+            stats.math_time += elapsed(start, timer())
+
+        self.__clock = clock
+        self.__step_fn = step
+        self.__compute_fn = compute
+
+    def __attach_trace(self):
+        """Wrap the step function to record every step in the trace.
+        """
+
+        record = self.__trace.record
+        clock = self.__raw_clock
+        step_fn = self.__step_fn
+
+        def step(position):
+            record(self.__last_step_time + self.__step_interval, clock(),
+                self.__step_interval, position, self.__n)
+            step_fn(position)
+
+        self.__step_fn = step
+
+    def __phase(self):
+        """Motion phase from the state machine index.
+
+        Returns:
+            int: MotionPhase.
+        """
+
+        if self.__step_interval <= 0.0:
+            return MotionPhase.STOPPED
+
+        if self.__profile is not None:
+            # A played back profile has no index. Its intervals carry rounding
+            # noise around the minimum interval, and growing intervals brake.
+            if self.__step_interval <= self.__cmin * 1.000000001:
+                return MotionPhase.CRUISE
+
+            index = self.__profile_index
+            if (index >= 2) and (self.__step_interval > self.__profile[index - 2]):
+                return MotionPhase.DECEL
+
+            return MotionPhase.ACCEL
+
+        # The last step of a deceleration leaves the index at 0.
+        if self.__n <= 0:
+            return MotionPhase.DECEL
+
+        if self.__step_interval <= self.__cmin:
+            return MotionPhase.CRUISE
+
+        return MotionPhase.ACCEL
+
+    def __attach_hooks(self):
+        """Wrap the bound step path with the registered hooks.
+
+        Only the functions with hooks on their events are wrapped.
+        """
+
+        hooks = self.__hooks
+
+        if HookEvent.WRITE in hooks:
+            write = self.__digital_write
+            write_hooks = tuple(hooks[HookEvent.WRITE])
+
+            def hooked_write(pin, state):
+                write(pin, state)
+                for hook in write_hooks:
+                    hook(self, pin, state)
+
+            self.__digital_write = hooked_write
+
+        if HookEvent.STEP in hooks:
+            step_fn = self.__step_fn
+            step_hooks = tuple(hooks[HookEvent.STEP])
+
+            def hooked_step(position):
+                step_fn(position)
+                for hook in step_hooks:
+                    hook(self, position)
+
+            self.__step_fn = hooked_step
+
+        if (HookEvent.PLAN_ENTER in hooks) or (HookEvent.PLAN_EXIT in hooks) or \
+            (HookEvent.PHASE in hooks):
+
+            # Every plan goes through these two, run(), the setters, move_to(),
+            # track() and the profile playback alike.
+            self.__compute_fn = self.__hook_plan(self.__compute_fn)
+            self.__profile_fn = self.__hook_plan(self.__profile_fn)
+
+    def __hook_plan(self, plan_fn):
+        """Wrap a plan function with the plan and phase hooks.
+
+        Args:
+            plan_fn (function): State machine or profile playback.
+
+        Returns:
+            function: Wrapped plan function.
+        """
+
+        hooks = self.__hooks
+        enter_hooks = tuple(hooks.get(HookEvent.PLAN_ENTER, ()))
+        exit_hooks = tuple(hooks.get(HookEvent.PLAN_EXIT, ()))
+        phase_hooks = tuple(hooks.get(HookEvent.PHASE, ()))
+
+        def hooked_plan():
+            for hook in enter_hooks:
+                hook(self)
+            old = self.__phase()
+            plan_fn()
+            for hook in exit_hooks:
+                hook(self)
+            if phase_hooks:
+                new = self.__phase()
+                if new != old:
+                    for hook in phase_hooks:
+                        hook(self, old, new)
+
+        return hooked_plan
+
+    def __step_0(self, step):
+        """0 pin step function (ie for functional usage)"""
+
+        if self.__speed > 0:
+            for item in self.__forward_fns:
+                item()
+        else:
+            for item in self.__backward_fns:
+                item()
+
+    def __step_0_deferred(self, step):
+        """0 pin step function with deferred callbacks, they only get queued"""
+
+        post = self.__dispatcher.post
+        due = self.__last_step_time + self.__step_interval
+
+        if self.__speed > 0:
+            for item in self.__forward_fns:
+                item()
+            for item in self.__forward_deferred:
+                post(item, step, Direction.CW, due)
+        else:
+            for item in self.__backward_fns:
+                item()
+            for item in self.__backward_deferred:
+                post(item, step, Direction.CCW, due)
+
+    def __step_1(self, step):
+        """1 pin step function (ie for stepper drivers)"""
+
+        # self.__pins[0] is step, self.__pins[1] is direction
+        if self.__direction == Direction.CCW:
+            self.__set_output_pins(0b10) # Set direction first else get rogue pulses
+            self.__set_output_pins(0b11) # step HIGH
+
+        elif self.__direction == Direction.CW:
+            self.__set_output_pins(0b00) # Set direction first else get rogue pulses
+            self.__set_output_pins(0b00) # step HIGH
+
+        # Caution 200ns setup time
+        # Delay the minimum allowed pulse width, a zero width skips the sleep call
+        if self.__min_pulse_width:
+            self.__sleep(self.__min_pulse_width)
+
+        if self.__direction == Direction.CCW:
             self.__set_output_pins(0b00) # step LOW
 
-        elif self.__direction == Direction.CW:
-            self.__set_output_pins(0b10) # step LOW
+        elif self.__direction == Direction.CW:
+            self.__set_output_pins(0b10) # step LOW
+
+    def __step_coils(self, step):
+        """2, 3 and 4 pin full and half step function
+            This is passed the current step number"""
+
+        write = self.__digital_write
+        for pin, state in self.__coil_writes[step % self.__coil_count]:
+            write(pin, state)
+
+    def __set_max_speed(self, speed):
+        """Set maximum speed and recompute the ramp of a moving axis.
+
+        Args:
+            speed (float): Float speed.
+        """
+
+        if speed < 0.0:
+            speed = -speed
+
+        self.__drop_profile()
+
+        if self.__max_speed != speed:
+            self.__max_speed = speed
+            self.__cmin = self.__scale / speed
+
+        # Recompute self.__n from current speed and adjust speed if accelerating or cruising
+        if self.__n > 0:
+            self.__n = ((self.__speed * self.__speed) / (2.0 * self.__acceleration)) # Equation 16
+            self.__compute_fn()
+
+    def __end_clamp(self):
+        """Give the configured maximum speed back after a clamped move.
+        """
+
+        speed = self.__unclamped_speed
+        self.__unclamped_speed = None
+        self.__set_max_speed(speed)
+
+    def __compute_new_speed(self):
+        """Compute new speed.
+        """
+
+        distance_to = self.__target_pos - self.__current_pos # +ve is clockwise from current location
+        speed = self.__speed
+        decel = self.__decel
+        n = self.__n
+
+        steps_to_stop = int((speed * speed) / (2.0 * decel)) # Equation 16
+
+        # A finished deceleration, or the first step speed, is a stop speed too,
+        # even when the deceleration is too low to brake it within a step
+        if (distance_to == 0) and ((steps_to_stop <= 1) or (n == 0) or \
+            (abs(speed) <= self.__scale / self.__c0)):
+            # We are at the target and its time to stop
+            self.__step_interval = 0
+            self.__speed = 0.0
+            self.__n = 0
+            if self.__unclamped_speed is not None:
+                self.__end_clamp()
+            return
+
+        # Interval of the next step when it is already known
+        next_cn = 0.0
+
+        if distance_to != 0:
+            if distance_to > 0:
+                # We are anticlockwise from the target
+                remaining = distance_to
+                right_way = self.__direction == Direction.CW
+            else:
+                # We are clockwise from the target
+                remaining = -distance_to
+                right_way = self.__direction == Direction.CCW
+
+            if (n > 0) and not right_way:
+                # Going the wrong way, decelerate now
+                n = -steps_to_stop
+
+            elif (n > 0) or ((n < 0) and right_way and (remaining != -n)):
+                # Speed squared the axis can still brake from over the steps left, on
+                # top of the speeds that pass the stop test at the target (Equation 16)
+                scale = self.__scale
+                reachable = scale / self.__c0
+                reachable = reachable * reachable
+                if reachable < 4.0 * decel:
+                    reachable = 4.0 * decel
+                reachable += 2.0 * decel * remaining
+
+                # Accelerate, or start accelerating again when the target moved away,
+                # only if the braking point can still be hit after the step
+                accel_n = n
+                if n < 0:
+                    accel_n = 0
+                    if remaining > -n:
+                        accel_n = -n * (decel / self.__acceleration) # Equation 17
+
+                if accel_n > 0:
+                    cn = self.__cn
+                    next_cn = cn - ((2.0 * cn) / ((4.0 * accel_n) + 1)) # Equation 13
+                    if next_cn < self.__cmin:
+                        next_cn = self.__cmin
+                    next_speed = scale / next_cn
+                    if (next_speed * next_speed) < (reachable - (2.0 * decel)):
+                        n = accel_n
+                    else:
+                        next_cn = 0.0
+
+                if next_cn == 0.0:
+                    if (speed * speed) < reachable:
+                        n = -remaining # Brake to stop at the target
+                    elif n > 0:
+                        n = -steps_to_stop # Too close, overshoot and come back
+
+        # Need to accelerate or decelerate
+        if n == 0:
+
+            # First step from stopped
+            cn = self.__c0
+            if self.__stats is not None:
+                self.__stats.last_step = None
+
+            if distance_to > 0:
+                self.__direction = Direction.CW
+            else:
+                self.__direction = Direction.CCW
+
+        elif next_cn > 0.0:
+            cn = next_cn
+
+        else:
+            # Subsequent step. Works for accel (n is +_ve) and decel (n is -ve).
+            cn = self.__cn
+            cn = cn - ((2.0 * cn) / ((4.0 * n) + 1)) # Equation 13
+            if cn < self.__cmin:
+                cn = self.__cmin
+
+        self.__cn = cn
+        self.__n = int(n + 1)
+
+        self.__step_interval = cn
+        self.__speed = self.__scale / cn
+        if self.__direction == Direction.CCW:
+            self.__speed = -self.__speed
+
+    def __plan(self, target, max_speed=None):
+        """Plan the motion from the current state to the target.
+
+        Continuous form of the ramp that the state machine follows
+        (Equations 13 - 17): brake if moving away, accelerate, cruise at
+        maximum speed and decelerate to stop, overshooting and coming back
+        when the target is closer than the braking distance. Braking uses
+        the deceleration.
+
+        Args:
+            target (int): Target position in steps.
+            max_speed (float, optional): Maximum speed. Defaults to the current one.
+
+        Returns:
+            list: Segments as (start time, duration, position, speed, acceleration).
+        """
+
+        segments = []
+        accel = self.__acceleration
+        decel = self.__decel
+        if max_speed is None:
+            max_speed = self.__max_speed
+        position = float(self.__current_pos)
+        speed = float(self.__speed)
+        start = 0.0
+
+        # The overshoot case adds a second pass in the other direction.
+        while True:
+            distance = target - position
+
+            if distance > 0:
+                sign = 1.0
+            elif distance < 0:
+                sign = -1.0
+            elif speed > 0:
+                sign = -1.0
+            elif speed < 0:
+                sign = 1.0
+            else:
+                break
+
+            distance = distance * sign
+            speed_to = speed * sign
+
+            # Moving away from the target, brake first.
+            if speed_to < 0:
+                duration = -speed_to / decel
+                segments.append((start, duration, position, speed, decel * sign))
+                start += duration
+                position -= sign * (speed_to * speed_to) / (2.0 * decel)
+                distance += (speed_to * speed_to) / (2.0 * decel)
+                speed = speed_to = 0.0
+
+            # Too close to stop, brake through the target and come back.
+            steps_to_stop = (speed_to * speed_to) / (2.0 * decel) # Equation 16
+            if steps_to_stop > distance:
+                duration = speed_to / decel
+                segments.append((start, duration, position, speed, -decel * sign))
+                start += duration
+                position += sign * steps_to_stop
+                speed = 0.0
+                continue
+
+            # Accelerating to the peak and braking from it covers the distance.
+            peak = math.sqrt(((2.0 * distance) + ((speed_to * speed_to) / accel)) / \
+                ((1.0 / accel) + (1.0 / decel)))
+            peak = min(max_speed, peak)
+
+            # Accelerate (or slow down to the maximum speed).
+            if peak > speed_to:
+                duration = (peak - speed_to) / accel
+                segments.append((start, duration, position, speed, accel * sign))
+            else:
+                duration = (speed_to - peak) / decel
+                if duration > 0.0:
+                    segments.append((start, duration, position, speed, -decel * sign))
+            start += duration
+            position += sign * (speed_to + peak) * duration / 2.0
+            distance -= (speed_to + peak) * duration / 2.0
+
+            # Cruise.
+            cruise = distance - ((peak * peak) / (2.0 * decel))
+            if cruise > 0.0 and peak > 0.0:
+                duration = cruise / peak
+                segments.append((start, duration, position, sign * peak, 0.0))
+                start += duration
+                position += sign * cruise
+
+            # Decelerate to stop at the target.
+            duration = peak / decel
+            segments.append((start, duration, position, sign * peak, -decel * sign))
+            break
+
+        return segments
+
+    def __compile_profile(self, distance):
+        """Run the state machine offline for a move from stop.
+
+        Args:
+            distance (int): Distance of the move in steps.
+
+        Returns:
+            array: Step intervals, None if the move does not end at the target.
+        """
+
+        state = (self.__current_pos, self.__target_pos, self.__speed,
+            self.__step_interval, self.__direction, self.__n, self.__cn)
+
+        self.__current_pos = 0
+        self.__target_pos = distance
+        self.__speed = 0.0
+        self.__step_interval = 0
+        self.__n = 0
+
+        profile = array("d")
+        direction = Direction.CW if distance > 0 else Direction.CCW
+
+        self.__compute_new_speed()
+        while self.__step_interval > 0 and self.__direction == direction:
+            profile.append(self.__step_interval)
+            if direction == Direction.CW:
+                self.__current_pos += 1
+            else:
+                self.__current_pos -= 1
+            self.__compute_new_speed()
+
+        if (self.__current_pos != distance) or (self.__step_interval != 0):
+            profile = None
+
+        self.__current_pos, self.__target_pos, self.__speed, \
+            self.__step_interval, self.__direction, self.__n, self.__cn = state
+
+        return profile
+
+    def __uses_profile(self):
+        """Moves from stop are played back from a precomputed profile.
+
+        Returns:
+            bool: True if the profile is precomputed.
+        """
+
+        if (self.__profile_type == ProfileType.SCURVE) and (self.__jerk > 0.0):
+            return True
+
+        return self.__profile_cache is not None
+
+    def __compile_s_curve(self, distance):
+        """S-curve profile for a move from stop.
+
+        Args:
+            distance (int): Distance of the move in steps.
+
+        Returns:
+            array: Step intervals.
+        """
+
+        from pyaccelstepper.s_curve import SCurve
+
+        return SCurve(distance, self.__max_speed, self.__acceleration, self.__jerk,
+            self.__decel).intervals(self.__scale)
+
+    def __profile_for(self, distance):
+        """Precomputed profile for a move from stop, from the cache if there is one.
+
+        Args:
+            distance (int): Distance of the move in steps.
+
+        Returns:
+            array: Step intervals, None if the move can not be precomputed.
+        """
+
+        s_curve = (self.__profile_type == ProfileType.SCURVE) and (self.__jerk > 0.0)
 
-    def __step_2(self, step):
-        """2 pin step function
-            This is passed the current step number (0 to 7)
-            Subclasses can override"""
+        key = (abs(distance), self.__max_speed, self.__acceleration, self.__scale,
+            self.__interface, self.__profile_type, self.__jerk, self.__decel)
 
-        step = step & 0x3
+        profile = None
+        if self.__profile_cache is not None:
+            profile = self.__profile_cache.get(key)
 
-        if step == 0: # 01
-            self.__set_output_pins(0b10)
+        if profile is None:
+            if s_curve:
+                profile = self.__compile_s_curve(abs(distance))
+            else:
+                profile = self.__compile_profile(abs(distance))
 
-        elif step == 1: # 11
-            self.__set_output_pins(0b11)
+            if (profile is not None) and (self.__profile_cache is not None):
+                self.__profile_cache.put(key, profile)
 
-        elif step == 2: # 10
-            self.__set_output_pins(0b01)
+        return profile
 
-        elif step == 3: # 00
-            self.__set_output_pins(0b00)
+    def __play_profile(self, profile):
+        """Start playing back a profile towards the target.
 
-    def __step_3(self, step):
-        """3 pin step function
-            This is passed the current step number (0 to 7)
-            Subclasses can override"""
+        Args:
+            profile (array): Step intervals.
+        """
 
-        step = step % 3
+        if self.__target_pos > self.__current_pos:
+            self.__direction = Direction.CW
+        else:
+            self.__direction = Direction.CCW
 
-        if step == 0:    # 100
-            self.__set_output_pins(0b100)
+        if self.__stats is not None:
+            self.__stats.last_step = None
 
-        elif step == 1:    # 001
-            self.__set_output_pins(0b001)
+        self.__profile = profile
+        self.__profile_index = 0
+        self.__profile_fn()
 
-        elif step == 2:    #010
-            self.__set_output_pins(0b010)
+    def __next_profile_step(self):
+        """Take the next step interval of the played back profile.
+        """
 
-    def __step_4(self, step):
-        """4 pin step function for half stepper
-            This is passed the current step number (0 to 7)
-            Subclasses can override"""
+        if self.__profile_index < len(self.__profile):
+            self.__step_interval = self.__profile[self.__profile_index]
+            self.__speed = self.__scale / self.__step_interval
+            if self.__direction == Direction.CCW:
+                self.__speed = -self.__speed
+            self.__profile_index += 1
 
-        step = step % 3
+        else:
+            self.__profile = None
+            self.__step_interval = 0
+            self.__speed = 0.0
+            self.__n = 0
+            if self.__unclamped_speed is not None:
+                self.__end_clamp()
 
-        if step == 0:    # 1010
-            self.__set_output_pins(0b0101)
+    def __drop_profile(self):
+        """Hand a played back move over to the state machine.
+        """
 
-        elif step == 1:    # 0110
-            self.__set_output_pins(0b0110)
+        if self.__profile is None:
+            return
 
-        elif step == 2:    #0101
-            self.__set_output_pins(0b1010)
+        self.__profile = None
+        self.__cn = self.__step_interval
+        self.__n = int((self.__speed * self.__speed) / (2.0 * self.__acceleration)) # Equation 16
 
-        elif step == 3:    #1001
-            self.__set_output_pins(0b1001)
+    def __peak_speed(self, target, max_speed=None):
+        """Highest speed on the way to the target.
 
-    def __step_6(self, step):
-        """3 pin half step function
-            This is passed the current step number (0 to 7)
-            Subclasses can override"""
+        Args:
+            target (int): Target position in steps.
+            max_speed (float, optional): Maximum speed. Defaults to the current one.
 
-        step = step % 6
+        Returns:
+            float: Speed.
+        """
 
-        if step == 0:    # 100
-            self.__set_output_pins(0b100)
+        peak = abs(self.__speed)
+        for start, duration, position, speed, accel in self.__plan(target, max_speed):
+            peak = max(peak, abs(speed), abs(speed + (accel * duration)))
 
-        elif step == 1:    # 101
-            self.__set_output_pins(0b101)
+        return peak
 
-        elif step == 2:    # 001
-            self.__set_output_pins(0b001)
+    def __preflight_check(self, target):
+        """Reject or clamp a move faster than the host can step.
 
-        elif step == 3:    # 011
-            self.__set_output_pins(0b011)
+        The clamp lowers the maximum speed of this move only, the configured
+        one comes back when the move ends. A new target is checked against
+        the configured maximum speed again.
 
-        elif step == 4:    # 010
-            self.__set_output_pins(0b010)
+        Args:
+            target (int): Target position in steps.
 
-        elif step == 5:    # 011
-            self.__set_output_pins(0b110)
+        Raises:
+            ValueError: The peak step rate is over the limit in REJECT mode.
+        """
 
-    def __step_8(self, step):
-        """4 pin half step function
-        This is passed the current step number (0 to 7)
-        Subclasses can override"""
+        configured = self.__max_speed
+        if self.__unclamped_speed is not None:
+            configured = self.__unclamped_speed
 
-        step = step & 7
+        limit = self.__max_step_rate * self.__preflight_margin * self.__scale
+        peak = self.__peak_speed(target, configured)
 
-        if step == 0:    # 1000
-            self.__set_output_pins(0b0001)
+        if peak <= limit:
+            if self.__unclamped_speed is not None:
+                self.__end_clamp()
+            return
 
-        elif step == 1:    # 1010
-            self.__set_output_pins(0b0101)
+        if self.__preflight == PreflightMode.REJECT:
+            raise ValueError("Peak speed {} is over the {} the host can step.".format(peak, limit))
 
-        elif step == 2:    # 0010
-            self.__set_output_pins(0b0100)
+        self.__unclamped_speed = configured
+        self.__set_max_speed(limit)
 
-        elif step == 3:    # 0110
-            self.__set_output_pins(0b0110)
+    def __move_to(self, absolute):
+        """Move the axis to position, without the preflight.
 
-        elif step == 4:    # 0100
-            self.__set_output_pins(0b0010)
+        Args:
+            absolute (int): Absolute position in steps.
+        """
 
-        elif step == 5:    #0101
-            self.__set_output_pins(0b1010)
+        if self.__target_pos != absolute:
+            self.__target_pos = absolute
 
-        elif step == 6:    # 0001
-            self.__set_output_pins(0b1000)
+        self.__drop_profile()
 
-        elif step == 7:    #1001
-            self.__set_output_pins(0b1001)
+        if self.__uses_profile() and (self.__speed == 0.0) and \
+            (self.__n == 0) and (absolute != self.__current_pos):
+            profile = self.__profile_for(absolute - self.__current_pos)
+            if profile is not None:
+                self.__play_profile(profile)
+                return
 
-    def __step(self, step):
-        """Subclasses can override."""
+        self.__compute_fn()
+        # compute new n?
 
-        if self.__interface is InterfaceType.FUNCTION:
-            self.__step_0()
+    def __set_output_pins(self, mask):
+        """Write an output mask through the bound pin writes
+            bit 0 of the mask corresponds to self.__pins[0]
+            bit 1 of the mask corresponds to self.__pins[1]
+        """
 
-        elif self.__interface is InterfaceType.DRIVER:
-            self.__step_1()
+        write = self.__digital_write
+        for pin, state in self.__pin_writes[mask]:
+            write(pin, state)
 
-        elif self.__interface is InterfaceType.FULL2WIRE:
-            self.__step_2(step)
+#endregion
 
-        elif self.__interface is InterfaceType.FULL3WIRE:
-            self.__step_3(step)
+#region Public Methods
 
-        elif self.__interface is InterfaceType.FULL4WIRE:
-            self.__step_4(step)
+    def home(self, pin, controller=None, **homing):
+        """Home the axis against a switch, blocks until done.
 
-        elif self.__interface is InterfaceType.HALF3WIRE:
-            self.__step_6(step)
+        Fast approach, back off and slow approach, see Homing for the
+        arguments.
 
-        elif self.__interface is InterfaceType.HALF4WIRE:
-            self.__step_8(step)
+        Args:
+            pin (int): Input pin of the switch.
+            controller (IController, optional): Controller of the input. Defaults to the one of the stepper.
 
-    def __compute_new_speed(self):
-        """Compute new speed.
+        Returns:
+            bool: The axis is homed.
         """
 
-        distance_to = self.distance_to_go # +ve is clockwise from current location
+        from pyaccelstepper.homing import Homing, HomingState
 
-        steps_to_stop = ((self.speed * self.speed) / (2.0 * self.acceleration)) # Equation 16
+        cycle = Homing(self, pin, controller, **homing)
+        cycle.start()
+        while cycle.run():
+            pass
 
-        if (distance_to == 0) and (steps_to_stop <= 1):
-            # We are at the target and its time to stop
-            self.__step_interval = 0
-            self.__speed = 0.0
-            self.__n = 0
-            return
+        return cycle.state == HomingState.DONE
 
-        if distance_to > 0:
-            # We are anticlockwise from the target
-            # Need to go clockwise from here, maybe decelerate now
+    def persist(self, store, axis=0):
+        """Restore the position from a journal and keep it journaled.
 
-            if self.__n > 0:
-                # Currently accelerating, need to deceleration now? Or maybe going the wrong way?
-                if (steps_to_stop >= distance_to) or (self.__direction == Direction.CCW):
-                    self.__n = -steps_to_stop # Start deceleration
+        Args:
+            store (PositionStore): Journal.
+            axis (int, optional): Axis of the journal. Defaults to 0.
 
-            elif self.__n < 0:
-                # Currently decelerating, need to accel again?
-                if (steps_to_stop < distance_to) and (self.__direction == Direction.CW):
-                    self.__n = -self.__n # Start acceleration
+        Returns:
+            bool: The position was restored from a clean shutdown, homing can be skipped.
+        """
 
-        elif distance_to < 0:
-            # We are clockwise from the target
-            # Need to go anticlockwise from here, maybe decelerate
+        restored = store.restore(self, axis)
+        store.attach(self, axis)
 
-            if self.__n > 0:
-                # Currently accelerating, need to deceleration now? Or maybe going the wrong way?
-                if (steps_to_stop >= -distance_to) or (self.__direction == Direction.CW):
-                    self.__n = -steps_to_stop # Start deceleration
+        return restored
 
-            elif self.__n < 0:
-                # Currently decelerating, need to accel again?
-                if (steps_to_stop < -distance_to) and (self.__direction == Direction.CCW):
-                    self.__n = -self.__n # Start acceleration
+    def probe_to(self, target, input_pin, level=1, controller=None):
+        """Move toward the target until the input trips, blocks until stopped.
 
-        # Need to accelerate or decelerate
-        if self.__n == 0:
+        The position is latched at the step where the input tripped and the
+        axis brakes with its deceleration. Probe.max_safe_speed() gives the
+        fastest speed that stops within an overtravel.
 
-            # First step from stopped
-            self.__cn = self.__c0
+        Args:
+            target (int): Absolute position in steps, reached when nothing trips.
+            input_pin (int): Input pin of the probe.
+            level (int, optional): Input level of the tripped probe. Defaults to 1.
+            controller (IController, optional): Controller of the input. Defaults to the one of the stepper.
 
-            if distance_to > 0:
-                self.__direction = Direction.CW
-            else:
-                self.__direction = Direction.CCW
+        Returns:
+            ProbeResult: Trip and stop positions.
+        """
+
+        from pyaccelstepper.probing import Probe
+
+        return Probe.run([self], lambda: self.move_to(target), self.run,
+            input_pin, level, controller)
+
+    def add_trigger(self, position, callback, direction=Direction.NONE):
+        """Call a function when a step lands on a position.
+
+        The trigger stays until it is removed and fires on every pass.
+
+        Args:
+            position (int): Position in steps.
+            callback (function): Called with the position and the direction of the step.
+            direction (int, optional): Direction the step must go, Direction.NONE for both. Defaults to Direction.NONE.
+        """
+
+        position = int(position)
+        index = self.__find_trigger(position)
+
+        if (index < len(self.__trigger_positions)) and \
+            (self.__trigger_positions[index] == position):
+            self.__trigger_actions[index].append((callback, direction))
 
         else:
-            # Subsequent step. Works for accel (n is +_ve) and decel (n is -ve).
-            self.__cn = self.__cn - ((2.0 * self.__cn) / ((4.0 * self.__n) + 1)) # Equation 13
-            self.__cn = max(self.__cn, self.__cmin)
+            self.__trigger_positions.insert(index, position)
+            self.__trigger_actions.insert(index, [(callback, direction)])
 
-        self.__n += 1
-        self.__n = int(self.__n)
+        self.__bind()
 
-        self.__step_interval = self.__cn
-        self.__speed = self.__scale / self.__cn
-        if self.__direction == Direction.CCW:
-            self.__speed = -self.__speed
+    def remove_trigger(self, position, callback=None):
+        """Remove the triggers of a position.
 
-    def __set_output_pins(self, mask):
-        """You might want to override this to implement eg serial output
-            bit 0 of the mask corresponds to self.__pins[0]
-            bit 1 of the mask corresponds to self.__pins[1]
+        Args:
+            position (int): Position in steps.
+            callback (function, optional): Remove only this callback. Defaults to all.
         """
 
-        num_pins = 2
+        position = int(position)
+        index = self.__find_trigger(position)
 
-        if (self.__interface is InterfaceType.FULL4WIRE) or \
-            (self.__interface is InterfaceType.HALF4WIRE):
+        if (index >= len(self.__trigger_positions)) or \
+            (self.__trigger_positions[index] != position):
+            return
 
-            num_pins = 4
+        if callback is not None:
+            self.__trigger_actions[index] = [item for item in self.__trigger_actions[index]
+                if item[0] != callback]
 
-        elif (self.__interface is InterfaceType.FULL3WIRE) or \
-            (self.__interface is InterfaceType.HALF3WIRE):
+        if (callback is None) or (not self.__trigger_actions[index]):
+            del self.__trigger_positions[index]
+            del self.__trigger_actions[index]
 
-            num_pins = 3
+        self.__bind()
 
-        for index in range(num_pins):
-            state = 0
+    def clear_triggers(self):
+        """Remove every trigger.
+        """
 
-            if mask & (1 << index):
-                state = not self.__pins_inverted[index] == 0
-            else:
-                state = self.__pins_inverted[index] == 0
+        self.__trigger_positions = []
+        self.__trigger_actions = []
+        self.__trigger_lo = -math.inf
+        self.__trigger_hi = math.inf
+        self.__bind()
 
-            self.__controller.digital_write(self.__pins[index], state)
+    def add_hook(self, event, hook):
+        """Subscribe a profiling hook to an event.
 
-#endregion
+        The step path is rebound with the hook, an event without hooks
+        costs nothing.
 
-#region Public Methods
+        Args:
+            event (int): HookEvent.
+            hook (function): Called with the stepper and the event arguments.
+        """
+
+        self.__hooks.setdefault(event, []).append(hook)
+        self.__bind()
+
+    def remove_hook(self, event, hook):
+        """Unsubscribe a profiling hook.
+
+        Args:
+            event (int): HookEvent.
+            hook (function): Hook added before.
+        """
+
+        if hook in self.__hooks.get(event, ()):
+            self.__hooks[event].remove(hook)
+            if not self.__hooks[event]:
+                del self.__hooks[event]
+            self.__bind()
+
+    def configure(self, **config):
+        """Apply many settings at once.
+
+        The interface, controller, pins and callbacks are bound once. At rest
+        the motion parameters are written together and the state machine
+        runs once, instead of once per setter, a moving axis goes through
+        the setters.
+
+        Args:
+            config: Constructor keys and speed_scale, max_speed, acceleration,
+                deceleration, speed, min_pulse_width, sleep and max_step_rate.
+
+        Raises:
+            ValueError: Unknown setting.
+        """
+
+        unknown = [key for key in config if key not in AccelStepper.SETTINGS]
+        if unknown:
+            raise ValueError("Unknown settings: {}.".format(", ".join(sorted(unknown))))
+
+        if "interface" in config and config["interface"] is not None:
+            self.__interface = config["interface"]
+
+        if "controller" in config and config["controller"] is not None:
+            self.__controller = config["controller"]
+
+        if "pins" in config and config["pins"] is not None:
+            self.__pins = config["pins"]
+
+        if "pins_inverted" in config and config["pins_inverted"] is not None:
+            self.__pins_inverted = config["pins_inverted"]
+
+        if "cb_cw" in config and config["cb_cw"] is not None:
+            self.__forward = config["cb_cw"]
+
+        if "cb_ccw" in config and config["cb_ccw"] is not None:
+            self.__backward = config["cb_ccw"]
+
+        if "dispatcher" in config and config["dispatcher"] is not None:
+            self.__dispatcher = config["dispatcher"]
+
+        if "enable_inverted" in config and config["enable_inverted"] is not None:
+            self.__enable_inverted = config["enable_inverted"]
+
+        if "clock" in config and config["clock"] is not None:
+            self.__raw_clock = config["clock"]
+
+        if "profile_type" in config and config["profile_type"] is not None:
+            self.__profile_type = config["profile_type"]
+
+        if "jerk" in config and config["jerk"] is not None:
+            self.__jerk = abs(config["jerk"])
+
+        if "profile_cache" in config and config["profile_cache"] is not None:
+            self.__profile_cache = config["profile_cache"]
+
+        if "preflight" in config and config["preflight"] is not None:
+            self.__preflight = config["preflight"]
+
+        if "preflight_margin" in config and config["preflight_margin"] is not None:
+            self.__preflight_margin = config["preflight_margin"]
+
+        if "min_pulse_width" in config and config["min_pulse_width"] is not None:
+            self.__min_pulse_width = config["min_pulse_width"]
+
+        if "sleep" in config and config["sleep"] is not None:
+            self.__sleep = config["sleep"]
+
+        if "max_step_rate" in config and config["max_step_rate"] is not None:
+            self.__max_step_rate = abs(config["max_step_rate"])
+
+        for key in AccelStepper.BOUND_SETTINGS:
+            if key in config and config[key] is not None:
+                self.__bind()
+                break
+
+        motion = [key for key in ("speed_scale", "max_speed", "acceleration", "deceleration")
+            if key in config and config[key] is not None]
+
+        if motion and (self.__speed == 0.0) and (self.__n == 0) and (self.__profile is None):
+            if "speed_scale" in config and config["speed_scale"] is not None:
+                self.__scale = config["speed_scale"]
+
+            if "max_speed" in config and config["max_speed"] is not None:
+                self.__max_speed = abs(config["max_speed"])
+                self.__unclamped_speed = None
+
+            if "acceleration" in config and config["acceleration"]:
+                self.__acceleration = abs(config["acceleration"])
+
+            if "deceleration" in config and config["deceleration"] is not None:
+                self.__deceleration = abs(config["deceleration"])
+
+            self.__decel = self.__deceleration if self.__deceleration != 0 else self.__acceleration
+            self.__cmin = self.__scale / self.__max_speed
+            self.__c0 = 0.676 * math.sqrt(2.0 / self.__acceleration) * self.__scale # Equation 15
+            self.__compute_fn()
+
+        else:
+            for key in motion:
+                setattr(self, key, config[key])
+
+        if "speed" in config and config["speed"] is not None:
+            self.speed = config["speed"]
+
+        if "enable" in config and config["enable"] is not None:
+            self.enable_outputs(config["enable"])
+
+    def precompile(self, distances):
+        """Plan the moves from stop over the distances into the profile cache.
+
+        Args:
+            distances (list): Move distances in steps.
+
+        Returns:
+            int: Profiles in the cache, 0 without a profile cache.
+        """
+
+        if self.__profile_cache is None:
+            return 0
+
+        count = 0
+        for distance in distances:
+            if (distance != 0) and (self.__profile_for(int(distance)) is not None):
+                count += 1
+
+        return count
+
+    def profile(self, distance):
+        """Step intervals of a move from stop, as run() steps it.
+
+        Args:
+            distance (int): Distance of the move in steps.
+
+        Returns:
+            array: Step intervals in clock units, None if the move can not be precomputed.
+        """
+
+        if distance == 0:
+            return array("d")
+
+        return self.__profile_for(int(distance))
 
     def enable_outputs(self, state):
         """Enable outputs.
@@ -807,7 +2152,7 @@ class AccelStepper:
 
             if self.__enable_pin != 255:
                 self.__controller.pin_mode(self.__enable_pin, PinMode.Output)
-                self.__controller.digital_write(\
+                self.__digital_write(\
                     self.__enable_pin,\
                     PinState.High ^ self.__enable_inverted)
 
@@ -820,7 +2165,7 @@ class AccelStepper:
 
             if self.__enable_pin != 255:
                 self.__controller.pin_mode(self.__enable_pin, PinMode.Output)
-                self.__controller.digital_write(\
+                self.__digital_write(\
                     self.__enable_pin,\
                     PinState.Low ^ self.__enable_inverted)
 
@@ -828,24 +2173,74 @@ class AccelStepper:
         """Useful during initializations or after initial positioning Sets speed to 0
         """
 
+        self.__profile = None
         self.__target_pos = position
         self.__current_pos = position
+        self.__seek_triggers(position)
         self.__n = 0
         self.__step_interval = 0
         self.speed = 0.0
+        if self.__unclamped_speed is not None:
+            self.__end_clamp()
 
     def move_to(self, absolute):
         """Move the axis to position.
 
         Args:
             absolute (int): Absolute position in steps.
+
+        Raises:
+            ValueError: The move is faster than the host can step in PreflightMode.REJECT.
         """
 
-        if self.__target_pos != absolute:
-            self.__target_pos = absolute
+        if (self.__preflight != PreflightMode.NONE) and (self.__max_step_rate > 0.0):
+            self.__preflight_check(absolute)
 
-        self.__compute_new_speed()
-        # compute new n?
+        self.__move_to(absolute)
+
+    def follow_profile(self, absolute, profile):
+        """Move the axis to position playing back precomputed step intervals.
+
+        Args:
+            absolute (int): Absolute position in steps.
+            profile (array): Step intervals, one per step of the move.
+        """
+
+        self.__target_pos = absolute
+        self.__drop_profile()
+
+        if absolute == self.__current_pos:
+            return
+
+        self.__play_profile(profile)
+
+    def track(self, target, velocity=None):
+        """Stream a new setpoint to the axis.
+
+        Unlike move_to() this does not advance the ramp, so it can be called
+        at any rate, e.g. from a vision loop. The new target is picked up by
+        the state machine on the next step, which keeps the motion inside the
+        acceleration and maximum speed limits.
+
+        Args:
+            target (int): Setpoint in steps.
+            velocity (float, optional): Velocity of the setpoint. Defaults to None.
+        """
+
+        if velocity:
+            # The axis stops speeding up when the target is its braking distance
+            # away, speed^2 / (2 * decel) (Equation 16). Leading the setpoint by
+            # that distance at the setpoint velocity puts this point on the setpoint,
+            # so a moving setpoint is followed instead of trailed. It is not the
+            # setpoint travel while braking, that is twice as far and overshoots.
+            target += round(velocity * abs(self.__speed) / (2.0 * self.__decel))
+
+        self.__drop_profile()
+        self.__target_pos = target
+
+        # Only a stopped axis needs a kick, a running one retargets on its next step.
+        if self.__step_interval == 0:
+            self.__compute_fn()
 
     def move(self, relative):
         """Move the axis with relative steps.
@@ -866,11 +2261,7 @@ class AccelStepper:
         if self.__step_interval <= 0.0:
             return False
 
-        time_now = 0
-        if self.__platform_type == PlatformType.WINDOWS:
-            time_now = time.time()
-        elif self.__platform_type == PlatformType.MICRO_PYTHON:
-            time_now = time.ticks_ms() / 1000
+        time_now = self.__clock()
 
         if (time_now - self.__last_step_time) >= self.__step_interval:
             if self.__direction == Direction.CW:
@@ -880,7 +2271,7 @@ class AccelStepper:
                 # Anticlockwise
                 self.__current_pos -= 1
 
-            self.__step(self.__current_pos)
+            self.__step_fn(self.__current_pos)
 
             self.__last_step_time = time_now # Caution: does not account for costs in __step()
 
@@ -897,15 +2288,46 @@ class AccelStepper:
         """
 
         if self.run_speed():
-            self.__compute_new_speed()
+            if self.__profile is not None:
+                self.__profile_fn()
+            else:
+                self.__compute_fn()
 
-        return (self.speed != 0.0) or (self.distance_to_go != 0)
+        return (self.__speed != 0.0) or (self.__target_pos != self.__current_pos)
 
-    def run_to_position(self):
-        """Blocks until the target position is reached and stopped"""
+    def time_to_next_step(self):
+        """Time left until the next step is due.
 
-        while self.run():
-            pass
+        Returns:
+            float: Time in clock units, None when no step is pending.
+        """
+
+        if self.__step_interval <= 0.0:
+            return None
+
+        return self.__last_step_time + self.__step_interval - self.__clock()
+
+    def run_to_position(self, gc_guard=None):
+        """Blocks until the target position is reached and stopped
+
+        Args:
+            gc_guard (GCGuard, optional): Keeps the collector out of the move. Defaults to None.
+        """
+
+        if gc_guard is None:
+            while self.run():
+                pass
+            return
+
+        gc_guard.begin()
+        try:
+            while self.run():
+                slack = self.time_to_next_step()
+                if slack is not None:
+                    slack /= self.__scale # Clock units to seconds
+                gc_guard.idle(slack)
+        finally:
+            gc_guard.end()
 
     def run_speed_to_position(self):
         """Run speed to position.
@@ -939,89 +2361,184 @@ class AccelStepper:
 
         return not (self.__speed == 0.0) and (self.__target_pos == self.__current_pos)
 
-    def stop(self):
-        """Stop
+    def estimate_duration(self, target=None):
+        """Time the axis needs to reach the target and stop.
+
+        Args:
+            target (int, optional): Target position in steps. Defaults to the current target.
+
+        Returns:
+            float: Duration in seconds.
         """
 
-        if self.__speed != 0.0:
-             # Equation 16 (+integer rounding)
-            steps_to_stop = ((self.__speed * self.__speed) / (2.0 * self.__acceleration)) + 1
+        if target is None:
+            target = self.__target_pos
 
-        if self.__speed > 0:
-            self.move(steps_to_stop)
+        segments = self.__plan(target)
+        if not segments:
+            return 0.0
 
-        else:
-            self.move(-steps_to_stop)
+        start, duration, position, speed, accel = segments[-1]
 
-#endregion
+        return start + duration
 
-class MultiStepper:
+    def position_at(self, t):
+        """Position of the axis on the way to the current target.
 
-    MULTISTEPPER_MAX_STEPPERS = 10
+        Args:
+            t (float): Time from now in seconds.
 
-#region Constructor
+        Returns:
+            float: Position in steps.
+        """
 
-    def __init__(self):
-        self._steppers = [AccelStepper]
+        for start, duration, position, speed, accel in self.__plan(self.__target_pos):
+            if t < start + duration:
+                t = max(t - start, 0.0)
+                return position + (speed * t) + (accel * t * t / 2.0)
 
-#endregion
+        return float(self.__target_pos)
 
-#region Public Methods
+    def velocity_at(self, t):
+        """Velocity of the axis on the way to the current target.
 
-    def add(self, stepper: AccelStepper):
-        if len(self._steppers) >= MultiStepper.MULTISTEPPER_MAX_STEPPERS:
-            return False # No room for more
-        
-        self._steppers.append(stepper)
+        Args:
+            t (float): Time from now in seconds.
+
+        Returns:
+            float: Speed, positive is clockwise.
+        """
 
-        return True
+        for start, duration, position, speed, accel in self.__plan(self.__target_pos):
+            if t < start + duration:
+                return speed + (accel * max(t - start, 0.0))
 
-    def move_to(self, absolute):
-        """First find the stepper that will take the longest time to move.
+        return 0.0
+
+    def time_to_position(self, p):
+        """Time until the axis first passes a position on the way to the current target.
 
         Args:
-            absolute (dict: AccelStepper]): _description_
+            p (float): Position in steps.
+
+        Returns:
+            float: Time from now in seconds, None if the position is not on the way.
         """
-        longest_time = 0.0
 
-        for index in range(len(self._steppers)):
-            current_distance = absolute[index] - self._steppers[index].current_position
-            current_time = abs(current_distance) / self._steppers[index].max_speed
+        if p == self.__current_pos:
+            return 0.0
 
-            if current_time > longest_time:
-                longest_time = current_time
+        for start, duration, position, speed, accel in self.__plan(self.__target_pos):
+            offset = position - p
+            if accel == 0.0:
+                roots = [-offset / speed]
+            else:
+                discriminant = (speed * speed) - (2.0 * accel * offset)
+                if discriminant < 0.0:
+                    continue
+                root = math.sqrt(discriminant)
+                roots = sorted([(-speed - root) / accel, (-speed + root) / accel])
 
-        if longest_time > 0.0:
-            # Now work out a new max speed for each stepper so they will all 
-            # arrived at the same time of longest_time
-            for index in range(len(self._steppers)):
-                current_distance = absolute[index] - self._steppers[index].current_position
-                # S = v * t
-                current_speed = current_distance / longest_time
-                self._steppers[index].move_to(absolute[index]) # New target position (resets speed)
-                self._steppers[index].max_speed = current_speed # New speed
+            for root in roots:
+                # Tolerate the rounding at the segment edges.
+                if -1e-9 <= root <= duration + 1e-9:
+                    return start + max(root, 0.0)
 
-    def run(self):
-        """Returns true if any motor is still running to the target position.
+        return None
 
-        Returns:
-            bool: State
+    def stop(self):
+        """Stop as quickly as possible using the deceleration.
         """
 
-        state = False
+        if self.__speed == 0.0:
+            return
 
-        for index in range(len(self._steppers)):
-            if self._steppers[index].distance_to_go != 0:
-                self._steppers[index].run_speed()
-                state = True
-        
-        return state
+        self.__drop_profile()
 
-    def run_speed_to_position(self):
-        """Blocks until all steppers reach their target position and are stopped
+        # Resume the ramp from the actual speed, it may have been set directly
+        if self.__n >= 0:
+            self.__cn = abs(self.__scale / self.__speed)
+            self.__n = int((self.__speed * self.__speed) / (2.0 * self.__acceleration)) # Equation 16
+
+        # Equation 16 (+integer rounding)
+        steps_to_stop = int((self.__speed * self.__speed) / (2.0 * self.__decel)) + 1
+
+        # Braking is never held back by the preflight
+        if self.__speed > 0:
+            self.__move_to(self.__current_pos + steps_to_stop)
+
+        else:
+            self.__move_to(self.__current_pos - steps_to_stop)
+
+    def calibrate(self, steps=200):
+        """Measure the step rate the host can deliver with this configuration.
+
+        Times the bound step function with the controller and the callbacks,
+        the clock reading and the state machine, on the stepper clock.
+
+        CAUTION: the steps really go out to the motor and the callbacks, back
+        and forth one step around the current position. Call it at rest with
+        the axis free to move a step, or on a stepper bound to a controller
+        that drives nothing. The DRIVER pulse is not slept, its width is added
+        to the measured time instead, so the call takes only as long as the
+        writes. On a coarse clock use enough steps to span a few ticks.
+
+        Args:
+            steps (int, optional): Steps to time. Defaults to 200.
+
+        Returns:
+            float: Steps per clock unit, None if the clock did not move.
         """
 
-        while self.run():
-            pass
+        steps += steps & 1 # End back on the current position
+
+        clock = self.__clock
+        step_fn = self.__step_fn
+        state = (self.__direction, self.__speed, self.__sleep)
+        position = self.__current_pos
+
+        self.__sleep = Clock.skip_sleep
+
+        start = clock()
+        try:
+            for index in range(steps):
+                if index & 1:
+                    self.__direction = Direction.CCW
+                    self.__speed = -1.0
+                    position -= 1
+                else:
+                    self.__direction = Direction.CW
+                    self.__speed = 1.0
+                    position += 1
+                clock()
+                step_fn(position)
+            step_time = clock() - start
+
+        finally:
+            self.__direction, self.__speed, self.__sleep = state
+
+        if self.__interface == InterfaceType.DRIVER:
+            step_time += steps * self.__min_pulse_width * self.__scale
+
+        # The state machine runs offline over a move of the same length.
+        start = clock()
+        self.__compile_profile(steps)
+        math_time = clock() - start
+
+        elapsed = step_time + math_time
+        if elapsed <= 0:
+            return None
+
+        self.__max_step_rate = steps / elapsed
+
+        return self.__max_step_rate
 
 #endregion
+
+def __getattr__(name):
+    # The group controller is compiled only when it is imported.
+    if name == "MultiStepper":
+        from pyaccelstepper.multi_stepper import MultiStepper
+        return MultiStepper
+
+    raise AttributeError(name)
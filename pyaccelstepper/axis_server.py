@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import socket
+import struct
+import time
+
+from pyaccelstepper.multi_stepper import MultiStepper
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+HEADER = struct.Struct("<BH")
+"""Message header: command and payload length in bytes."""
+
+TIME = struct.Struct("<d")
+"""Payload of a single time."""
+
+START = struct.Struct("<dd")
+"""Payload of GO: start time and duration of the move."""
+
+DONE = struct.Struct("<dd")
+"""Head of the DONE payload: actual start and arrival, the positions follow."""
+
+POSITION = struct.Struct("<q")
+"""One axis position."""
+
+#endregion
+
+class Command:
+    """Commands of the axis server protocol.
+    """
+
+    HELLO = 1
+    """Coordinator asks for the axes, the node answers the count."""
+
+    PING = 2
+    """Coordinator time, the node answers its own time."""
+
+    PLAN = 3
+    """Target of every axis, the node answers the duration of its move."""
+
+    GO = 4
+    """Start time and shared duration, the node answers DONE on arrival."""
+
+    DONE = 5
+    """Node arrived."""
+
+    CLOSE = 6
+    """Coordinator is leaving."""
+
+    ERROR = 7
+    """Request failed, the payload is the message."""
+
+def _receive(sock, size):
+    """Read exactly size bytes.
+
+    Args:
+        sock (socket): Connection.
+        size (int): Bytes to read.
+
+    Raises:
+        ConnectionError: The peer closed the connection.
+
+    Returns:
+        bytes: Data.
+    """
+
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed by the peer.")
+        data += chunk
+
+    return data
+
+def send_message(sock, command, payload=b""):
+    """Send one framed message.
+
+    Args:
+        sock (socket): Connection.
+        command (int): Command.
+        payload (bytes, optional): Payload. Defaults to b"".
+    """
+
+    sock.sendall(HEADER.pack(command, len(payload)) + payload)
+
+def receive_message(sock):
+    """Receive one framed message.
+
+    Args:
+        sock (socket): Connection.
+
+    Returns:
+        tuple: Command and payload.
+    """
+
+    command, size = HEADER.unpack(_receive(sock, HEADER.size))
+
+    return command, _receive(sock, size)
+
+def _positions(payload, offset=0):
+    count = (len(payload) - offset) // POSITION.size
+
+    return [POSITION.unpack_from(payload, offset + (POSITION.size * index))[0]
+        for index in range(count)]
+
+def _pack_positions(positions):
+    return b"".join(POSITION.pack(int(position)) for position in positions)
+
+class AxisServer:
+    """Node that hosts a group of steppers behind a socket.
+
+    The coordinator plans the move with the duration of the slowest node,
+    every node starts it at the same future time of the shared clock and
+    reports its actual start and arrival. On one host time.time() is
+    shared by all processes, across hosts the clocks must be synchronized,
+    for example with PTP.
+    """
+
+#region Constructor
+
+    def __init__(self, steppers, host="127.0.0.1", port=0, clock=time.time, **multi_stepper):
+        """Constructor
+
+        Args:
+            steppers (list): Steppers of the node, up to MultiStepper.MULTISTEPPER_MAX_STEPPERS.
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port, 0 picks a free one. Defaults to 0.
+            clock (function, optional): Shared clock in seconds. Defaults to time.time.
+
+        Raises:
+            ValueError: Too many steppers for one node.
+        """
+
+        self.__group = MultiStepper(**multi_stepper)
+        """Steppers of the node.
+        """
+
+        for stepper in steppers:
+            if not self.__group.add(stepper):
+                raise ValueError("A node drives up to {} steppers.".format(
+                    MultiStepper.MULTISTEPPER_MAX_STEPPERS))
+
+        self.__clock = clock
+        """Shared clock.
+        """
+
+        self.__listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        """Listening socket.
+        """
+
+        self.__listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.__listener.bind((host, port))
+        self.__listener.listen(1)
+
+#endregion
+
+#region Properties
+
+    @property
+    def address(self):
+        """Address the node listens on.
+
+        Returns:
+            tuple: Host and port.
+        """
+
+        return self.__listener.getsockname()
+
+    @property
+    def group(self):
+        """Steppers of the node.
+
+        Returns:
+            MultiStepper: Group.
+        """
+
+        return self.__group
+
+#endregion
+
+#region Private Methods
+
+    def __wait_until(self, start_at):
+        """Sleep to just before the start time, then spin to it.
+
+        Args:
+            start_at (float): Start time on the shared clock.
+
+        Returns:
+            float: Time the wait ended.
+        """
+
+        clock = self.__clock
+        remaining = start_at - clock()
+        if remaining > 0.002:
+            time.sleep(remaining - 0.002)
+
+        now = clock()
+        while now < start_at:
+            now = clock()
+
+        return now
+
+    def __go(self, sock, targets, payload):
+        start_at, duration = START.unpack(payload)
+
+        self.__group.move_to(targets, duration)
+
+        started = self.__wait_until(start_at)
+        while self.__group.run():
+            pass
+        arrived = self.__clock()
+
+        send_message(sock, Command.DONE, DONE.pack(started, arrived) + _pack_positions(
+            [stepper.current_position for stepper in self.__group.steppers]))
+
+    def __handle(self, sock):
+        """Serve one coordinator until it leaves.
+
+        Args:
+            sock (socket): Connection.
+
+        Returns:
+            bool: The coordinator asked the node to close.
+        """
+
+        targets = None
+
+        while True:
+            try:
+                command, payload = receive_message(sock)
+            except ConnectionError:
+                return False
+
+            try:
+                if command == Command.HELLO:
+                    send_message(sock, Command.HELLO, POSITION.pack(len(self.__group.steppers)))
+
+                elif command == Command.PING:
+                    send_message(sock, Command.PING, TIME.pack(self.__clock()))
+
+                elif command == Command.PLAN:
+                    targets = _positions(payload)
+                    if len(targets) != len(self.__group.steppers):
+                        raise ValueError("PLAN for {} axes, the node has {}.".format(
+                            len(targets), len(self.__group.steppers)))
+                    send_message(sock, Command.PLAN, TIME.pack(self.__group.move_time(targets)))
+
+                elif command == Command.GO:
+                    if targets is None:
+                        raise ValueError("GO without a PLAN.")
+                    self.__go(sock, targets, payload)
+                    targets = None
+
+                elif command == Command.CLOSE:
+                    return True
+
+                else:
+                    raise ValueError("Unknown command {}.".format(command))
+
+            except (ValueError, struct.error) as error:
+                # A bad payload or a move the group refuses, the coordinator hears why.
+                send_message(sock, Command.ERROR, str(error).encode("utf-8"))
+
+#endregion
+
+#region Public Methods
+
+    def serve_forever(self):
+        """Serve coordinators one after the other until one sends CLOSE.
+        """
+
+        try:
+            while True:
+                sock, _ = self.__listener.accept()
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with sock:
+                    if self.__handle(sock):
+                        break
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop listening.
+        """
+
+        self.__listener.close()
+
+#endregion
+
+class AxisCoordinator:
+    """Distributes synchronized moves over axis server nodes.
+
+    The targets are split over the nodes in the order of their addresses,
+    so the group is as wide as all the nodes together.
+    """
+
+#region Constructor
+
+    def __init__(self, addresses, clock=time.time, timeout=None):
+        """Constructor
+
+        Args:
+            addresses (list): (host, port) of every node.
+            clock (function, optional): Shared clock in seconds. Defaults to time.time.
+            timeout (float, optional): Socket timeout in seconds. Defaults to None.
+        """
+
+        self.__clock = clock
+        """Shared clock.
+        """
+
+        self.__nodes = []
+        """Connections to the nodes.
+        """
+
+        self.__axes = []
+        """Axis count of every node.
+        """
+
+        for address in addresses:
+            sock = socket.create_connection(address, timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.__nodes.append(sock)
+            send_message(sock, Command.HELLO)
+            self.__axes.append(POSITION.unpack(self.__expect(sock, Command.HELLO))[0])
+
+#endregion
+
+#region Properties
+
+    @property
+    def axes(self):
+        """Axis count of every node.
+
+        Returns:
+            list: Counts.
+        """
+
+        return list(self.__axes)
+
+#endregion
+
+#region Private Methods
+
+    def __expect(self, sock, command):
+        """Receive the answer to a command.
+
+        Raises:
+            ValueError: The node reported an error.
+            ConnectionError: The node answered something else.
+
+        Returns:
+            bytes: Payload.
+        """
+
+        answer, payload = receive_message(sock)
+        if answer == Command.ERROR:
+            raise ValueError(payload.decode("utf-8"))
+        if answer != command:
+            raise ConnectionError("Expected {}, got {}.".format(command, answer))
+
+        return payload
+
+    def __split(self, absolute):
+        """Targets of every node.
+
+        Raises:
+            ValueError: The targets do not match the axes.
+        """
+
+        if len(absolute) != sum(self.__axes):
+            raise ValueError("Got {} targets for {} axes.".format(len(absolute), sum(self.__axes)))
+
+        parts = []
+        offset = 0
+        for count in self.__axes:
+            parts.append(absolute[offset:offset + count])
+            offset += count
+
+        return parts
+
+#endregion
+
+#region Public Methods
+
+    def ping(self, rounds=10):
+        """Measure the round trip and the clock offset of every node.
+
+        Args:
+            rounds (int, optional): Pings per node, the best is kept. Defaults to 10.
+
+        Returns:
+            list: Dict of round_trip and offset in seconds per node.
+        """
+
+        results = []
+        for sock in self.__nodes:
+            best = None
+            for _ in range(rounds):
+                sent = self.__clock()
+                send_message(sock, Command.PING, TIME.pack(sent))
+                remote = TIME.unpack(self.__expect(sock, Command.PING))[0]
+                received = self.__clock()
+                round_trip = received - sent
+                if (best is None) or (round_trip < best["round_trip"]):
+                    best = {"round_trip": round_trip,
+                        "offset": remote - ((sent + received) / 2.0)}
+            results.append(best)
+
+        return results
+
+    def move_to(self, absolute, lead=0.05):
+        """Plan a synchronized move and start it on every node.
+
+        Args:
+            absolute (list): Absolute position of every axis of every node.
+            lead (float, optional): Seconds from now to the start, longer than the delivery. Defaults to 0.05.
+
+        Raises:
+            ValueError: A node rejected the move.
+
+        Returns:
+            tuple: Start time and duration of the move.
+        """
+
+        parts = self.__split(absolute)
+
+        for sock, part in zip(self.__nodes, parts):
+            send_message(sock, Command.PLAN, _pack_positions(part))
+
+        duration = 0.0
+        for sock in self.__nodes:
+            duration = max(duration, TIME.unpack(self.__expect(sock, Command.PLAN))[0])
+
+        start_at = self.__clock() + lead
+        for sock in self.__nodes:
+            send_message(sock, Command.GO, START.pack(start_at, duration))
+
+        return start_at, duration
+
+    def wait(self):
+        """Wait for every node to arrive.
+
+        Returns:
+            list: Dict of started, arrived and positions per node.
+        """
+
+        results = []
+        for sock in self.__nodes:
+            payload = self.__expect(sock, Command.DONE)
+            started, arrived = DONE.unpack_from(payload, 0)
+            results.append({"started": started, "arrived": arrived,
+                "positions": _positions(payload, DONE.size)})
+
+        return results
+
+    def run_to(self, absolute, lead=0.05):
+        """Synchronized move, blocks until every node arrived.
+
+        Args:
+            absolute (list): Absolute position of every axis of every node.
+            lead (float, optional): Seconds from now to the start. Defaults to 0.05.
+
+        Returns:
+            dict: Start time, duration, per node results, start and arrival skew in seconds.
+        """
+
+        start_at, duration = self.move_to(absolute, lead)
+        nodes = self.wait()
+
+        starts = [node["started"] for node in nodes]
+        arrivals = [node["arrived"] for node in nodes]
+
+        return {"start_at": start_at, "duration": duration, "nodes": nodes,
+            "start_skew": max(starts) - min(starts),
+            "arrival_skew": max(arrivals) - min(arrivals),
+            "start_late": max(starts) - start_at}
+
+    def close(self, shutdown=False):
+        """Leave the nodes.
+
+        Args:
+            shutdown (bool, optional): Ask the nodes to stop serving. Defaults to False.
+        """
+
+        for sock in self.__nodes:
+            if shutdown:
+                send_message(sock, Command.CLOSE)
+            sock.close()
+
+        self.__nodes = []
+
+#endregion
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import sys
+import time
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https:#choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class PlatformType:
+    NONE = 0
+    WINDOWS = 1
+    LINUX = 2
+    MICRO_PYTHON = 3
+
+    __current = None
+    """Platform of this process, looked up once.
+    """
+
+    @staticmethod
+    def get():
+        # From sys, the platform module is not on every port and is slow to import.
+        if PlatformType.__current is not None:
+            return PlatformType.__current
+
+        platform_type = PlatformType.NONE
+        if sys.implementation.name == "micropython":
+            platform_type = PlatformType.MICRO_PYTHON
+        elif sys.platform.startswith("win"):
+            platform_type = PlatformType.WINDOWS
+        PlatformType.__current = platform_type
+        return platform_type
+
+class Clock:
+    """Time sources for the step timing.
+    """
+
+    @staticmethod
+    def get(platform_type):
+        """Returns the default time source of the platform.
+
+        Args:
+            platform_type (int): Platform type.
+
+        Returns:
+            function: Function that returns the current time in seconds.
+        """
+
+        if platform_type == PlatformType.MICRO_PYTHON:
+            return lambda: time.ticks_ms() / 1000
+
+        return time.time
+
+    @staticmethod
+    def skip_sleep(seconds):
+        """Sleep that returns at once, for virtual clocks and offline timing.
+
+        Args:
+            seconds (float): Ignored.
+        """
+
+        pass
+
+class Monotonic:
+    """Monotonic timer for durations and periods, apart from the step clock.
+
+    The readings are microsecond ticks on MicroPython, which wrap around,
+    and seconds elsewhere. Compare them only through elapsed(). ticks()
+    gives integer readings for timestamps, compare them with ticks_diff().
+    """
+
+    if hasattr(time, "ticks_us"):
+        TICKS_TIMESCALE = "1 us"
+        """Unit of ticks() as a VCD timescale."""
+
+        @staticmethod
+        def ticks():
+            """Returns an integer reading of the timer, it wraps around.
+
+            Returns:
+                int: Ticks in microseconds.
+            """
+
+            return time.ticks_us()
+
+        @staticmethod
+        def ticks_diff(end, start):
+            """Ticks between two integer readings, across the wraparound.
+
+            Args:
+                end (int): Later reading.
+                start (int): Earlier reading.
+
+            Returns:
+                int: Ticks.
+            """
+
+            return time.ticks_diff(end, start)
+
+        @staticmethod
+        def now():
+            """Returns a reading of the timer.
+
+            Returns:
+                int: Ticks in microseconds.
+            """
+
+            return time.ticks_us()
+
+        @staticmethod
+        def elapsed(start, end):
+            """Time between two readings, across the wraparound of the ticks.
+
+            Args:
+                start (int): Earlier reading.
+                end (int): Later reading.
+
+            Returns:
+                float: Time in seconds.
+            """
+
+            return time.ticks_diff(end, start) / 1000000
+
+    else:
+        TICKS_TIMESCALE = "1 ns"
+        """Unit of ticks() as a VCD timescale."""
+
+        @staticmethod
+        def ticks():
+            """Returns an integer reading of the timer.
+
+            Returns:
+                int: Ticks in nanoseconds.
+            """
+
+            return time.perf_counter_ns()
+
+        @staticmethod
+        def ticks_diff(end, start):
+            """Ticks between two integer readings.
+
+            Args:
+                end (int): Later reading.
+                start (int): Earlier reading.
+
+            Returns:
+                int: Ticks.
+            """
+
+            return end - start
+
+        @staticmethod
+        def now():
+            """Returns a reading of the timer.
+
+            Returns:
+                float: Time in seconds.
+            """
+
+            return time.perf_counter()
+
+        @staticmethod
+        def elapsed(start, end):
+            """Time between two readings.
+
+            Args:
+                start (float): Earlier reading.
+                end (float): Later reading.
+
+            Returns:
+                float: Time in seconds.
+            """
+
+            return end - start
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+from pyaccelstepper.constants import InterfaceType
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https:#choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+COIL_SEQUENCES = {
+    InterfaceType.FULL2WIRE: ((0b10, 0b11, 0b01, 0b00), 4),
+    InterfaceType.FULL3WIRE: ((0b100, 0b001, 0b010), 3),
+    InterfaceType.FULL4WIRE: ((0b0101, 0b0110, 0b1010, 0b1001), 3), # step % 3 as before
+    InterfaceType.HALF3WIRE: ((0b100, 0b101, 0b001, 0b011, 0b010, 0b110), 6),
+    InterfaceType.HALF4WIRE: ((0b0001, 0b0101, 0b0100, 0b0110, 0b0010, 0b1010, 0b1000, 0b1001), 8),
+    }
+"""Pin masks of the coil interfaces and the step modulus.
+"""
+
+#endregion
+
+def coil_writes(interface, pin_writes):
+    """Pin writes of every step of a coil interface.
+
+    Args:
+        interface (int): Interface type.
+        pin_writes (tuple): Pin writes of every output mask.
+
+    Returns:
+        tuple: Pin writes of the steps and the step modulus.
+    """
+
+    masks, count = COIL_SEQUENCES[interface]
+
+    return tuple([pin_writes[mask] for mask in masks]), count
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https:#choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class InterfaceType:
+    """Driver interface type.
+    """
+
+    FUNCTION = 1
+    DRIVER = 2
+    FULL2WIRE = 3
+    FULL3WIRE = 4
+    FULL4WIRE = 5
+    HALF3WIRE = 6
+    HALF4WIRE = 7
+
+class ProfileType:
+    """Motion profile type.
+    """
+
+    TRAPEZOID = 1
+    SCURVE = 2
+
+class PreflightMode:
+    """What move_to() does with a move faster than the host can step.
+    """
+
+    NONE = 0
+    REJECT = 1
+    CLAMP = 2
+
+class HookEvent:
+    """Events the profiling hooks can subscribe to.
+    """
+
+    STEP = 1
+    """Step fired, hook(stepper, position)."""
+
+    PLAN_ENTER = 2
+    """State machine or profile playback entered, hook(stepper)."""
+
+    PLAN_EXIT = 3
+    """State machine or profile playback left, hook(stepper)."""
+
+    WRITE = 4
+    """Controller write issued, the enable pin included, hook(stepper, pin, state)."""
+
+    PHASE = 5
+    """Motion phase changed, hook(stepper, old, new)."""
+
+class MotionPhase:
+    """Motion phase, from the sign of the state machine index.
+    """
+
+    STOPPED = 0
+    ACCEL = 1
+    CRUISE = 2
+    DECEL = 3
+
+class Direction:
+    """Directions
+    """
+
+    NONE = 0
+    CW = 1
+    CCW = 2
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https:#choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class Utils:
+    """Utilities"""
+
+    @staticmethod
+    def constrain(value, min, max):
+
+        output = value
+
+        if value < min:
+            output = min
+
+        elif value > max:
+            output = max
+
+        return output
+
+class PinMode:
+    Output = 1
+    Input = 2
+
+class PinState:
+    Low = 0
+    High = 15
+
+class Edge:
+    Rising = 1
+    Falling = 2
+    Both = 3
+
+class IController(object):
+    """Interface class for the controllers.
+
+    Args:
+        object (object): Instance of the object.
+    """
+
+#region Variables
+
+    _config = None
+    """Config
+    """
+
+#endregion
+
+#region Constructor
+
+    def __init__(self, config={}):
+        """Constructor
+
+        Args:
+            config (dict, optional): Configuration objects. Defaults to {}.
+        """
+
+        self._config = config
+
+#endregion
+
+#region Public Methods
+
+    def pin_mode(self, pin, mode):
+        """Set the pin mode.
+
+        Args:
+            pin (int): Pin index.
+            mode (int): Mode.
+        """
+
+        pass
+
+    def digital_write(self, pin, state):
+        """Set the pin.
+
+        Args:
+            pin (int): Pin index.
+            state (int): State.
+        """
+
+        pass
+
+    def digital_read(self, pin):
+        """Read the pin.
+
+        Args:
+            pin (int): Pin index.
+
+        Returns:
+            int: State, None when the controller has no inputs.
+        """
+
+        return None
+
+    def add_edge_callback(self, pin, callback, edge=Edge.Both):
+        """Call a function on the edges of an input.
+
+        Args:
+            pin (int): Pin index.
+            callback (function): Called with the pin and its new state.
+            edge (int, optional): Edges to report. Defaults to Edge.Both.
+
+        Returns:
+            bool: False when the controller can not report edges, poll digital_read instead.
+        """
+
+        return False
+
+    def remove_edge_callback(self, pin, callback):
+        """Stop calling a function on the edges of an input.
+
+        Args:
+            pin (int): Pin index.
+            callback (function): Callback added before.
+        """
+
+        pass
+
+#endregion
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import time
+from array import array
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class OverflowMode:
+    """What a full dispatcher does with a new callback.
+    """
+
+    DROP = 0
+    """Drop it and count it."""
+
+    INLINE = 1
+    """Run it in the step loop, late but not lost."""
+
+class CallbackDispatcher:
+    """Runs the deferred step callbacks away from the step loop.
+
+    The step loop only writes the callback and the step data to a
+    preallocated ring, a worker thread or the idle time of the main loop
+    calls drain() to run them. Every deferred callback is called with the
+    position, the direction and the time the step was due. The ring has
+    one writer and one reader: post from a single thread, and drain()
+    only while the worker thread is stopped, pass start=False to drain
+    from the main loop.
+    """
+
+#region Variables
+
+    __shared = None
+    """Dispatcher of the steppers without one of their own.
+    """
+
+#endregion
+
+#region Constructor
+
+    def __init__(self, capacity=1024, overflow=OverflowMode.DROP, idle=0.001, start=True):
+        """Constructor
+
+        Args:
+            capacity (int, optional): Callbacks the ring holds. Defaults to 1024.
+            overflow (int, optional): OverflowMode of a full ring. Defaults to OverflowMode.DROP.
+            idle (float, optional): Sleep of the worker on an empty ring in seconds. Defaults to 0.001.
+            start (bool, optional): Start the worker thread. Defaults to True.
+        """
+
+        self.__capacity = capacity
+        """Callbacks the ring holds.
+        """
+
+        self.__overflow = overflow
+        """Overflow mode.
+        """
+
+        self.__idle = idle
+        """Sleep of the worker on an empty ring.
+        """
+
+        self.__callbacks = [None] * capacity
+        self.__positions = array("l", [0]) * capacity
+        self.__directions = array("b", [0]) * capacity
+        self.__times = array("d", [0.0]) * capacity
+
+        self.__head = 0
+        """Callbacks posted, moved only by the writer.
+        """
+
+        self.__tail = 0
+        """Callbacks taken, moved only by the reader.
+        """
+
+        self.__dropped = 0
+        """Callbacks lost to a full ring.
+        """
+
+        self.__errors = 0
+        """Callbacks that raised.
+        """
+
+        self.__last_error = None
+        """Last exception of a callback.
+        """
+
+        self.__running = False
+        """Worker thread should run.
+        """
+
+        self.__active = False
+        """Worker thread has not left yet.
+        """
+
+        if start:
+            self.start()
+
+#endregion
+
+#region Properties
+
+    @property
+    def capacity(self):
+        """Callbacks the ring holds.
+
+        Returns:
+            int: Capacity.
+        """
+
+        return self.__capacity
+
+    @property
+    def pending(self):
+        """Callbacks waiting in the ring.
+
+        Returns:
+            int: Pending callbacks.
+        """
+
+        return self.__head - self.__tail
+
+    @property
+    def executed(self):
+        """Callbacks run from the ring.
+
+        Returns:
+            int: Executed callbacks.
+        """
+
+        return self.__tail
+
+    @property
+    def dropped(self):
+        """Callbacks lost to a full ring.
+
+        Returns:
+            int: Dropped callbacks.
+        """
+
+        return self.__dropped
+
+    @property
+    def errors(self):
+        """Callbacks that raised.
+
+        Returns:
+            int: Errors.
+        """
+
+        return self.__errors
+
+    @property
+    def last_error(self):
+        """Last exception of a callback.
+
+        Returns:
+            Exception: Exception or None.
+        """
+
+        return self.__last_error
+
+    @property
+    def running(self):
+        """Worker thread runs.
+
+        Returns:
+            bool: State.
+        """
+
+        return self.__running
+
+#endregion
+
+#region Private Methods
+
+    def __call(self, callback, position, direction, time_stamp):
+        try:
+            callback(position, direction, time_stamp)
+        except Exception as error:
+            self.__errors += 1
+            self.__last_error = error
+
+    def __drain(self, limit):
+        tail = self.__tail
+        end = self.__head
+        if (limit is not None) and (end - tail > limit):
+            end = tail + limit
+
+        count = end - tail
+        while tail < end:
+            index = tail % self.__capacity
+            callback = self.__callbacks[index]
+            self.__callbacks[index] = None
+            self.__call(callback, self.__positions[index],
+                self.__directions[index], self.__times[index])
+            tail += 1
+            self.__tail = tail
+
+        return count
+
+    def __work(self):
+        try:
+            while self.__running:
+                if self.__drain(None) == 0:
+                    time.sleep(self.__idle)
+        finally:
+            self.__active = False
+
+#endregion
+
+#region Public Methods
+
+    def post(self, callback, position, direction, time_stamp):
+        """Queue a callback with the data of its step.
+
+        Args:
+            callback (function): Called with position, direction and time.
+            position (int): Position after the step.
+            direction (int): Direction of the step.
+            time_stamp (float): Time the step was due.
+        """
+
+        head = self.__head
+        if head - self.__tail >= self.__capacity:
+            if self.__overflow == OverflowMode.INLINE:
+                self.__call(callback, position, direction, time_stamp)
+            else:
+                self.__dropped += 1
+            return
+
+        index = head % self.__capacity
+        self.__callbacks[index] = callback
+        self.__positions[index] = position
+        self.__directions[index] = direction
+        self.__times[index] = time_stamp
+        # The head goes last, the reader sees only complete entries.
+        self.__head = head + 1
+
+    def drain(self, limit=None):
+        """Run the queued callbacks in the calling thread.
+
+        Args:
+            limit (int, optional): Most callbacks to run. Defaults to all.
+
+        Raises:
+            RuntimeError: The worker thread drains the ring, a second reader could run a callback twice or skip it.
+
+        Returns:
+            int: Callbacks run.
+        """
+
+        if self.__active:
+            raise RuntimeError("The worker thread drains the dispatcher, stop() it first.")
+
+        return self.__drain(limit)
+
+    def start(self):
+        """Start the worker thread, on MicroPython through _thread.
+        """
+
+        if self.__running:
+            return
+
+        self.__running = True
+        self.__active = True
+
+        try:
+            import threading
+        except ImportError:
+            import _thread
+            _thread.start_new_thread(self.__work, ())
+        else:
+            threading.Thread(target=self.__work, daemon=True).start()
+
+    def stop(self, drain=True):
+        """Stop the worker thread.
+
+        Args:
+            drain (bool, optional): Run what is left in the calling thread. Defaults to True.
+        """
+
+        self.__running = False
+        while self.__active:
+            time.sleep(self.__idle)
+
+        if drain:
+            self.drain()
+
+    def reset_counters(self):
+        """Zero the drop and error counters.
+        """
+
+        self.__dropped = 0
+        self.__errors = 0
+        self.__last_error = None
+
+    @staticmethod
+    def shared():
+        """Dispatcher of the steppers without one of their own, started on first use.
+
+        Returns:
+            CallbackDispatcher: Dispatcher.
+        """
+
+        if CallbackDispatcher.__shared is None:
+            CallbackDispatcher.__shared = CallbackDispatcher()
+
+        return CallbackDispatcher.__shared
+
+#endregion
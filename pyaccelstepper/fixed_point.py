@@ -0,0 +1,603 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import math
+import time
+
+from pyaccelstepper.constants import InterfaceType
+from pyaccelstepper.controller import IController, PinMode
+
+try:
+    import micropython
+    native = micropython.native
+except ImportError:
+    def native(function):
+        return function
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+FRACTION_BITS = 8
+"""Fraction bits of the step intervals."""
+
+MAX_INTERVAL = (1 << 29) - 1
+"""Largest interval that keeps Equation 13 inside the MicroPython small ints."""
+
+def _ticks_us():
+    return time.perf_counter_ns() // 1000
+
+def _ticks_diff(end, start):
+    return end - start
+
+class FixedPointStepper:
+    """Allocation free integer stepper engine.
+
+    Runs the same Equation 13 ramp as AccelStepper, but in integer
+    microseconds with FRACTION_BITS of fraction. Everything the step path
+    needs is prepared at configuration time, the controller methods and
+    the tick functions are bound once, and the steps to stop are tracked
+    from the state machine index instead of the speed (Equation 16), so a
+    step allocates nothing on the MicroPython heap.
+
+    Supports the FUNCTION and the DRIVER interfaces.
+    """
+
+#region Constructor
+
+    def __init__(self, **config):
+        """Constructor
+        """
+
+        self.__interface = InterfaceType.FUNCTION
+        """Signals interface.
+        """
+
+        self.__forward = ()
+        """Forward callbacks.
+        """
+
+        self.__backward = ()
+        """Backward callbacks.
+        """
+
+        self.__controller = IController()
+        """Controller that will pass the signals to the pins.
+        """
+
+        self.__pins = [0, 1]
+        """Step and direction pins.
+        """
+
+        self.__ticks = _ticks_us
+        """Microseconds time source.
+        """
+
+        self.__ticks_diff = _ticks_diff
+        """Difference of two time source values.
+        """
+
+        self.__pulse_us = 0
+        """Step pulse width in microseconds.
+        """
+
+        self.__max_speed = 1.0
+        """Maximum speed in steps per second.
+        """
+
+        self.__acceleration = 1.0
+        """Acceleration in steps per second squared.
+        """
+
+        self.__deceleration = 0.0
+        """Deceleration, 0 to brake with the acceleration.
+        """
+
+        self.__current_pos = 0
+        """Axis current position.
+        """
+
+        self.__target_pos = 0
+        """Axis target position.
+        """
+
+        self.__direction = 1
+        """Direction, 1 is clockwise and -1 anticlockwise.
+        """
+
+        self.__n = 0
+        """State machine index.
+        """
+
+        self.__cn = 0
+        """Current step interval, fixed point.
+        """
+
+        self.__interval = 0
+        """Current step interval in microseconds, 0 when stopped.
+        """
+
+        self.__last_step_time = 0
+        """Last step time in microseconds.
+        """
+
+        self.__c0 = 0
+        """First step interval, fixed point (Equation 15).
+        """
+
+        self.__cmin = 0
+        """Step interval at maximum speed, fixed point.
+        """
+
+        self.__n_cruise = 0
+        """State machine index at maximum speed (Equation 16).
+        """
+
+        self.__brake_ratio = 1 << FRACTION_BITS
+        """Acceleration over deceleration, fixed point.
+        """
+
+        self.__accel_ratio = 1 << FRACTION_BITS
+        """Deceleration over acceleration, fixed point.
+        """
+
+        if "interface" in config and config["interface"] is not None:
+            self.__interface = config["interface"]
+
+        if "controller" in config and config["controller"] is not None:
+            self.__controller = config["controller"]
+
+        if "pins" in config and config["pins"] is not None:
+            self.__pins = config["pins"]
+
+        if "cb_cw" in config and config["cb_cw"] is not None:
+            self.__forward = tuple(config["cb_cw"])
+
+        if "cb_ccw" in config and config["cb_ccw"] is not None:
+            self.__backward = tuple(config["cb_ccw"])
+
+        if hasattr(time, "ticks_us"):
+            self.__ticks = time.ticks_us
+            self.__ticks_diff = time.ticks_diff
+
+        if "ticks" in config and config["ticks"] is not None:
+            self.__ticks = config["ticks"]
+
+        if "ticks_diff" in config and config["ticks_diff"] is not None:
+            self.__ticks_diff = config["ticks_diff"]
+
+        if "pulse_us" in config and config["pulse_us"] is not None:
+            self.__pulse_us = config["pulse_us"]
+
+        # Bound once, a method lookup per step would allocate.
+        self.__write = self.__controller.digital_write
+        self.__step_pin = self.__pins[0]
+        self.__dir_pin = self.__pins[1]
+        self.__driver = self.__interface == InterfaceType.DRIVER
+
+        if "max_speed" in config and config["max_speed"] is not None:
+            self.__max_speed = abs(config["max_speed"])
+
+        if "acceleration" in config and config["acceleration"] is not None:
+            self.__acceleration = abs(config["acceleration"])
+
+        if "deceleration" in config and config["deceleration"] is not None:
+            self.__deceleration = abs(config["deceleration"])
+
+        self.__update_constants()
+
+        if self.__interface == InterfaceType.DRIVER:
+            self.__controller.pin_mode(self.__step_pin, PinMode.Output)
+            self.__controller.pin_mode(self.__dir_pin, PinMode.Output)
+
+#endregion
+
+#region Properties
+
+    @property
+    def current_position(self):
+        """Current position of the axis.
+
+        Returns:
+            int: Current position in steps.
+        """
+
+        return self.__current_pos
+
+    @property
+    def target_position(self):
+        """Target position.
+
+        Returns:
+            int: Target position in steps.
+        """
+
+        return self.__target_pos
+
+    @property
+    def distance_to_go(self):
+        """Distance to go.
+
+        Returns:
+            int: Distance to go in steps.
+        """
+
+        return self.__target_pos - self.__current_pos
+
+    @property
+    def speed(self):
+        """Current speed, this one allocates a float.
+
+        Returns:
+            float: Speed in steps per second.
+        """
+
+        if self.__interval == 0:
+            return 0.0
+
+        return self.__direction * (1000000.0 * (1 << FRACTION_BITS)) / self.__cn
+
+    @property
+    def max_speed(self):
+        """Returns maximum speed.
+
+        Returns:
+            float: Maximum speed in steps per second.
+        """
+
+        return self.__max_speed
+
+    @max_speed.setter
+    def max_speed(self, speed):
+        """Set maximum speed.
+
+        Args:
+            speed (float): Maximum speed in steps per second.
+        """
+
+        self.__max_speed = abs(speed)
+        self.__update_constants()
+
+    @property
+    def acceleration(self):
+        """Returns acceleration.
+
+        Returns:
+            float: Acceleration in steps per second squared.
+        """
+
+        return self.__acceleration
+
+    @acceleration.setter
+    def acceleration(self, acceleration):
+        """Set acceleration.
+
+        Args:
+            acceleration (float): Acceleration in steps per second squared.
+        """
+
+        if acceleration == 0.0:
+            return
+
+        acceleration = abs(acceleration)
+
+        # Recompute self.__n per Equation 17
+        if self.__n > 0:
+            self.__n = int(self.__n * self.__acceleration / acceleration)
+
+        self.__acceleration = acceleration
+        self.__update_constants()
+
+    @property
+    def deceleration(self):
+        """Returns deceleration.
+
+        Returns:
+            float: Deceleration in steps per second squared.
+        """
+
+        if self.__deceleration == 0.0:
+            return self.__acceleration
+
+        return self.__deceleration
+
+    @deceleration.setter
+    def deceleration(self, deceleration):
+        """Set deceleration, 0 to brake with the acceleration.
+
+        Args:
+            deceleration (float): Deceleration in steps per second squared.
+        """
+
+        old = self.deceleration
+        self.__deceleration = abs(deceleration)
+
+        # Recompute self.__n per Equation 17
+        if self.__n < 0:
+            self.__n = int(self.__n * old / self.deceleration)
+
+        self.__update_constants()
+
+#endregion
+
+#region Private Methods
+
+    def __update_constants(self):
+        """Prepare the fixed point constants, floats are fine here.
+        """
+
+        one = 1 << FRACTION_BITS
+        deceleration = self.deceleration
+
+        # Equation 15
+        c0 = 0.676 * math.sqrt(2.0 / self.__acceleration) * 1000000.0 * one
+        cmin = 1000000.0 * one / self.__max_speed
+
+        if (c0 > MAX_INTERVAL) or (cmin > MAX_INTERVAL):
+            raise ValueError("Step interval does not fit in the small ints, raise the acceleration or the maximum speed.")
+
+        self.__c0 = int(c0)
+        self.__cmin = max(int(cmin), 1)
+        self.__n_cruise = int((self.__max_speed * self.__max_speed) / (2.0 * self.__acceleration)) # Equation 16
+        self.__brake_ratio = int(one * self.__acceleration / deceleration)
+        self.__accel_ratio = int(one * deceleration / self.__acceleration)
+
+    @native
+    def __compute_new_speed(self):
+        """Equation 13 in fixed point.
+        """
+
+        distance_to = self.__target_pos - self.__current_pos
+        n = self.__n
+
+        # Equation 16, the index counts the steps to stop while accelerating
+        if n > 0:
+            steps_to_stop = n
+            if steps_to_stop > self.__n_cruise:
+                steps_to_stop = self.__n_cruise
+            steps_to_stop = (steps_to_stop * self.__brake_ratio) >> FRACTION_BITS
+        else:
+            steps_to_stop = -n
+
+        # A finished deceleration, or the first step speed, is a stop speed too,
+        # even when the deceleration is too low to brake it within a step
+        if (distance_to == 0) and ((steps_to_stop <= 1) or (n == 0) or (self.__cn >= self.__c0)):
+            # We are at the target and its time to stop
+            self.__interval = 0
+            self.__n = 0
+            return
+
+        if distance_to != 0:
+            if distance_to > 0:
+                remaining = distance_to
+                right_way = self.__direction > 0
+            else:
+                remaining = -distance_to
+                right_way = self.__direction < 0
+
+            # Steps to stop the axis can still brake over, on top of the
+            # speeds that pass the stop test at the target
+            slack = self.__brake_ratio >> (FRACTION_BITS + 1)
+            if slack < 1:
+                slack = 1
+            reachable = remaining + slack
+
+            if n > 0:
+                if not right_way:
+                    n = -steps_to_stop # Going the wrong way, decelerate now
+                else:
+                    # Accelerate only if the braking point can still be hit after the step
+                    after = n + 1
+                    if after > self.__n_cruise:
+                        after = self.__n_cruise
+                    if ((after * self.__brake_ratio) >> FRACTION_BITS) > reachable - 1:
+                        if steps_to_stop <= reachable:
+                            n = -remaining # Brake to stop at the target
+                        else:
+                            n = -steps_to_stop # Too close, overshoot and come back
+
+            elif (n < 0) and right_way and (remaining != -n):
+                # Decelerating, the target moved
+                accelerate = False
+                if remaining > -n:
+                    after = ((steps_to_stop * self.__accel_ratio) >> FRACTION_BITS) + 1
+                    if after > self.__n_cruise:
+                        after = self.__n_cruise
+                    accelerate = ((after * self.__brake_ratio) >> FRACTION_BITS) <= reachable - 1
+
+                if accelerate:
+                    n = (steps_to_stop * self.__accel_ratio) >> FRACTION_BITS # Start acceleration
+                elif steps_to_stop <= reachable:
+                    n = -remaining # Brake to stop at the target
+
+        if n == 0:
+            # First step from stopped
+            cn = self.__c0
+            if distance_to > 0:
+                self.__direction = 1
+            else:
+                self.__direction = -1
+
+        else:
+            # Subsequent step. Works for accel (n is +_ve) and decel (n is -ve).
+            cn = self.__cn
+            cn = cn - ((cn + cn) // ((4 * n) + 1)) # Equation 13
+            if cn < self.__cmin:
+                cn = self.__cmin
+                # Cruising, keep the index from growing out of the small ints
+                if n > self.__n_cruise:
+                    n = self.__n_cruise
+
+        self.__n = n + 1
+        self.__cn = cn
+        self.__interval = cn >> FRACTION_BITS
+        if self.__interval == 0:
+            self.__interval = 1
+
+    @native
+    def __step(self):
+        """Issue one step in the current direction.
+        """
+
+        if self.__driver:
+            self.__write(self.__dir_pin, self.__direction < 0)
+            self.__write(self.__step_pin, 1)
+            if self.__pulse_us:
+                start = self.__ticks()
+                while self.__ticks_diff(self.__ticks(), start) < self.__pulse_us:
+                    pass
+            self.__write(self.__step_pin, 0)
+
+        elif self.__direction > 0:
+            for callback in self.__forward:
+                callback()
+
+        else:
+            for callback in self.__backward:
+                callback()
+
+#endregion
+
+#region Public Methods
+
+    def set_current_position(self, position):
+        """Set the position, the axis stops.
+
+        Args:
+            position (int): Position in steps.
+        """
+
+        self.__target_pos = position
+        self.__current_pos = position
+        self.__n = 0
+        self.__interval = 0
+
+    def move_to(self, absolute):
+        """Move the axis to position.
+
+        Args:
+            absolute (int): Absolute position in steps.
+        """
+
+        self.__target_pos = int(absolute)
+
+        # A running axis picks the new target up on its next step
+        if self.__interval == 0:
+            self.__compute_new_speed()
+
+    def move(self, relative):
+        """Move the axis with relative steps.
+
+        Args:
+            relative (int): Relative position in steps.
+        """
+
+        self.move_to(self.__current_pos + relative)
+
+    @native
+    def run_speed(self):
+        """Step if the interval has passed.
+
+        Returns:
+            bool: True if a step occurred.
+        """
+
+        if self.__interval == 0:
+            return False
+
+        now = self.__ticks()
+        if self.__ticks_diff(now, self.__last_step_time) < self.__interval:
+            return False
+
+        self.__current_pos += self.__direction
+        self.__step()
+        self.__last_step_time = now
+
+        return True
+
+    @native
+    def run(self):
+        """Run the motor to the target position, call at least once per step.
+
+        Returns:
+            bool: True while the motor is still running to the target position.
+        """
+
+        if self.run_speed():
+            self.__compute_new_speed()
+
+        return (self.__interval != 0) or (self.__target_pos != self.__current_pos)
+
+    def run_to_position(self):
+        """Blocks until the target position is reached and stopped"""
+
+        while self.run():
+            pass
+
+    def stop(self):
+        """Stop as quickly as possible using the deceleration.
+        """
+
+        if self.__interval == 0:
+            return
+
+        n = self.__n
+        if n > 0:
+            if n > self.__n_cruise:
+                n = self.__n_cruise
+            n = (n * self.__brake_ratio) >> FRACTION_BITS
+        else:
+            n = -n
+
+        self.__target_pos = self.__current_pos + (self.__direction * (n + 1))
+
+#endregion
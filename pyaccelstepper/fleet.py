@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pyaccelstepper.accel_stepper import AccelStepper
+from pyaccelstepper.constants import InterfaceType
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+RESULT_KEYS = ("duration", "steps", "peak_speed", "min_interval", "max_interval", "mean_interval")
+"""Results of every simulated profile."""
+
+#endregion
+
+def _expand(values, count):
+    if isinstance(values, (int, float)):
+        return [values] * count
+    return list(values)
+
+def _simulate_chunk(chunk):
+    return Fleet.simulate(*chunk)
+
+class Fleet:
+    """Runs the AccelStepper state machine for many moves at once.
+
+    Every move starts from stop at position 0, with the first step due one
+    interval after the start. Without NumPy every move is planned by
+    AccelStepper itself. With NumPy the moves of a batch advance together,
+    one step per iteration, through a vectorized copy of the state machine
+    that benchmarks/fleet_sweep.py checks against AccelStepper.
+    """
+
+#region Private Methods
+
+    @staticmethod
+    def __simulate_one(stepper, distance, max_speed, acceleration, deceleration, scale):
+        """Plan one move with the state machine of AccelStepper.
+
+        Returns:
+            tuple: The results in the order of RESULT_KEYS.
+        """
+
+        stepper.configure(speed_scale=scale, max_speed=max_speed,
+            acceleration=acceleration, deceleration=deceleration)
+
+        profile = stepper.profile(distance)
+        if profile is None:
+            raise ValueError("Move of {} steps does not end at the target.".format(distance))
+
+        if len(profile) == 0:
+            return (0.0, 0, 0.0, 0.0, 0.0, 0.0)
+
+        duration = 0.0
+        for interval in profile:
+            duration += interval
+        min_interval = min(profile)
+
+        return (duration, len(profile), scale / min_interval, min_interval,
+            max(profile), duration / len(profile))
+
+    @staticmethod
+    def __simulate_numpy(distance, max_speed, acceleration, deceleration, scale):
+        """Run the state machine for all moves at once, one step per iteration.
+
+        Returns:
+            dict: Arrays of the results.
+        """
+
+        count = len(distance)
+
+        c0 = 0.676 * numpy.sqrt(2.0 / acceleration) * scale # Equation 15
+        cmin = scale / max_speed
+        ratio = deceleration / acceleration
+
+        # Speeds squared that pass the stop test at the target
+        stop_speed = scale / c0
+        stop_speed = numpy.maximum(stop_speed * stop_speed, 4.0 * deceleration)
+
+        position = numpy.zeros(count, dtype=numpy.int64)
+        speed = numpy.zeros(count)
+        n = numpy.zeros(count)
+        cn = numpy.zeros(count)
+        forward = numpy.ones(count, dtype=bool)
+
+        duration = numpy.zeros(count)
+        steps = numpy.zeros(count, dtype=numpy.int64)
+        min_interval = numpy.full(count, numpy.inf)
+        max_interval = numpy.zeros(count)
+
+        # Indices of the moves still running, the rest drop out of the arrays.
+        active = numpy.arange(count)
+        state = (distance, scale, deceleration, ratio, c0, cmin, stop_speed, position, speed, n, cn, forward)
+
+        while len(active) > 0:
+            distance_a, scale_a, decel_a, ratio_a, c0_a, cmin_a, stop_a, position_a, speed_a, n_a, cn_a, forward_a = state
+
+            distance_to = distance_a - position_a
+            steps_to_stop = numpy.trunc((speed_a * speed_a) / (2.0 * decel_a)) # Equation 16
+
+            running = ~((distance_to == 0) & ((steps_to_stop <= 1) | (n_a == 0) | \
+                (numpy.abs(speed_a) <= scale_a / c0_a)))
+            if not running.all():
+                active = active[running]
+                state = tuple([item[running] for item in state])
+                continue
+
+            ahead = distance_to > 0
+            moving = distance_to != 0
+            remaining = numpy.abs(distance_to)
+            right_way = (ahead & forward_a) | (~ahead & ~forward_a)
+
+            wrong_way = moving & (n_a > 0) & ~right_way
+            check = moving & ~wrong_way & ((n_a > 0) | ((n_a < 0) & right_way & (remaining != -n_a)))
+
+            # Accelerate only if the braking point can still be hit after the step
+            reachable = stop_a + (2.0 * decel_a * remaining)
+            accel_n = numpy.where(n_a < 0, numpy.where(remaining > -n_a, -n_a * ratio_a, 0.0), n_a) # Equation 17
+            trying = check & (accel_n > 0)
+            safe_n = numpy.where(trying, accel_n, 1.0)
+            next_cn = numpy.maximum(cn_a - ((2.0 * cn_a) / ((4.0 * safe_n) + 1)), cmin_a) # Equation 13
+            next_speed = scale_a / next_cn
+            accelerate = trying & ((next_speed * next_speed) < (reachable - (2.0 * decel_a)))
+
+            brake = check & ~accelerate & ((speed_a * speed_a) < reachable)
+            overshoot = check & ~accelerate & ~brake & (n_a > 0)
+
+            n_a = numpy.where(wrong_way | overshoot, -steps_to_stop, n_a)
+            n_a = numpy.where(accelerate, accel_n, n_a)
+            n_a = numpy.where(brake, -remaining, n_a)
+
+            start = n_a == 0
+            safe_n = numpy.where(start, 1.0, n_a)
+            cn_a = numpy.where(start, c0_a, numpy.where(accelerate, next_cn,
+                numpy.maximum(cn_a - ((2.0 * cn_a) / ((4.0 * safe_n) + 1)), cmin_a))) # Equation 13
+            forward_a = numpy.where(start, ahead, forward_a)
+
+            n_a = numpy.trunc(n_a + 1)
+
+            speed_a = numpy.where(forward_a, scale_a / cn_a, -(scale_a / cn_a))
+            position_a = position_a + numpy.where(forward_a, 1, -1)
+
+            duration[active] += cn_a
+            steps[active] += 1
+            min_interval[active] = numpy.minimum(min_interval[active], cn_a)
+            max_interval[active] = numpy.maximum(max_interval[active], cn_a)
+
+            state = (distance_a, scale_a, decel_a, ratio_a, c0_a, cmin_a, stop_a, position_a, speed_a, n_a, cn_a, forward_a)
+
+        moved = steps > 0
+        min_interval = numpy.where(moved, min_interval, 0.0)
+        peak_speed = numpy.where(moved, scale / numpy.where(moved, min_interval, 1.0), 0.0)
+        mean_interval = numpy.where(moved, duration / numpy.maximum(steps, 1), 0.0)
+
+        return {
+            "duration": duration,
+            "steps": steps,
+            "peak_speed": peak_speed,
+            "min_interval": min_interval,
+            "max_interval": max_interval,
+            "mean_interval": mean_interval,
+            }
+
+#endregion
+
+#region Public Methods
+
+    @staticmethod
+    def simulate(distances, max_speeds, accelerations, decelerations=None, scale=1.0, vectorize=True):
+        """Run the state machine for a batch of moves.
+
+        Args:
+            distances (list): Distances in steps.
+            max_speeds (list or float): Maximum speeds.
+            accelerations (list or float): Accelerations.
+            decelerations (list or float, optional): Decelerations. Defaults to the accelerations.
+            scale (list or float, optional): Speed scales. Defaults to 1.0.
+            vectorize (bool, optional): Use NumPy when it is installed. Defaults to True.
+
+        Returns:
+            dict: Per move result lists, NumPy arrays when vectorized, under RESULT_KEYS.
+                The duration is in clock units from the start to the last step.
+        """
+
+        distances = [int(round(item)) for item in distances]
+        count = len(distances)
+
+        max_speeds = [abs(item) for item in _expand(max_speeds, count)]
+        accelerations = [abs(item) for item in _expand(accelerations, count)]
+        if decelerations is None:
+            decelerations = accelerations
+        else:
+            decelerations = [abs(item) if item != 0 else accelerations[index]
+                for index, item in enumerate(_expand(decelerations, count))]
+        scales = _expand(scale, count)
+
+        if vectorize and (numpy is not None):
+            return Fleet.__simulate_numpy(
+                numpy.array(distances, dtype=numpy.int64),
+                numpy.array(max_speeds, dtype=float),
+                numpy.array(accelerations, dtype=float),
+                numpy.array(decelerations, dtype=float),
+                numpy.array(scales, dtype=float))
+
+        results = {}
+        for key in RESULT_KEYS:
+            results[key] = []
+
+        stepper = AccelStepper(interface=InterfaceType.FUNCTION)
+        for index in range(count):
+            values = Fleet.__simulate_one(stepper, distances[index], max_speeds[index],
+                accelerations[index], decelerations[index], scales[index])
+            for key, value in zip(RESULT_KEYS, values):
+                results[key].append(value)
+
+        return results
+
+    @staticmethod
+    def simulate_parallel(distances, max_speeds, accelerations, decelerations=None, scale=1.0, processes=None, chunk_size=256):
+        """Spread a large batch of moves over a process pool.
+
+        The batch is cut in chunks that the workers run with simulate(), so
+        every worker gets the vectorized path when NumPy is installed.
+
+        Args:
+            distances (list): Distances in steps.
+            max_speeds (list or float): Maximum speeds.
+            accelerations (list or float): Accelerations.
+            decelerations (list or float, optional): Decelerations. Defaults to the accelerations.
+            scale (list or float, optional): Speed scales. Defaults to 1.0.
+            processes (int, optional): Worker processes. Defaults to the CPU count.
+            chunk_size (int, optional): Moves per chunk. Defaults to 256.
+
+        Returns:
+            dict: Per move result lists, in the order of the moves, under RESULT_KEYS.
+        """
+
+        import multiprocessing
+
+        distances = list(distances)
+        count = len(distances)
+
+        max_speeds = _expand(max_speeds, count)
+        accelerations = _expand(accelerations, count)
+        if decelerations is not None:
+            decelerations = _expand(decelerations, count)
+        scales = _expand(scale, count)
+
+        chunks = []
+        for start in range(0, count, chunk_size):
+            stop = start + chunk_size
+            decel = None
+            if decelerations is not None:
+                decel = decelerations[start:stop]
+            chunks.append((distances[start:stop], max_speeds[start:stop],
+                accelerations[start:stop], decel, scales[start:stop]))
+
+        with multiprocessing.Pool(processes) as pool:
+            parts = pool.map(_simulate_chunk, chunks)
+
+        results = {}
+        for key in RESULT_KEYS:
+            results[key] = []
+            for part in parts:
+                results[key].extend(list(part[key]))
+
+        return results
+
+#endregion
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import gc
+import sys
+
+from pyaccelstepper.clock import Monotonic
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class GCGuard:
+    """Keeps the garbage collector out of the step timing.
+
+    Collects before the move, disables the automatic collections while
+    moving and runs short collections only in the gaps between steps that
+    are long enough to hide them. Pass it to AccelStepper.run_to_position()
+    or MultiStepper.run_speed_to_position().
+    """
+
+#region Constructor
+
+    def __init__(self, min_slack=0.002, interval=0.05, generation=0):
+        """Constructor
+
+        Args:
+            min_slack (float, optional): Smallest gap to the next step to collect in, in seconds. Defaults to 0.002.
+            interval (float, optional): Shortest time between two collections in seconds. Defaults to 0.05.
+            generation (int, optional): Generation collected in the gaps on CPython. Defaults to 0.
+        """
+
+        self.__min_slack = min_slack
+        """Smallest gap to the next step to collect in.
+        """
+
+        self.__interval = interval
+        """Shortest time between two collections.
+        """
+
+        self.__generation = generation
+        """Generation collected in the gaps, MicroPython collects all.
+        """
+
+        if sys.implementation.name == "micropython":
+            self.__generation = None
+
+        self.__was_enabled = True
+        """State of the collector before the move.
+        """
+
+        self.__collecting = False
+        """The guard itself is collecting.
+        """
+
+        self.__started = Monotonic.now()
+        """Start of the collection seen by the callback.
+        """
+
+        self.__last_collect = Monotonic.now()
+        """End of the last collection in the gaps.
+        """
+
+        self.__pre_collect_time = 0.0
+        """Duration of the collection before the move.
+        """
+
+        self.__collections = 0
+        """Collections run in the gaps.
+        """
+
+        self.__collect_time = 0.0
+        """Time spent in the collections in the gaps.
+        """
+
+        self.__max_collect_time = 0.0
+        """Longest collection in the gaps.
+        """
+
+        self.__unplanned_collections = 0
+        """Collections during the move that the guard did not run.
+        """
+
+        self.__unplanned_time = 0.0
+        """Time spent in the collections the guard did not run.
+        """
+
+#endregion
+
+#region Properties
+
+    @property
+    def pre_collect_time(self):
+        """Duration of the collection before the move.
+
+        Returns:
+            float: Time in seconds.
+        """
+
+        return self.__pre_collect_time
+
+    @property
+    def collections(self):
+        """Collections run in the gaps during the move.
+
+        Returns:
+            int: Count.
+        """
+
+        return self.__collections
+
+    @property
+    def collect_time(self):
+        """Time spent in the collections in the gaps.
+
+        Returns:
+            float: Time in seconds.
+        """
+
+        return self.__collect_time
+
+    @property
+    def max_collect_time(self):
+        """Longest collection in the gaps.
+
+        Returns:
+            float: Time in seconds.
+        """
+
+        return self.__max_collect_time
+
+    @property
+    def unplanned_collections(self):
+        """Collections during the move that the guard did not run.
+
+        Only seen on CPython, through gc.callbacks.
+
+        Returns:
+            int: Count.
+        """
+
+        return self.__unplanned_collections
+
+    @property
+    def unplanned_time(self):
+        """Time spent in the collections the guard did not run.
+
+        Returns:
+            float: Time in seconds.
+        """
+
+        return self.__unplanned_time
+
+#endregion
+
+#region Private Methods
+
+    def __on_collect(self, phase, info):
+        """gc.callbacks hook that accounts the collections the guard did not run.
+        """
+
+        if self.__collecting:
+            return
+
+        if phase == "start":
+            self.__started = Monotonic.now()
+        else:
+            self.__unplanned_collections += 1
+            self.__unplanned_time += Monotonic.elapsed(self.__started, Monotonic.now())
+
+    def __collect(self, generation=None):
+        """Run one collection and measure it.
+
+        Args:
+            generation (int, optional): Generation to collect. Defaults to all.
+
+        Returns:
+            float: Duration in seconds.
+        """
+
+        self.__collecting = True
+        start = Monotonic.now()
+
+        if generation is None:
+            gc.collect()
+        else:
+            gc.collect(generation)
+
+        end = Monotonic.now()
+        self.__collecting = False
+        self.__last_collect = end
+
+        return Monotonic.elapsed(start, end)
+
+#endregion
+
+#region Public Methods
+
+    def begin(self):
+        """Collect and disable the automatic collections, call before the move.
+        """
+
+        self.__collections = 0
+        self.__collect_time = 0.0
+        self.__max_collect_time = 0.0
+        self.__unplanned_collections = 0
+        self.__unplanned_time = 0.0
+
+        self.__was_enabled = gc.isenabled()
+        self.__pre_collect_time = self.__collect()
+
+        gc.disable()
+
+        if hasattr(gc, "callbacks"):
+            gc.callbacks.append(self.__on_collect)
+
+    def idle(self, slack):
+        """Collect if the gap to the next step is long enough, call in the step loop.
+
+        Args:
+            slack (float): Time to the next step in seconds, None if no step is pending.
+                time_to_next_step() is in clock units, divide it by speed_scale.
+
+        Returns:
+            bool: True if a collection was run.
+        """
+
+        if slack is None:
+            return False
+
+        # The gap has to hide the collection, learned from the longest one so far.
+        if slack < max(self.__min_slack, 2.0 * self.__max_collect_time):
+            return False
+
+        if Monotonic.elapsed(self.__last_collect, Monotonic.now()) < self.__interval:
+            return False
+
+        duration = self.__collect(self.__generation)
+        self.__collections += 1
+        self.__collect_time += duration
+        if duration > self.__max_collect_time:
+            self.__max_collect_time = duration
+
+        return True
+
+    def end(self):
+        """Restore the collector, call after the move.
+        """
+
+        if hasattr(gc, "callbacks") and (self.__on_collect in gc.callbacks):
+            gc.callbacks.remove(self.__on_collect)
+
+        if self.__was_enabled:
+            gc.enable()
+
+    def report(self):
+        """Instrumentation of the last move.
+
+        Returns:
+            dict: Collection counts and times in seconds.
+        """
+
+        return {
+            "pre_collect_time": self.__pre_collect_time,
+            "collections": self.__collections,
+            "collect_time": self.__collect_time,
+            "max_collect_time": self.__max_collect_time,
+            "unplanned_collections": self.__unplanned_collections,
+            "unplanned_time": self.__unplanned_time,
+            }
+
+#endregion
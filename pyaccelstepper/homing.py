@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+from pyaccelstepper.constants import Direction
+from pyaccelstepper.controller import Edge
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class HomingState:
+    """States of a homing cycle.
+    """
+
+    IDLE = 0
+    APPROACH = 1
+    STOPPING = 2
+    BACK_OFF = 3
+    REAPPROACH = 4
+    DONE = 5
+    FAILED = 6
+
+class Homing:
+    """Two speed homing cycle of one axis against a switch.
+
+    The axis runs fast toward the switch, brakes with its deceleration,
+    backs off and finds the switch again at the slow speed. The position
+    where the slow approach tripped becomes the home position. The switch
+    is watched through the edge callbacks of the controller, only
+    controllers without them get polled. Call run() from the loop, it
+    does not block, so several axes home at the same time.
+    """
+
+#region Constructor
+
+    def __init__(self, stepper, pin, controller=None, direction=Direction.CCW,
+        level=1, fast_speed=None, slow_speed=None, back_off=100,
+        max_travel=100000, home_position=0):
+        """Constructor
+
+        Args:
+            stepper (AccelStepper): Axis to home.
+            pin (int): Input pin of the switch.
+            controller (IController, optional): Controller of the input. Defaults to the stepper one.
+            direction (int, optional): Direction toward the switch. Defaults to Direction.CCW.
+            level (int, optional): Input level of the pressed switch. Defaults to 1.
+            fast_speed (float, optional): Speed of the approach. Defaults to the maximum speed.
+            slow_speed (float, optional): Speed of the second approach. Defaults to a tenth of the fast one.
+            back_off (int, optional): Steps back from the switch. Defaults to 100.
+            max_travel (int, optional): Longest approach in steps. Defaults to 100000.
+            home_position (int, optional): Position of the switch. Defaults to 0.
+        """
+
+        if controller is None:
+            controller = stepper.controller
+
+        if fast_speed is None:
+            fast_speed = stepper.max_speed
+
+        if slow_speed is None:
+            slow_speed = fast_speed / 10.0
+
+        self.__stepper = stepper
+        self.__pin = pin
+        self.__controller = controller
+        self.__sign = 1 if direction == Direction.CW else -1
+        self.__level = 1 if level else 0
+        self.__fast_speed = fast_speed
+        self.__slow_speed = slow_speed
+        self.__back_off = abs(int(back_off))
+        self.__max_travel = abs(int(max_travel))
+        self.__home_position = home_position
+
+        self.__state = HomingState.IDLE
+        """State of the cycle.
+        """
+
+        self.__error = None
+        """Why the cycle failed.
+        """
+
+        self.__event = False
+        """The controller reports the edges.
+        """
+
+        self.__tripped = False
+        """The switch was hit since the flag was cleared.
+        """
+
+        self.__trip_position = None
+        """Position of the last trip.
+        """
+
+        self.__max_speed = stepper.max_speed
+        """Maximum speed to restore.
+        """
+
+#endregion
+
+#region Properties
+
+    @property
+    def state(self):
+        """State of the cycle.
+
+        Returns:
+            int: HomingState.
+        """
+
+        return self.__state
+
+    @property
+    def error(self):
+        """Why the cycle failed.
+
+        Returns:
+            str: Message, None unless failed.
+        """
+
+        return self.__error
+
+    @property
+    def trip_position(self):
+        """Position of the last trip, before the axis was renumbered.
+
+        Returns:
+            int: Position in steps.
+        """
+
+        return self.__trip_position
+
+#endregion
+
+#region Private Methods
+
+    def __on_edge(self, pin, state):
+        if (1 if state else 0) == self.__level:
+            self.__trip_position = self.__stepper.current_position
+            self.__tripped = True
+
+    def __pressed(self):
+        return self.__controller.digital_read(self.__pin) == self.__level
+
+    def __check(self):
+        """The switch was hit, from the edge flag or from a poll.
+
+        Returns:
+            bool: Hit.
+        """
+
+        if self.__tripped:
+            return True
+
+        if (not self.__event) and self.__pressed():
+            self.__trip_position = self.__stepper.current_position
+            self.__tripped = True
+
+        return self.__tripped
+
+    def __back_off_from(self, position):
+        self.__state = HomingState.BACK_OFF
+        self.__stepper.max_speed = self.__fast_speed
+        self.__stepper.move_to(position - (self.__sign * self.__back_off))
+
+    def __finish(self, state, error=None):
+        self.__state = state
+        self.__error = error
+        self.__stepper.max_speed = self.__max_speed
+        if self.__event:
+            self.__controller.remove_edge_callback(self.__pin, self.__on_edge)
+            self.__event = False
+
+#endregion
+
+#region Public Methods
+
+    def start(self):
+        """Start the cycle, a pressed switch skips the fast approach.
+        """
+
+        self.__max_speed = self.__stepper.max_speed
+        self.__tripped = False
+        self.__error = None
+
+        edge = Edge.Rising if self.__level == 1 else Edge.Falling
+        self.__event = bool(self.__controller.add_edge_callback(
+            self.__pin, self.__on_edge, edge))
+
+        if self.__pressed():
+            self.__trip_position = self.__stepper.current_position
+            self.__back_off_from(self.__trip_position)
+            return
+
+        self.__state = HomingState.APPROACH
+        self.__stepper.max_speed = self.__fast_speed
+        self.__stepper.move(self.__sign * self.__max_travel)
+
+    def run(self):
+        """Advance the cycle, call it as often as run() of a stepper.
+
+        Returns:
+            bool: The cycle is still going.
+        """
+
+        state = self.__state
+        stepper = self.__stepper
+
+        if state == HomingState.APPROACH:
+            if self.__check():
+                self.__state = HomingState.STOPPING
+                stepper.stop()
+            elif not stepper.run():
+                self.__finish(HomingState.FAILED, "Switch not found within the travel.")
+                return False
+            return True
+
+        if state == HomingState.STOPPING:
+            if not stepper.run():
+                self.__back_off_from(self.__trip_position)
+            return True
+
+        if state == HomingState.BACK_OFF:
+            if not stepper.run():
+                if self.__pressed():
+                    self.__finish(HomingState.FAILED, "Switch still pressed after the back off.")
+                    return False
+                self.__state = HomingState.REAPPROACH
+                self.__tripped = False
+                stepper.max_speed = self.__slow_speed
+                stepper.move(self.__sign * 2 * self.__back_off)
+            return True
+
+        if state == HomingState.REAPPROACH:
+            if self.__check():
+                # Steps that went out after the trip stay counted.
+                overshoot = stepper.current_position - self.__trip_position
+                stepper.set_current_position(self.__home_position + overshoot)
+                self.__finish(HomingState.DONE)
+                return False
+            if not stepper.run():
+                self.__finish(HomingState.FAILED, "Switch lost on the slow approach.")
+                return False
+            return True
+
+        return False
+
+    def cancel(self):
+        """Stop the cycle where it is.
+        """
+
+        if self.__state not in (HomingState.DONE, HomingState.FAILED, HomingState.IDLE):
+            self.__stepper.set_current_position(self.__stepper.current_position)
+            self.__finish(HomingState.FAILED, "Cancelled.")
+
+#endregion
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+from pyaccelstepper.controller import Edge, IController, PinMode
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class MachineController(IController):
+    """Controller on the machine.Pin of MicroPython.
+
+    Edges of the inputs come from the pin interrupts, so the limit
+    switches do not have to be polled. The callbacks run in the interrupt
+    handler, keep them short.
+    """
+
+#region Constructor
+
+    def __init__(self, config={}):
+        """Constructor
+
+        Args:
+            config (dict, optional): Controller configuration, "pull_up" for the inputs. Defaults to {}.
+        """
+
+        super().__init__(config)
+
+        self.__pull_up = False
+        """Inputs use the internal pull up.
+        """
+
+        if "pull_up" in config and config["pull_up"] is not None:
+            self.__pull_up = config["pull_up"]
+
+        self.__pins = {}
+        """Pin objects by index.
+        """
+
+        self.__edge_callbacks = {}
+        """Callback and edge pairs of every input.
+        """
+
+#endregion
+
+#region Private Methods
+
+    def __input(self, pin):
+        if pin not in self.__pins:
+            self.pin_mode(pin, PinMode.Input)
+
+        return self.__pins[pin]
+
+    def __dispatch(self, pin, edge_pin):
+        state = edge_pin.value()
+        edge = Edge.Rising if state else Edge.Falling
+        for callback, edges in self.__edge_callbacks.get(pin, ()):
+            if edges & edge:
+                callback(pin, state)
+
+#endregion
+
+#region Public Methods
+
+    def pin_mode(self, pin, mode):
+        from machine import Pin
+
+        if mode == PinMode.Input:
+            if self.__pull_up:
+                self.__pins[pin] = Pin(pin, Pin.IN, Pin.PULL_UP)
+            else:
+                self.__pins[pin] = Pin(pin, Pin.IN)
+
+        else:
+            self.__pins[pin] = Pin(pin, Pin.OUT)
+
+    def digital_write(self, pin, state):
+        self.__pins[pin].value(1 if state else 0)
+
+    def digital_read(self, pin):
+        return self.__input(pin).value()
+
+    def add_edge_callback(self, pin, callback, edge=Edge.Both):
+        from machine import Pin
+
+        self.__edge_callbacks.setdefault(pin, []).append((callback, edge))
+
+        # One handler per pin serves all the callbacks, it sees both edges.
+        self.__input(pin).irq(trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING,
+            handler=lambda edge_pin: self.__dispatch(pin, edge_pin))
+
+        return True
+
+    def remove_edge_callback(self, pin, callback):
+        callbacks = [item for item in self.__edge_callbacks.get(pin, ())
+            if item[0] != callback]
+        self.__edge_callbacks[pin] = callbacks
+
+        if (not callbacks) and (pin in self.__pins):
+            self.__pins[pin].irq(handler=None)
+
+#endregion
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+from pyaccelstepper.accel_stepper import AccelStepper
+from pyaccelstepper.constants import PreflightMode, ProfileType
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https:#choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class MultiStepper:
+
+    MULTISTEPPER_MAX_STEPPERS = 10
+
+#region Constructor
+
+    def __init__(self, profile_type=ProfileType.TRAPEZOID, jerk=0.0,
+        preflight=PreflightMode.NONE, preflight_margin=0.8):
+        """Constructor
+
+        Args:
+            profile_type (int, optional): Motion profile. Defaults to ProfileType.TRAPEZOID.
+            jerk (float, optional): Maximum jerk of the S-curve profile. Defaults to 0.0.
+            preflight (int, optional): Check of the moves against the calibrated step rates. Defaults to PreflightMode.NONE.
+            preflight_margin (float, optional): Part of the host step rate the group may use. Defaults to 0.8.
+        """
+
+        self._steppers = []
+
+        self._profile_type = profile_type
+
+        self._jerk = abs(jerk)
+
+        self._preflight = preflight
+
+        self._preflight_margin = preflight_margin
+
+#endregion
+
+#region Properties
+
+    @property
+    def steppers(self):
+        """Steppers of the group in the order they were added.
+
+        Returns:
+            list: Steppers.
+        """
+
+        return self._steppers
+
+#endregion
+
+#region Private Methods
+
+    def __load(self, peaks):
+        """Part of the host step rate the group needs at the peak speeds.
+
+        Every axis runs in the same loop, so their shares of the calibrated
+        step rates add up. Axes without a calibration are left out.
+
+        Args:
+            peaks (list): Peak speed of every axis.
+
+        Returns:
+            float: Load, 1 is the full step rate of the host.
+        """
+
+        load = 0.0
+        for stepper, peak in zip(self._steppers, peaks):
+            if stepper.max_step_rate > 0.0:
+                load += abs(peak) / (stepper.speed_scale * stepper.max_step_rate)
+
+        return load
+
+    def __preflight_time(self, longest_time, peaks_at):
+        """Check the group move against the host step rate.
+
+        Args:
+            longest_time (float): Duration of the move.
+            peaks_at (function): Peak speeds of the axes for a duration.
+
+        Raises:
+            ValueError: The move is too fast for the host in PreflightMode.REJECT.
+
+        Returns:
+            float: Duration of the move, stretched in PreflightMode.CLAMP.
+        """
+
+        if self._preflight == PreflightMode.NONE:
+            return longest_time
+
+        load = self.__load(peaks_at(longest_time))
+        if load <= self._preflight_margin:
+            return longest_time
+
+        if self._preflight == PreflightMode.REJECT:
+            raise ValueError("Move needs {:.0%} of the host step rate, the margin is {:.0%}.".format(
+                load, self._preflight_margin))
+
+        # The peaks fall about with the duration, a few rounds settle it.
+        for _ in range(8):
+            longest_time *= load / self._preflight_margin
+            load = self.__load(peaks_at(longest_time))
+            if load <= self._preflight_margin:
+                break
+
+        return longest_time
+
+    def __move_axis(self, stepper, absolute):
+        """Retarget one axis, the group preflight stands in for its own.
+        """
+
+        preflight = stepper.preflight
+        stepper.preflight = PreflightMode.NONE
+        try:
+            stepper.move_to(absolute)
+        finally:
+            stepper.preflight = preflight
+
+#endregion
+
+#region Public Methods
+
+    def home(self, pins, controller=None, **homing):
+        """Home the axes at the same time, blocks until all are done.
+
+        Args:
+            pins (list): Switch input of every axis, None leaves the axis alone.
+            controller (IController, optional): Controller of the inputs. Defaults to the one of every stepper.
+
+        Returns:
+            list: Per axis True when homed, False when failed, None when left alone.
+        """
+
+        from pyaccelstepper.homing import Homing, HomingState
+
+        cycles = []
+        for stepper, pin in zip(self._steppers, pins):
+            if pin is None:
+                cycles.append(None)
+                continue
+            cycle = Homing(stepper, pin, controller, **homing)
+            cycle.start()
+            cycles.append(cycle)
+
+        running = [cycle for cycle in cycles if cycle is not None]
+        while running:
+            running = [cycle for cycle in running if cycle.run()]
+
+        return [None if cycle is None else cycle.state == HomingState.DONE
+            for cycle in cycles]
+
+    def persist(self, store):
+        """Restore the positions from a journal and keep them journaled.
+
+        Args:
+            store (PositionStore): Journal with an axis per stepper.
+
+        Returns:
+            bool: All positions were restored from a clean shutdown, homing can be skipped.
+        """
+
+        restored = True
+        for axis, stepper in enumerate(self._steppers):
+            restored = store.restore(stepper, axis) and restored
+            store.attach(stepper, axis)
+
+        return restored
+
+    def probe_to(self, absolute, input_pin, level=1, controller=None):
+        """Synchronized move until the input trips, blocks until stopped.
+
+        Every axis latches its position at the trip and brakes with its own
+        deceleration, so the path may leave the line while braking.
+
+        Args:
+            absolute (list): Absolute positions in steps, reached when nothing trips.
+            input_pin (int): Input pin of the probe.
+            level (int, optional): Input level of the tripped probe. Defaults to 1.
+            controller (IController, optional): Controller of the input. Defaults to the one of the first axis.
+
+        Returns:
+            ProbeResult: Trip and stop positions of every axis.
+        """
+
+        from pyaccelstepper.probing import Probe
+
+        return Probe.run(self._steppers, lambda: self.move_to(absolute), self.run,
+            input_pin, level, controller)
+
+    def add_hook(self, event, hook):
+        """Subscribe a profiling hook to an event on every axis.
+
+        Args:
+            event (int): HookEvent.
+            hook (function): Called with the stepper and the event arguments.
+        """
+
+        for stepper in self._steppers:
+            stepper.add_hook(event, hook)
+
+    def remove_hook(self, event, hook):
+        """Unsubscribe a profiling hook from every axis.
+
+        Args:
+            event (int): HookEvent.
+            hook (function): Hook added before.
+        """
+
+        for stepper in self._steppers:
+            stepper.remove_hook(event, hook)
+
+    def enable_stats(self, state=True):
+        """Switch the runtime statistics of every axis on or off.
+
+        Args:
+            state (bool, optional): On or off. Defaults to True.
+        """
+
+        from pyaccelstepper.stats import StepStats
+
+        for stepper in self._steppers:
+            if state:
+                stepper.stats = StepStats()
+            else:
+                stepper.stats = None
+
+    def stats_snapshot(self):
+        """Statistics of the axes that collect them, added up.
+
+        Returns:
+            dict: Statistics of the group.
+        """
+
+        from pyaccelstepper.stats import StepStats
+
+        return StepStats.merge([stepper.stats.snapshot()
+            for stepper in self._steppers if stepper.stats is not None])
+
+    def add(self, stepper: AccelStepper):
+        if len(self._steppers) >= MultiStepper.MULTISTEPPER_MAX_STEPPERS:
+            return False # No room for more
+        
+        self._steppers.append(stepper)
+
+        return True
+
+    def move_time(self, absolute):
+        """Duration of a synchronized move, the time of the slowest axis.
+
+        Args:
+            absolute (list): Absolute positions in steps.
+
+        Raises:
+            ValueError: The move is too fast for the host in PreflightMode.REJECT.
+
+        Returns:
+            float: Duration in seconds, stretched in PreflightMode.CLAMP.
+        """
+
+        if (self._profile_type == ProfileType.SCURVE) and (self._jerk > 0.0):
+            return self.__move_time_s_curve(absolute)
+
+        longest_time = 0.0
+
+        for index in range(len(self._steppers)):
+            current_distance = absolute[index] - self._steppers[index].current_position
+            current_time = abs(current_distance) / self._steppers[index].max_speed
+
+            if current_time > longest_time:
+                longest_time = current_time
+
+        if longest_time > 0.0:
+            distances = [absolute[index] - self._steppers[index].current_position
+                for index in range(len(self._steppers))]
+            longest_time = self.__preflight_time(longest_time,
+                lambda duration: [distance / duration for distance in distances])
+
+        return longest_time
+
+    def move_to(self, absolute, duration=None):
+        """First find the stepper that will take the longest time to move.
+
+        Args:
+            absolute (dict: AccelStepper]): _description_
+            duration (float, optional): Duration of the move, not shorter than move_time(). Defaults to move_time().
+
+        Raises:
+            ValueError: The move is too fast for the host in PreflightMode.REJECT,
+                or the duration is shorter than move_time().
+        """
+
+        longest_time = self.move_time(absolute)
+
+        if duration is not None:
+            # A shorter move would cap the speed of the slowest axes and they
+            # would arrive late, only the rounding of a remote plan passes.
+            if duration < longest_time * (1.0 - 1e-9):
+                raise ValueError("Duration {} is shorter than the move time {}.".format(
+                    duration, longest_time))
+
+            if duration > longest_time:
+                longest_time = duration
+
+        if (self._profile_type == ProfileType.SCURVE) and (self._jerk > 0.0):
+            self.__move_to_s_curve(absolute, longest_time)
+            return
+
+        if longest_time > 0.0:
+            # Now work out a new max speed for each stepper so they will all 
+            # arrived at the same time of longest_time
+            for index in range(len(self._steppers)):
+                current_distance = absolute[index] - self._steppers[index].current_position
+                # S = v * t
+                current_speed = current_distance / longest_time
+                self.__move_axis(self._steppers[index], absolute[index]) # New target position (resets speed)
+                self._steppers[index].speed = current_speed # New speed
+
+    def __move_time_s_curve(self, absolute):
+        """Duration of a synchronized S-curve move.
+
+        Args:
+            absolute (list): Absolute positions in steps.
+
+        Returns:
+            float: Duration in seconds.
+        """
+
+        from pyaccelstepper.s_curve import SCurve
+
+        longest_time = 0.0
+
+        for index in range(len(self._steppers)):
+            stepper = self._steppers[index]
+            current_distance = absolute[index] - stepper.current_position
+            current_time = SCurve(current_distance, stepper.max_speed,
+                stepper.acceleration, self._jerk, stepper.deceleration).duration
+
+            if current_time > longest_time:
+                longest_time = current_time
+
+        def peaks_at(duration):
+            peaks = []
+            for index in range(len(self._steppers)):
+                stepper = self._steppers[index]
+                peaks.append(SCurve.for_duration(absolute[index] - stepper.current_position,
+                    duration, stepper.max_speed, stepper.acceleration, self._jerk,
+                    stepper.deceleration).peak_speed)
+            return peaks
+
+        if longest_time > 0.0:
+            longest_time = self.__preflight_time(longest_time, peaks_at)
+
+        return longest_time
+
+    def __move_to_s_curve(self, absolute, longest_time):
+        """Synchronized S-curve move, every axis takes as long as the slowest one.
+
+        Args:
+            absolute (list): Absolute positions in steps.
+            longest_time (float): Duration of the move.
+        """
+
+        from pyaccelstepper.s_curve import SCurve
+
+        for index in range(len(self._steppers)):
+            stepper = self._steppers[index]
+            current_distance = absolute[index] - stepper.current_position
+            profile = SCurve.for_duration(current_distance, longest_time,
+                stepper.max_speed, stepper.acceleration, self._jerk, stepper.deceleration)
+            stepper.follow_profile(absolute[index], profile.intervals(stepper.speed_scale))
+
+    def run(self):
+        """Returns true if any motor is still running to the target position.
+
+        Returns:
+            bool: State
+        """
+
+        state = False
+
+        s_curve = (self._profile_type == ProfileType.SCURVE) and (self._jerk > 0.0)
+
+        for index in range(len(self._steppers)):
+            if self._steppers[index].distance_to_go != 0:
+                if s_curve:
+                    self._steppers[index].run()
+                else:
+                    self._steppers[index].run_speed()
+                state = True
+        
+        return state
+
+    def run_speed_to_position(self, gc_guard=None):
+        """Blocks until all steppers reach their target position and are stopped
+
+        Args:
+            gc_guard (GCGuard, optional): Keeps the collector out of the move. Defaults to None.
+        """
+
+        if gc_guard is None:
+            while self.run():
+                pass
+            return
+
+        gc_guard.begin()
+        try:
+            while self.run():
+                slack = None
+                for stepper in self._steppers:
+                    if stepper.distance_to_go != 0:
+                        current = stepper.time_to_next_step()
+                        if current is None:
+                            continue
+                        current /= stepper.speed_scale # Clock units to seconds
+                        if (slack is None) or (current < slack):
+                            slack = current
+                gc_guard.idle(slack)
+        finally:
+            gc_guard.end()
+
+#endregion
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import os
+import struct
+from binascii import crc32
+
+from pyaccelstepper.clock import Monotonic
+from pyaccelstepper.constants import HookEvent
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+HEADER = struct.Struct("<4sHHQ")
+"""Journal header: magic, version, axes and the sequence of the clean shutdown record, 0 while open."""
+
+SEQUENCE = struct.Struct("<Q")
+"""Head of a record: sequence number, the positions follow."""
+
+POSITION = struct.Struct("<q")
+"""One axis position."""
+
+CRC = struct.Struct("<I")
+"""Tail of a record: CRC32 of the sequence and the positions."""
+
+MAGIC = b"PAPS"
+"""Magic of the journal files."""
+
+VERSION = 2
+"""Version of the journal layout."""
+
+#endregion
+
+class PositionStore:
+    """Journal of the axis positions in a small file.
+
+    Two records take turns, each with a sequence number and a CRC, so a
+    write torn by a crash leaves the other one readable. The file is
+    marked dirty while open, close() marks it clean with the sequence of
+    its last record. After a clean shutdown whose record still reads back
+    the stored positions are exact and homing can be skipped, after a
+    crash they may lag by up to the commit granularity. The file is memory
+    mapped where mmap exists, elsewhere it is written in place.
+    """
+
+#region Constructor
+
+    def __init__(self, path, axes=1, every_steps=100, every_seconds=None, sync=False):
+        """Constructor
+
+        Args:
+            path (str): Journal file.
+            axes (int, optional): Axes in the journal. Defaults to 1.
+            every_steps (int, optional): Commit after this many steps, None for never. Defaults to 100.
+            every_seconds (float, optional): Commit on a step this long after the last commit. Defaults to None.
+            sync (bool, optional): Flush to the disk on every commit, not only on close. Defaults to False.
+
+        Raises:
+            ValueError: The file is not a journal of this version and axis count.
+        """
+
+        self.__axes = axes
+        """Axes in the journal.
+        """
+
+        self.__every_steps = every_steps
+        """Steps between the commits.
+        """
+
+        self.__every_seconds = every_seconds
+        """Time between the commits.
+        """
+
+        self.__sync = sync
+        """Flush on every commit.
+        """
+
+        self.__record_size = SEQUENCE.size + (POSITION.size * axes) + CRC.size
+        """Bytes of one record.
+        """
+
+        self.__size = HEADER.size + (2 * self.__record_size)
+        """Bytes of the journal.
+        """
+
+        self.__steppers = [None] * axes
+        """Attached stepper of every axis.
+        """
+
+        self.__positions = [0] * axes
+        """Last committed positions.
+        """
+
+        self.__sequence = 0
+        """Sequence of the last record.
+        """
+
+        self.__steps = 0
+        """Steps since the last commit.
+        """
+
+        self.__last_commit = Monotonic.now()
+        """Time of the last commit.
+        """
+
+        self.__clean = False
+        """The last shutdown was clean.
+        """
+
+        self.__valid = False
+        """A readable record was found.
+        """
+
+        self.__file = None
+        self.__map = None
+
+        self.__open(path)
+
+#endregion
+
+#region Properties
+
+    @property
+    def clean(self):
+        """The journal was closed cleanly before it was opened.
+
+        Returns:
+            bool: Clean shutdown.
+        """
+
+        return self.__clean
+
+    @property
+    def valid(self):
+        """A readable record was found on opening.
+
+        Returns:
+            bool: Valid.
+        """
+
+        return self.__valid
+
+    @property
+    def positions(self):
+        """Last committed positions.
+
+        Returns:
+            list: Position of every axis.
+        """
+
+        return list(self.__positions)
+
+    @property
+    def sequence(self):
+        """Sequence number of the last record.
+
+        Returns:
+            int: Sequence.
+        """
+
+        return self.__sequence
+
+#endregion
+
+#region Private Methods
+
+    def __open(self, path):
+        size = 0
+        try:
+            size = os.stat(path)[6]
+        except OSError:
+            pass
+
+        exists = False
+        if size > 0:
+            with open(path, "rb") as journal:
+                header = journal.read(HEADER.size)
+
+            # A file torn while it was created is still blank, anything else is refused
+            # rather than overwritten.
+            if (len(header) == HEADER.size) and (header[:len(MAGIC)] != bytes(len(MAGIC))):
+                magic, version, axes, clean = HEADER.unpack(header)
+                if magic != MAGIC:
+                    raise ValueError("{} is not a position journal.".format(path))
+                if version != VERSION:
+                    raise ValueError("Unknown position journal version {}.".format(version))
+                if axes != self.__axes:
+                    raise ValueError("{} journals {} axes, not {}.".format(path, axes, self.__axes))
+                exists = True
+
+        self.__file = open(path, "r+b" if exists else "w+b")
+        if not exists:
+            self.__file.write(bytes(self.__size))
+            self.__file.flush()
+
+        elif size < self.__size:
+            # A record torn at the end of the file, its CRC fails.
+            self.__file.seek(size)
+            self.__file.write(bytes(self.__size - size))
+            self.__file.flush()
+
+        try:
+            import mmap
+        except ImportError:
+            mmap = None
+
+        if mmap is not None:
+            self.__map = mmap.mmap(self.__file.fileno(), self.__size)
+
+        if exists:
+            self.__load()
+
+        # Dirty until close(), a crash leaves it so.
+        self.__write(0, HEADER.pack(MAGIC, VERSION, self.__axes, 0))
+        self.__flush()
+
+    def __read(self, offset, size):
+        if self.__map is not None:
+            return self.__map[offset:offset + size]
+
+        self.__file.seek(offset)
+        return self.__file.read(size)
+
+    def __write(self, offset, data):
+        if self.__map is not None:
+            self.__map[offset:offset + len(data)] = data
+            return
+
+        self.__file.seek(offset)
+        self.__file.write(data)
+
+    def __flush(self):
+        if self.__map is not None:
+            self.__map.flush()
+        else:
+            self.__file.flush()
+
+    def __load(self):
+        """Read the header and the newest readable record.
+        """
+
+        clean = HEADER.unpack(self.__read(0, HEADER.size))[3]
+
+        best = None
+        for slot in range(2):
+            data = self.__read(HEADER.size + (slot * self.__record_size), self.__record_size)
+            body = data[:-CRC.size]
+            if CRC.unpack(data[-CRC.size:])[0] != (crc32(body) & 0xFFFFFFFF):
+                continue
+            sequence = SEQUENCE.unpack_from(body, 0)[0]
+            if (best is None) or (sequence > best[0]):
+                best = (sequence, body)
+
+        if best is None:
+            return
+
+        self.__sequence = best[0]
+        self.__positions = [POSITION.unpack_from(best[1], SEQUENCE.size + (POSITION.size * axis))[0]
+            for axis in range(self.__axes)]
+        self.__valid = True
+
+        # Only the record close() marked counts as clean, an older one may be stale.
+        self.__clean = (clean != 0) and (best[0] == clean)
+
+    def __on_step(self, stepper, position):
+        self.__steps += 1
+        if (self.__every_steps is not None) and (self.__steps >= self.__every_steps):
+            self.commit()
+
+    def __on_step_timed(self, stepper, position):
+        self.__steps += 1
+        if ((self.__every_steps is not None) and (self.__steps >= self.__every_steps)) or \
+            (Monotonic.elapsed(self.__last_commit, Monotonic.now()) >= self.__every_seconds):
+            self.commit()
+
+#endregion
+
+#region Public Methods
+
+    def attach(self, stepper, axis=0):
+        """Journal the position of a stepper.
+
+        Args:
+            stepper (AccelStepper): Stepper.
+            axis (int, optional): Axis of the journal. Defaults to 0.
+        """
+
+        self.detach(axis)
+        self.__steppers[axis] = stepper
+
+        if self.__every_seconds is None:
+            stepper.add_hook(HookEvent.STEP, self.__on_step)
+        else:
+            stepper.add_hook(HookEvent.STEP, self.__on_step_timed)
+
+    def detach(self, axis=0):
+        """Stop journaling an axis, its last position stays.
+
+        Args:
+            axis (int, optional): Axis of the journal. Defaults to 0.
+        """
+
+        stepper = self.__steppers[axis]
+        if stepper is None:
+            return
+
+        self.__positions[axis] = stepper.current_position
+        stepper.remove_hook(HookEvent.STEP, self.__on_step)
+        stepper.remove_hook(HookEvent.STEP, self.__on_step_timed)
+        self.__steppers[axis] = None
+
+    def restore(self, stepper, axis=0):
+        """Set the stored position of an axis if the last shutdown was clean.
+
+        Args:
+            stepper (AccelStepper): Stepper.
+            axis (int, optional): Axis of the journal. Defaults to 0.
+
+        Returns:
+            bool: Restored, homing can be skipped.
+        """
+
+        if not (self.__clean and self.__valid):
+            return False
+
+        stepper.set_current_position(self.__positions[axis])
+
+        return True
+
+    def commit(self):
+        """Write the positions of the attached steppers to the older record.
+        """
+
+        for axis in range(self.__axes):
+            stepper = self.__steppers[axis]
+            if stepper is not None:
+                self.__positions[axis] = stepper.current_position
+
+        self.__sequence += 1
+        body = SEQUENCE.pack(self.__sequence) + b"".join(
+            POSITION.pack(int(position)) for position in self.__positions)
+
+        slot = self.__sequence % 2
+        self.__write(HEADER.size + (slot * self.__record_size),
+            body + CRC.pack(crc32(body) & 0xFFFFFFFF))
+
+        if self.__sync:
+            self.__flush()
+
+        self.__steps = 0
+        self.__last_commit = Monotonic.now()
+
+    def close(self, clean=True):
+        """Commit the positions and close the journal.
+
+        Args:
+            clean (bool, optional): Mark the shutdown clean. Defaults to True.
+        """
+
+        if self.__file is None:
+            return
+
+        self.commit()
+        for axis in range(self.__axes):
+            self.detach(axis)
+
+        self.__write(0, HEADER.pack(MAGIC, VERSION, self.__axes, self.__sequence if clean else 0))
+        self.__flush()
+
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+
+        self.__file.close()
+        self.__file = None
+
+#endregion
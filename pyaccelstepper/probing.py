@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import math
+
+from pyaccelstepper.constants import HookEvent
+from pyaccelstepper.controller import Edge
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class ProbeResult:
+    """Outcome of a probe move.
+
+    The trip positions are latched at the step where the input edge was
+    seen, so they are accurate to one step as long as the edge is
+    reported within one step interval. The interval at the trip is kept
+    as the time accuracy of the capture.
+    """
+
+    __slots__ = ("tripped", "trip_positions", "stop_positions", "trip_speeds",
+        "trip_intervals", "event")
+
+    def __init__(self, tripped, trip_positions, stop_positions, trip_speeds,
+        trip_intervals, event):
+
+        self.tripped = tripped
+        """The input tripped before the target."""
+
+        self.trip_positions = trip_positions
+        """Position of every axis at the trip, None when not tripped."""
+
+        self.stop_positions = stop_positions
+        """Position of every axis after braking."""
+
+        self.trip_speeds = trip_speeds
+        """Speed of every axis at the trip."""
+
+        self.trip_intervals = trip_intervals
+        """Step interval of every axis at the trip, in clock units."""
+
+        self.event = event
+        """The trip came from an edge callback, not from polling."""
+
+    @property
+    def trip_position(self):
+        """Position of the first axis at the trip.
+
+        Returns:
+            int: Position in steps, None when not tripped.
+        """
+
+        if self.trip_positions is None:
+            return None
+
+        return self.trip_positions[0]
+
+    @property
+    def overtravel(self):
+        """Steps every axis went past the trip while braking.
+
+        Returns:
+            list: Steps, None when not tripped.
+        """
+
+        if self.trip_positions is None:
+            return None
+
+        return [abs(stop - trip) for stop, trip in zip(self.stop_positions, self.trip_positions)]
+
+class Probe:
+    """Probe moves that stop on an input and latch where it tripped.
+    """
+
+    @staticmethod
+    def max_safe_speed(stepper, overtravel, latency=None):
+        """Fastest probe speed that brakes within the allowed overtravel.
+
+        Args:
+            stepper (AccelStepper): Axis, its deceleration brakes the probe.
+            overtravel (int): Steps the axis may go past the trip.
+            latency (float, optional): Time from the edge to its report, in the unit of the speeds. Defaults to None.
+
+        Returns:
+            float: Speed, also slow enough that a step lasts longer than the latency.
+        """
+
+        speed = math.sqrt(2.0 * stepper.deceleration * abs(overtravel))
+
+        if (latency is not None) and (latency > 0.0):
+            speed = min(speed, 1.0 / latency)
+
+        return speed
+
+    @staticmethod
+    def run(steppers, start, run, pin, level=1, controller=None):
+        """Run a probe move until the input trips or the move ends.
+
+        Args:
+            steppers (list): Axes of the move.
+            start (function): Plans the move.
+            run (function): Runs the move, returns True while it is going.
+            pin (int): Input pin of the probe.
+            level (int, optional): Input level of the tripped probe. Defaults to 1.
+            controller (IController, optional): Controller of the input. Defaults to the one of the first axis.
+
+        Returns:
+            ProbeResult: Result.
+        """
+
+        if controller is None:
+            controller = steppers[0].controller
+
+        level = 1 if level else 0
+        latch = {}
+
+        def trip():
+            if not latch:
+                latch["positions"] = [stepper.current_position for stepper in steppers]
+                latch["speeds"] = [stepper.speed for stepper in steppers]
+
+        if controller.digital_read(pin) == level:
+            trip()
+            return ProbeResult(True, latch["positions"], list(latch["positions"]),
+                latch["speeds"], [0.0] * len(steppers), False)
+
+        def on_edge(edge_pin, state):
+            if (1 if state else 0) == level:
+                trip()
+
+        def on_step(stepper, position):
+            if controller.digital_read(pin) == level:
+                trip()
+
+        edge = Edge.Rising if level == 1 else Edge.Falling
+        event = bool(controller.add_edge_callback(pin, on_edge, edge))
+        if not event:
+            for stepper in steppers:
+                stepper.add_hook(HookEvent.STEP, on_step)
+
+        try:
+            start()
+            while run():
+                if latch:
+                    break
+
+            if latch:
+                for stepper in steppers:
+                    stepper.stop()
+                running = True
+                while running:
+                    running = False
+                    for stepper in steppers:
+                        if stepper.run():
+                            running = True
+
+        finally:
+            if event:
+                controller.remove_edge_callback(pin, on_edge)
+            else:
+                for stepper in steppers:
+                    stepper.remove_hook(HookEvent.STEP, on_step)
+
+        stop_positions = [stepper.current_position for stepper in steppers]
+
+        if not latch:
+            return ProbeResult(False, None, stop_positions, None, None, event)
+
+        intervals = [abs(stepper.speed_scale / speed) if speed != 0.0 else 0.0
+            for stepper, speed in zip(steppers, latch["speeds"])]
+
+        return ProbeResult(True, latch["positions"], stop_positions, latch["speeds"],
+            intervals, event)
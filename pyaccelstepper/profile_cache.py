@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import json
+import os
+from array import array
+from collections import OrderedDict
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+VERSION = 1
+"""Version of the cache file format."""
+
+#endregion
+
+class ProfileCache:
+    """Bounded LRU cache of planned step interval profiles.
+
+    One cache can be shared by many AccelStepper instances. A profile is the
+    list of step intervals of a move from stop to stop, keyed by the motion
+    parameters that shape it.
+    """
+
+#region Constructor
+
+    def __init__(self, capacity=256, path=None):
+        """Constructor
+
+        Args:
+            capacity (int, optional): Maximum number of profiles. Defaults to 256.
+            path (str, optional): File to persist the profiles in. Defaults to None.
+        """
+
+        self.__capacity = capacity
+        """Maximum number of profiles.
+        """
+
+        self.__path = path
+        """File to persist the profiles in.
+        """
+
+        self.__profiles = OrderedDict()
+        """Profiles from the least to the most recently used.
+        """
+
+        self.__hits = 0
+        """Lookups that found a profile.
+        """
+
+        self.__misses = 0
+        """Lookups that did not find a profile.
+        """
+
+        self.__evictions = 0
+        """Profiles dropped to stay in capacity.
+        """
+
+        if self.__path is not None:
+            try:
+                self.load()
+            except (OSError, ValueError, KeyError, TypeError):
+                # Cold start, nothing persisted yet or a file that can not be used.
+                pass
+
+#endregion
+
+#region Properties
+
+    @property
+    def capacity(self):
+        """Maximum number of profiles.
+
+        Returns:
+            int: Capacity.
+        """
+
+        return self.__capacity
+
+    @property
+    def hits(self):
+        """Lookups that found a profile.
+
+        Returns:
+            int: Hits count.
+        """
+
+        return self.__hits
+
+    @property
+    def misses(self):
+        """Lookups that did not find a profile.
+
+        Returns:
+            int: Misses count.
+        """
+
+        return self.__misses
+
+    @property
+    def evictions(self):
+        """Profiles dropped to stay in capacity.
+
+        Returns:
+            int: Evictions count.
+        """
+
+        return self.__evictions
+
+#endregion
+
+#region Public Methods
+
+    def __len__(self):
+
+        return len(self.__profiles)
+
+    def __contains__(self, key):
+
+        return key in self.__profiles
+
+    def get(self, key):
+        """Get a profile and mark it as most recently used.
+
+        Args:
+            key (tuple): Motion parameters.
+
+        Returns:
+            array: Step intervals, None if not cached.
+        """
+
+        profile = self.__profiles.pop(key, None)
+
+        if profile is None:
+            self.__misses += 1
+            return None
+
+        self.__profiles[key] = profile
+        self.__hits += 1
+
+        return profile
+
+    def put(self, key, profile):
+        """Store a profile, evicting the least recently used ones if full.
+
+        Args:
+            key (tuple): Motion parameters.
+            profile (array): Step intervals.
+        """
+
+        self.__profiles.pop(key, None)
+        self.__profiles[key] = profile
+
+        while len(self.__profiles) > self.__capacity:
+            del self.__profiles[next(iter(self.__profiles))]
+            self.__evictions += 1
+
+    def clear(self):
+        """Drop all profiles and reset the counters.
+        """
+
+        self.__profiles = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def save(self, path=None):
+        """Write the profiles to disk.
+
+        The profiles go to a temporary file that then replaces the cache
+        file, so a crash while saving leaves the old file in place.
+
+        Args:
+            path (str, optional): File name. Defaults to the cache file.
+        """
+
+        if path is None:
+            path = self.__path
+
+        profiles = []
+        for key in self.__profiles:
+            profiles.append([list(key), list(self.__profiles[key])])
+
+        temporary = path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump({"version": VERSION, "profiles": profiles}, f)
+            f.flush()
+            if hasattr(os, "fsync"):
+                os.fsync(f.fileno())
+
+        # MicroPython only has rename, which replaces the target there too.
+        if hasattr(os, "replace"):
+            os.replace(temporary, path)
+        else:
+            os.rename(temporary, path)
+
+    def load(self, path=None):
+        """Read profiles from disk, keeping their recency order.
+
+        Nothing is loaded from a file that fails to parse.
+
+        Args:
+            path (str, optional): File name. Defaults to the cache file.
+
+        Raises:
+            ValueError: The file is not a cache file of a known version.
+        """
+
+        if path is None:
+            path = self.__path
+
+        with open(path, "r") as f:
+            content = json.load(f)
+
+        if content["version"] != VERSION:
+            raise ValueError("Unknown profile cache version {}.".format(content["version"]))
+
+        profiles = [(tuple(key), array("d", profile)) for key, profile in content["profiles"]]
+
+        for key, profile in profiles:
+            self.put(key, profile)
+
+#endregion
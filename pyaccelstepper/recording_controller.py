@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+from array import array
+
+from pyaccelstepper.clock import Monotonic
+from pyaccelstepper.controller import IController
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+MODE = 0
+"""Record kind of a pin_mode call."""
+
+WRITE = 1
+"""Record kind of a digital_write call."""
+
+#endregion
+
+class RecordingController(IController):
+    """Controller that records every pin_mode and digital_write call.
+
+    The calls go to preallocated arrays with a timestamp from a high
+    resolution timer, nothing is allocated while the steppers run. Once
+    the buffer is full further calls are only counted. The recording can
+    be checked against the driver datasheet with pulse_widths,
+    setup_times and intervals, or dumped as a VCD file for any logic
+    analyzer viewer.
+    """
+
+#region Constructor
+
+    def __init__(self, config={}, capacity=65536, timer=None, timescale=None):
+        """Constructor
+
+        Args:
+            config (dict, optional): Controller configuration. Defaults to {}.
+            capacity (int, optional): Calls kept. Defaults to 65536.
+            timer (function, optional): Returns the time in integer timescale units, it must not wrap.
+                Defaults to Monotonic.ticks(), microseconds on MicroPython and nanoseconds elsewhere.
+            timescale (str, optional): VCD timescale of the timer. Defaults to "1 ns", or the unit of Monotonic.ticks().
+        """
+
+        super().__init__(config)
+
+        if "capacity" in config and config["capacity"] is not None:
+            capacity = int(config["capacity"])
+
+        ticks_diff = None
+        if timer is None:
+            timer = Monotonic.ticks
+            ticks_diff = Monotonic.ticks_diff
+            if timescale is None:
+                timescale = Monotonic.TICKS_TIMESCALE
+
+        if timescale is None:
+            timescale = "1 ns"
+
+        self.__capacity = capacity
+        """Calls kept.
+        """
+
+        self.__timer = timer
+        """Time source of the records.
+        """
+
+        self.__ticks_diff = ticks_diff
+        """Difference of two wrapping readings of the timer, None for a timer that does not wrap.
+        """
+
+        self.__timescale = timescale
+        """VCD timescale of the timer.
+        """
+
+        self.__count = 0
+        """Calls recorded.
+        """
+
+        self.__dropped = 0
+        """Calls that did not fit in the buffer.
+        """
+
+        try:
+            self.__times = array("q", [0]) * capacity
+        except ValueError:
+            # MicroPython has no 64 bit arrays, a list holds the ticks instead.
+            self.__times = [0] * capacity
+        self.__kinds = array("b", [0]) * capacity
+        self.__pins = array("l", [0]) * capacity
+        self.__values = array("l", [0]) * capacity
+
+#endregion
+
+#region Properties
+
+    @property
+    def capacity(self):
+        """Calls kept.
+
+        Returns:
+            int: Capacity.
+        """
+
+        return self.__capacity
+
+    @property
+    def count(self):
+        """Calls recorded.
+
+        Returns:
+            int: Count.
+        """
+
+        return self.__count
+
+    @property
+    def dropped(self):
+        """Calls that did not fit in the buffer.
+
+        Returns:
+            int: Dropped calls.
+        """
+
+        return self.__dropped
+
+#endregion
+
+#region Private Methods
+
+    def __record(self, kind, pin, value):
+        index = self.__count
+        if index >= self.__capacity:
+            self.__dropped += 1
+            return
+
+        self.__times[index] = self.__timer()
+        self.__kinds[index] = kind
+        self.__pins[index] = pin
+        self.__values[index] = value
+        self.__count = index + 1
+
+    def __timeline(self):
+        """Times of the records, unwrapped from the ticks of the timer.
+
+        Returns:
+            list: Time of every record in timer units, from the first record.
+        """
+
+        ticks_diff = self.__ticks_diff
+        times = []
+        total = 0
+        last = None
+        for index in range(self.__count):
+            stamp = self.__times[index]
+            if last is not None:
+                if ticks_diff is None:
+                    total += stamp - last
+                else:
+                    total += ticks_diff(stamp, last)
+            times.append(total)
+            last = stamp
+
+        return times
+
+    def __edges(self, pin):
+        """Times of the level changes of a pin.
+
+        Args:
+            pin (int): Pin index.
+
+        Returns:
+            list: (time, state) of every change.
+        """
+
+        times = self.__timeline()
+        edges = []
+        last = None
+        for index in range(self.__count):
+            if (self.__kinds[index] == WRITE) and (self.__pins[index] == pin):
+                state = 1 if self.__values[index] else 0
+                if state != last:
+                    edges.append((times[index], state))
+                    last = state
+
+        return edges
+
+#endregion
+
+#region Public Methods
+
+    def pin_mode(self, pin, mode):
+        self.__record(MODE, pin, mode)
+
+    def digital_write(self, pin, state):
+        self.__record(WRITE, pin, 1 if state else 0)
+
+    def clear(self):
+        """Forget the recorded calls.
+        """
+
+        self.__count = 0
+        self.__dropped = 0
+
+    def records(self):
+        """Recorded calls in order.
+
+        Returns:
+            list: (time, kind, pin, value) of every call, the time in timer units from the first call.
+        """
+
+        times = self.__timeline()
+
+        return [(times[index], self.__kinds[index],
+            self.__pins[index], self.__values[index])
+            for index in range(self.__count)]
+
+    def pulse_widths(self, pin, level=1):
+        """Widths of the pulses of a pin.
+
+        Args:
+            pin (int): Pin index.
+            level (int, optional): Level of the pulse. Defaults to 1.
+
+        Returns:
+            list: Width of every complete pulse in timer units.
+        """
+
+        widths = []
+        start = None
+        for time_stamp, state in self.__edges(pin):
+            if state == level:
+                start = time_stamp
+            elif start is not None:
+                widths.append(time_stamp - start)
+                start = None
+
+        return widths
+
+    def intervals(self, pin, level=1):
+        """Periods between the edges to a level, the step intervals of a step pin.
+
+        Args:
+            pin (int): Pin index.
+            level (int, optional): Level the edges go to. Defaults to 1.
+
+        Returns:
+            list: Time between consecutive edges in timer units.
+        """
+
+        times = [time_stamp for time_stamp, state in self.__edges(pin) if state == level]
+
+        return [times[index] - times[index - 1] for index in range(1, len(times))]
+
+    def setup_times(self, direction_pin, step_pin, level=1):
+        """Time from every direction change to the next step edge.
+
+        Args:
+            direction_pin (int): Direction pin index.
+            step_pin (int): Step pin index.
+            level (int, optional): Level of the step edge. Defaults to 1.
+
+        Returns:
+            list: Setup time of every direction change in timer units.
+        """
+
+        steps = [time_stamp for time_stamp, state in self.__edges(step_pin) if state == level]
+        changes = [time_stamp for time_stamp, _ in self.__edges(direction_pin)[1:]]
+
+        setups = []
+        index = 0
+        for change in changes:
+            while (index < len(steps)) and (steps[index] < change):
+                index += 1
+            if index < len(steps):
+                setups.append(steps[index] - change)
+
+        return setups
+
+    def to_vcd(self, path, names=None, module="stepper"):
+        """Write the recorded writes as a Value Change Dump.
+
+        Args:
+            path (str): File path.
+            names (dict, optional): Signal name per pin. Defaults to pinN.
+            module (str, optional): Scope of the signals. Defaults to "stepper".
+        """
+
+        if names is None:
+            names = {}
+
+        pins = []
+        for index in range(self.__count):
+            pin = self.__pins[index]
+            if pin not in pins:
+                pins.append(pin)
+
+        codes = {}
+        for index, pin in enumerate(pins):
+            code = ""
+            index += 1
+            while index > 0:
+                index -= 1
+                code += chr(33 + (index % 94))
+                index //= 94
+            codes[pin] = code
+
+        times = self.__timeline()
+
+        with open(path, "w") as vcd:
+            vcd.write("$version pyaccelstepper $end\n")
+            vcd.write("$timescale {} $end\n".format(self.__timescale))
+            vcd.write("$scope module {} $end\n".format(module))
+            for pin in pins:
+                name = str(names.get(pin, "pin{}".format(pin))).replace(" ", "_")
+                vcd.write("$var wire 1 {} {} $end\n".format(codes[pin], name))
+            vcd.write("$upscope $end\n")
+            vcd.write("$enddefinitions $end\n")
+            vcd.write("#0\n$dumpvars\n")
+            for pin in pins:
+                vcd.write("x{}\n".format(codes[pin]))
+            vcd.write("$end\n")
+
+            last_time = None
+            for index in range(self.__count):
+                if self.__kinds[index] != WRITE:
+                    continue
+                time_stamp = times[index]
+                if time_stamp != last_time:
+                    vcd.write("#{}\n".format(time_stamp))
+                    last_time = time_stamp
+                vcd.write("{}{}\n".format(self.__values[index], codes[self.__pins[index]]))
+
+#endregion
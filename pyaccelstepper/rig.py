@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import hashlib
+import json
+
+from pyaccelstepper.accel_stepper import AccelStepper, Deferred
+from pyaccelstepper.constants import InterfaceType, PreflightMode, ProfileType
+from pyaccelstepper.multi_stepper import MultiStepper
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+CONSTRUCTOR_KEYS = ("interface", "controller", "clock", "profile_type", "jerk",
+    "profile_cache", "preflight", "preflight_margin", "cb_cw", "cb_ccw", "pins",
+    "pins_inverted", "enable", "enable_inverted", "dispatcher")
+"""Axis settings that go to the constructor, the others go to configure()."""
+
+GROUP_KEYS = ("profile_type", "jerk", "preflight", "preflight_margin")
+"""Group settings that go to the MultiStepper."""
+
+#endregion
+
+class Rig:
+    """Steppers and groups built from a description.
+
+    The description is a dict, a JSON or a TOML file:
+
+        {
+            "defaults": {"speed_scale": 1, "acceleration": 500.0},
+            "axes": {
+                "base": {"interface": "FUNCTION", "cb_cw": ["base_cw"],
+                    "cb_ccw": ["base_ccw"], "max_speed": 1000.0,
+                    "precompile": [100, 1000]},
+                "elbow": {"interface": "DRIVER", "pins": [4, 5],
+                    "controller": "io", "max_speed": 500.0}
+            },
+            "groups": {"arm": {"axes": ["base", "elbow"]}}
+        }
+
+    Every axis gets the defaults under its own settings, which are applied
+    in one batch. Names of interfaces, profile types and preflight modes
+    are looked up in their classes, names of controllers and callbacks in
+    the given dicts, {"deferred": "name"} makes a Deferred callback. With a
+    cache directory the axes share a profile cache persisted under the
+    SHA-1 of the description, so the moves listed in precompile are
+    planned only on the first boot of a description.
+    """
+
+#region Constructor
+
+    def __init__(self, config, controllers=None, functions=None, cache_dir=None,
+        cache_capacity=1024):
+        """Constructor
+
+        Args:
+            config (dict): Description, or the path of a .json or .toml file.
+            controllers (dict, optional): Controllers by name, "default" for the axes without one. Defaults to None.
+            functions (dict, optional): Callbacks by name. Defaults to None.
+            cache_dir (str, optional): Directory of the profile caches. Defaults to None.
+            cache_capacity (int, optional): Profiles kept in the cache. Defaults to 1024.
+
+        Raises:
+            ValueError: Unknown names or settings, or a group over MultiStepper.MULTISTEPPER_MAX_STEPPERS.
+        """
+
+        if isinstance(config, str):
+            config = Rig.load(config)
+
+        if controllers is None:
+            controllers = {}
+
+        if functions is None:
+            functions = {}
+
+        self.__config = config
+        """Description of the rig.
+        """
+
+        self.__config_hash = Rig.hash(config)
+        """SHA-1 of the description.
+        """
+
+        self.__controllers = controllers
+        self.__functions = functions
+
+        self.__profile_cache = None
+        """Profile cache shared by the axes.
+        """
+
+        if cache_dir is not None:
+            from pyaccelstepper.profile_cache import ProfileCache
+
+            self.__profile_cache = ProfileCache(cache_capacity,
+                cache_dir.rstrip("/") + "/" + self.__config_hash + ".json")
+
+        self.__axes = {}
+        """Steppers by name, in the order of the description.
+        """
+
+        self.__groups = {}
+        """Groups by name.
+        """
+
+        self.__build()
+
+#endregion
+
+#region Properties
+
+    @property
+    def axes(self):
+        """Steppers by name.
+
+        Returns:
+            dict: Steppers.
+        """
+
+        return self.__axes
+
+    @property
+    def groups(self):
+        """Groups by name.
+
+        Returns:
+            dict: MultiSteppers.
+        """
+
+        return self.__groups
+
+    @property
+    def config_hash(self):
+        """SHA-1 of the description.
+
+        Returns:
+            str: Hex digest.
+        """
+
+        return self.__config_hash
+
+    @property
+    def profile_cache(self):
+        """Profile cache shared by the axes.
+
+        Returns:
+            ProfileCache: Cache, None without a cache directory.
+        """
+
+        return self.__profile_cache
+
+#endregion
+
+#region Private Methods
+
+    def __callbacks(self, names):
+        callbacks = []
+        for name in names:
+            if isinstance(name, dict):
+                callbacks.append(Deferred(self.__function(name["deferred"])))
+            else:
+                callbacks.append(self.__function(name))
+
+        return callbacks
+
+    def __function(self, name):
+        if name not in self.__functions:
+            raise ValueError("Unknown callback {}.".format(name))
+
+        return self.__functions[name]
+
+    def __settings(self, settings):
+        """Resolve the names in the settings of an axis or a group.
+
+        Args:
+            settings (dict): Settings.
+
+        Returns:
+            dict: Settings with objects in place of the names.
+        """
+
+        settings = dict(settings)
+
+        for key, names in (("interface", InterfaceType), ("profile_type", ProfileType),
+            ("preflight", PreflightMode)):
+
+            if isinstance(settings.get(key), str):
+                if not hasattr(names, settings[key]):
+                    raise ValueError("Unknown {} {}.".format(key, settings[key]))
+                settings[key] = getattr(names, settings[key])
+
+        if "controller" in settings:
+            name = settings["controller"]
+            if name not in self.__controllers:
+                raise ValueError("Unknown controller {}.".format(name))
+            settings["controller"] = self.__controllers[name]
+
+        elif "default" in self.__controllers:
+            settings["controller"] = self.__controllers["default"]
+
+        for key in ("cb_cw", "cb_ccw"):
+            if key in settings:
+                settings[key] = self.__callbacks(settings[key])
+
+        return settings
+
+    def __build(self):
+        defaults = self.__config.get("defaults", {})
+        compiled = False
+
+        for name, axis in self.__config.get("axes", {}).items():
+            settings = dict(defaults)
+            settings.update(axis)
+            precompile = settings.pop("precompile", ())
+            settings = self.__settings(settings)
+
+            if self.__profile_cache is not None:
+                settings["profile_cache"] = self.__profile_cache
+
+            stepper = AccelStepper(**{key: settings[key]
+                for key in CONSTRUCTOR_KEYS if key in settings})
+            stepper.configure(**{key: settings[key]
+                for key in settings if key not in CONSTRUCTOR_KEYS})
+
+            if precompile:
+                misses = self.__profile_cache.misses if self.__profile_cache is not None else 0
+                stepper.precompile(precompile)
+                if (self.__profile_cache is not None) and (self.__profile_cache.misses != misses):
+                    compiled = True
+
+            self.__axes[name] = stepper
+
+        for name, group in self.__config.get("groups", {}).items():
+            if isinstance(group, list):
+                group = {"axes": group}
+
+            settings = self.__settings({key: group[key] for key in GROUP_KEYS if key in group})
+            settings.pop("controller", None)
+
+            multi_stepper = MultiStepper(**settings)
+            for axis in group["axes"]:
+                if not multi_stepper.add(self.__axes[axis]):
+                    raise ValueError("Group {} has more than {} axes.".format(
+                        name, MultiStepper.MULTISTEPPER_MAX_STEPPERS))
+
+            self.__groups[name] = multi_stepper
+
+        if compiled:
+            self.__profile_cache.save()
+
+#endregion
+
+#region Public Methods
+
+    def __getitem__(self, name):
+        if name in self.__axes:
+            return self.__axes[name]
+
+        return self.__groups[name]
+
+    @staticmethod
+    def load(path):
+        """Read a description from a JSON or a TOML file.
+
+        Args:
+            path (str): File path, .toml files need tomllib or tomli.
+
+        Returns:
+            dict: Description.
+        """
+
+        if path.endswith(".toml"):
+            try:
+                import tomllib
+            except ImportError:
+                import tomli as tomllib
+
+            with open(path, "rb") as f:
+                return tomllib.load(f)
+
+        with open(path, "r") as f:
+            return json.load(f)
+
+    @staticmethod
+    def hash(config):
+        """SHA-1 of a description, independent of the order of the keys.
+
+        Args:
+            config (dict): Description.
+
+        Returns:
+            str: Hex digest.
+        """
+
+        text = json.dumps(config, sort_keys=True, separators=(",", ":"))
+
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+#endregion
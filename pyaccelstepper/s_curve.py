@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import math
+from array import array
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class SCurve:
+    """Jerk limited seven segment motion profile.
+
+    The move from stop to stop is split into jerk up, constant acceleration,
+    jerk down, cruise and the mirrored three segments of the deceleration,
+    which may use a different limit than the acceleration. Segments that do
+    not fit in the distance are shortened or dropped.
+    """
+
+#region Constructor
+
+    def __init__(self, distance, max_speed, acceleration, jerk, deceleration=None):
+        """Constructor
+
+        Args:
+            distance (int): Distance in steps.
+            max_speed (float): Maximum speed.
+            acceleration (float): Maximum acceleration.
+            jerk (float): Maximum jerk.
+            deceleration (float, optional): Maximum deceleration. Defaults to the acceleration.
+        """
+
+        self.__distance = abs(distance)
+        """Distance in steps.
+        """
+
+        self.__acceleration = abs(acceleration)
+        """Maximum acceleration.
+        """
+
+        self.__deceleration = self.__acceleration
+        """Maximum deceleration.
+        """
+
+        if deceleration:
+            self.__deceleration = abs(deceleration)
+
+        self.__jerk = abs(jerk)
+        """Maximum jerk.
+        """
+
+        self.__peak_speed = self.__find_peak_speed(abs(max_speed))
+        """Speed reached at the end of the acceleration.
+        """
+
+        self.__segments = self.__build_segments()
+        """Segments as (start time, duration, position, speed, acceleration, jerk).
+        """
+
+#endregion
+
+#region Properties
+
+    @property
+    def distance(self):
+        """Distance of the move.
+
+        Returns:
+            int: Distance in steps.
+        """
+
+        return self.__distance
+
+    @property
+    def peak_speed(self):
+        """Speed reached at the end of the acceleration.
+
+        Returns:
+            float: Peak speed.
+        """
+
+        return self.__peak_speed
+
+    @property
+    def duration(self):
+        """Duration of the move.
+
+        Returns:
+            float: Duration in seconds.
+        """
+
+        start, duration, position, speed, accel, jerk = self.__segments[-1]
+
+        return start + duration
+
+#endregion
+
+#region Private Methods
+
+    def __ramp(self, speed, accel):
+        """Jerk and constant acceleration times of a ramp from stop to speed.
+
+        Args:
+            speed (float): Speed at the end of the ramp.
+            accel (float): Maximum acceleration of the ramp.
+
+        Returns:
+            tuple: Jerk time, constant acceleration time.
+        """
+
+        if speed * self.__jerk >= accel * accel:
+            jerk_time = accel / self.__jerk
+            return jerk_time, (speed / accel) - jerk_time
+
+        return math.sqrt(speed / self.__jerk), 0.0
+
+    def __ramp_distance(self, speed, accel):
+        """Distance covered by a ramp from stop to speed.
+
+        Args:
+            speed (float): Speed at the end of the ramp.
+            accel (float): Maximum acceleration of the ramp.
+
+        Returns:
+            float: Distance in steps.
+        """
+
+        jerk_time, accel_time = self.__ramp(speed, accel)
+
+        # The speed curve is point symmetric, so the mean speed is the half.
+        return speed * ((2.0 * jerk_time) + accel_time) / 2.0
+
+    def __stop_distance(self, speed):
+        """Distance of the acceleration to speed and of the braking from it.
+
+        Args:
+            speed (float): Peak speed.
+
+        Returns:
+            float: Distance in steps.
+        """
+
+        return self.__ramp_distance(speed, self.__acceleration) + \
+            self.__ramp_distance(speed, self.__deceleration)
+
+    def __find_peak_speed(self, max_speed):
+        """Highest speed that still leaves room to stop.
+
+        Args:
+            max_speed (float): Maximum speed.
+
+        Returns:
+            float: Peak speed.
+        """
+
+        if self.__distance == 0:
+            return 0.0
+
+        if self.__stop_distance(max_speed) <= self.__distance:
+            return max_speed
+
+        low = 0.0
+        high = max_speed
+        for _ in range(60):
+            middle = (low + high) / 2.0
+            if self.__stop_distance(middle) <= self.__distance:
+                low = middle
+            else:
+                high = middle
+
+        return low
+
+    def __build_segments(self):
+        """Integrate the seven segments.
+
+        Returns:
+            list: Segments as (start time, duration, position, speed, acceleration, jerk).
+        """
+
+        jerk_time, accel_time = self.__ramp(self.__peak_speed, self.__acceleration)
+        decel_jerk_time, decel_time = self.__ramp(self.__peak_speed, self.__deceleration)
+        cruise = self.__distance - self.__stop_distance(self.__peak_speed)
+        cruise_time = 0.0
+        if self.__peak_speed > 0.0:
+            cruise_time = max(cruise, 0.0) / self.__peak_speed
+
+        jerk = self.__jerk
+        shape = [
+            (jerk_time, jerk),
+            (accel_time, 0.0),
+            (jerk_time, -jerk),
+            (cruise_time, 0.0),
+            (decel_jerk_time, -jerk),
+            (decel_time, 0.0),
+            (decel_jerk_time, jerk)]
+
+        segments = []
+        start = position = speed = accel = 0.0
+        for duration, jerk in shape:
+            if duration <= 0.0:
+                continue
+
+            segments.append((start, duration, position, speed, accel, jerk))
+
+            start += duration
+            position += (speed * duration) + (accel * duration * duration / 2.0) + \
+                (jerk * duration * duration * duration / 6.0)
+            speed += (accel * duration) + (jerk * duration * duration / 2.0)
+            accel += jerk * duration
+
+        if not segments:
+            segments.append((0.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+
+        return segments
+
+#endregion
+
+#region Public Methods
+
+    @staticmethod
+    def for_duration(distance, duration, max_speed, acceleration, jerk, deceleration=None):
+        """Slowest profile within the limits that does not take longer than the duration.
+
+        Used to synchronize several axes on the duration of the longest one.
+
+        Args:
+            distance (int): Distance in steps.
+            duration (float): Duration in seconds.
+            max_speed (float): Maximum speed.
+            acceleration (float): Maximum acceleration.
+            jerk (float): Maximum jerk.
+            deceleration (float, optional): Maximum deceleration. Defaults to the acceleration.
+
+        Returns:
+            SCurve: Profile.
+        """
+
+        profile = SCurve(distance, max_speed, acceleration, jerk, deceleration)
+        if profile.duration >= duration:
+            return profile
+
+        low = 0.0
+        high = profile.peak_speed
+        for _ in range(60):
+            middle = (low + high) / 2.0
+            if SCurve(distance, middle, acceleration, jerk, deceleration).duration > duration:
+                low = middle
+            else:
+                high = middle
+
+        return SCurve(distance, high, acceleration, jerk, deceleration)
+
+    def position_at(self, t):
+        """Position at a time of the move.
+
+        Args:
+            t (float): Time from the start in seconds.
+
+        Returns:
+            float: Position in steps.
+        """
+
+        for start, duration, position, speed, accel, jerk in self.__segments:
+            if t < start + duration:
+                t = max(t - start, 0.0)
+                return position + (speed * t) + (accel * t * t / 2.0) + (jerk * t * t * t / 6.0)
+
+        return float(self.__distance)
+
+    def intervals(self, scale=1.0):
+        """Step intervals in the timing units of AccelStepper.
+
+        Step k is issued when the curve passes k - 0.5 steps.
+
+        Args:
+            scale (float, optional): Speed scale of the axis. Defaults to 1.0.
+
+        Returns:
+            array: Step intervals.
+        """
+
+        profile = array("d")
+        index = 0
+        local = 0.0
+        last = 0.0
+
+        for step in range(self.__distance):
+            goal = step + 0.5
+
+            # Find the segment, the steps only move forward.
+            while True:
+                start, duration, position, speed, accel, jerk = self.__segments[index]
+                end = position + (speed * duration) + (accel * duration * duration / 2.0) + \
+                    (jerk * duration * duration * duration / 6.0)
+                if (goal <= end) or (index == len(self.__segments) - 1):
+                    break
+                index += 1
+                local = 0.0
+
+            # Safeguarded Newton on the cubic of the segment.
+            low = local
+            high = duration
+            t = local
+            for _ in range(60):
+                value = position + (speed * t) + (accel * t * t / 2.0) + \
+                    (jerk * t * t * t / 6.0) - goal
+                if abs(value) < 1e-9:
+                    break
+                if value < 0.0:
+                    low = t
+                else:
+                    high = t
+                slope = speed + (accel * t) + (jerk * t * t / 2.0)
+                if slope > 0.0:
+                    t = t - (value / slope)
+                if (slope <= 0.0) or (t <= low) or (t >= high):
+                    t = (low + high) / 2.0
+                if high - low < 1e-12:
+                    break
+
+            local = t
+            now = start + t
+            profile.append((now - last) * scale)
+            last = now
+
+        return profile
+
+#endregion
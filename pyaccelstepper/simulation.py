@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import math
+
+from pyaccelstepper.clock import Clock
+from pyaccelstepper.controller import Edge, IController
+from pyaccelstepper.multi_stepper import MultiStepper
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class VirtualClock:
+    """Clock that only moves when the simulator moves it.
+
+    Pass it as the clock of the simulated steppers.
+    """
+
+#region Constructor
+
+    def __init__(self, start=0.0):
+        """Constructor
+
+        Args:
+            start (float, optional): Start time in clock units. Defaults to 0.0.
+        """
+
+        self.now = start
+        """Current time in clock units.
+        """
+
+#endregion
+
+#region Public Methods
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, delta):
+        """Move the clock forward.
+
+        Args:
+            delta (float): Time in clock units.
+        """
+
+        self.now += delta
+
+#endregion
+
+class SimulatedController(IController):
+    """Controller that keeps the pin states and logs every write with its time.
+
+    Inputs are driven with set_input(), it reports their edges.
+    """
+
+#region Constructor
+
+    def __init__(self, clock, config={}):
+        """Constructor
+
+        Args:
+            clock (VirtualClock): Clock of the simulation.
+            config (dict, optional): Controller configuration. Defaults to {}.
+        """
+
+        super().__init__(config)
+
+        self.__clock = clock
+        """Clock of the simulation.
+        """
+
+        self.modes = {}
+        """Mode of every pin.
+        """
+
+        self.states = {}
+        """Last state of every pin.
+        """
+
+        self.events = []
+        """Time, pin and state of every write.
+        """
+
+        self.__edge_callbacks = {}
+        """Callback and edge pairs of every input.
+        """
+
+#endregion
+
+#region Public Methods
+
+    def pin_mode(self, pin, mode):
+        self.modes[pin] = mode
+
+    def digital_write(self, pin, state):
+        self.states[pin] = state
+        self.events.append((self.__clock.now, pin, state))
+
+    def digital_read(self, pin):
+        return self.states.get(pin, 0)
+
+    def add_edge_callback(self, pin, callback, edge=Edge.Both):
+        self.__edge_callbacks.setdefault(pin, []).append((callback, edge))
+        return True
+
+    def remove_edge_callback(self, pin, callback):
+        if pin in self.__edge_callbacks:
+            self.__edge_callbacks[pin] = [item for item in self.__edge_callbacks[pin]
+                if item[0] != callback]
+
+    def set_input(self, pin, state):
+        """Drive an input and report the edge.
+
+        Args:
+            pin (int): Pin index.
+            state (int): New state.
+        """
+
+        state = 1 if state else 0
+        if self.states.get(pin, 0) == state:
+            return
+
+        self.states[pin] = state
+        edge = Edge.Rising if state else Edge.Falling
+        for callback, edges in list(self.__edge_callbacks.get(pin, ())):
+            if edges & edge:
+                callback(pin, state)
+
+#endregion
+
+class Simulator:
+    """Runs the steppers in virtual time.
+
+    Instead of polling the clock the simulator jumps straight to the next
+    step deadline, so the moves take only as long as their steps take to
+    compute, and records the position of every stepper after every step.
+    The steppers must use the clock of the simulator. The simulator
+    replaces the DRIVER pulse sleep of the added steppers with one that
+    returns at once, the pulse width takes no virtual time.
+    """
+
+#region Constructor
+
+    def __init__(self, clock=None):
+        """Constructor
+
+        Args:
+            clock (VirtualClock, optional): Clock of the steppers. Defaults to a new one.
+        """
+
+        if clock is None:
+            clock = VirtualClock()
+
+        self.__clock = clock
+        """Clock of the simulation.
+        """
+
+        self.__runners = []
+        """Run function and steppers of every added item.
+        """
+
+        self.__steppers = []
+        """Simulated steppers and whether they belong to a group.
+        """
+
+        self.__positions = []
+        """Time and position of every step, per stepper.
+        """
+
+#endregion
+
+#region Properties
+
+    @property
+    def clock(self):
+        """Clock of the simulation.
+
+        Returns:
+            VirtualClock: Clock.
+        """
+
+        return self.__clock
+
+    @property
+    def positions(self):
+        """Recorded steps, one list of (time, position) per stepper.
+
+        Returns:
+            list: Records in the order the steppers were added.
+        """
+
+        return self.__positions
+
+#endregion
+
+#region Private Methods
+
+    def __next_time(self, now):
+        # math.nextafter needs Python 3.9, step up by one epsilon before it.
+        if hasattr(math, "nextafter"):
+            return math.nextafter(now, math.inf)
+
+        if now == 0.0:
+            return 5e-324
+
+        return now + abs(now) * 2.0 ** -52
+
+    def __is_active(self, index):
+        stepper, grouped = self.__steppers[index]
+
+        if stepper.distance_to_go != 0:
+            return True
+
+        # A group stops stepping at the target, a single stepper stops at rest.
+        return (not grouped) and (stepper.speed != 0.0)
+
+    def __tick(self):
+        running = False
+        for run in self.__runners:
+            if run():
+                running = True
+
+        now = self.__clock.now
+        for index in range(len(self.__steppers)):
+            position = self.__steppers[index][0].current_position
+            record = self.__positions[index]
+            if record[-1][1] != position:
+                record.append((now, position))
+
+        return running
+
+#endregion
+
+#region Public Methods
+
+    def add(self, item):
+        """Add an AccelStepper, run with run(), or a MultiStepper, run with its own run().
+
+        The DRIVER pulse sleep of the steppers is stubbed out.
+
+        Args:
+            item (AccelStepper or MultiStepper): Item to simulate.
+        """
+
+        if isinstance(item, MultiStepper):
+            steppers = item.steppers
+            grouped = True
+        else:
+            steppers = [item]
+            grouped = False
+
+        self.__runners.append(item.run)
+
+        for stepper in steppers:
+            stepper.configure(sleep=Clock.skip_sleep)
+            self.__steppers.append((stepper, grouped))
+            self.__positions.append([(self.__clock.now, stepper.current_position)])
+
+    def run(self, until=None):
+        """Run until every stepper has stopped.
+
+        Args:
+            until (float, optional): Stop the simulation at this time. Defaults to None.
+
+        Returns:
+            float: Time at the end of the simulation.
+        """
+
+        clock = self.__clock
+
+        running = self.__tick()
+
+        while running:
+            due = None
+            deadline = None
+            for index in range(len(self.__steppers)):
+                if not self.__is_active(index):
+                    continue
+                current = self.__steppers[index][0].next_step_time
+                if (current is not None) and ((deadline is None) or (current < deadline)):
+                    due = index
+                    deadline = current
+
+            if due is None:
+                # Running without a step pending, nothing will change any more.
+                break
+
+            if (until is not None) and (deadline > until):
+                clock.now = until
+                break
+
+            if deadline > clock.now:
+                clock.now = deadline
+
+            stepper = self.__steppers[due][0]
+            position = stepper.current_position
+            running = self.__tick()
+
+            # The last step time plus the interval may round below the
+            # interval, so move up one representable time until it steps.
+            while running and (stepper.current_position == position) and self.__is_active(due):
+                clock.now = self.__next_time(clock.now)
+                running = self.__tick()
+
+        return clock.now
+
+    def pin_states(self, controller, time):
+        """Pin states of a simulated controller at a moment.
+
+        Args:
+            controller (SimulatedController): Controller of the simulated steppers.
+            time (float): Time in clock units.
+
+        Returns:
+            dict: State of every pin written up to the moment.
+        """
+
+        states = {}
+        for event_time, pin, state in controller.events:
+            if event_time > time:
+                break
+            states[pin] = state
+
+        return states
+
+#endregion
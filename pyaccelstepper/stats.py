@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+from pyaccelstepper.clock import Monotonic
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+LATENESS_BUCKETS = (0.00001, 0.0001, 0.001, 0.01)
+"""Upper bounds of the lateness histogram buckets in clock units, the last bucket takes the rest."""
+
+#endregion
+
+class StepStats:
+    """Runtime statistics of one axis.
+
+    Set it as AccelStepper.stats to switch them on. The stepper then counts
+    the steps and the clock polls of run_speed(), measures how late every
+    step is against its deadline on the stepper clock and the time spent in
+    the controller and in the state machine on a high resolution timer.
+    A single thread writes, snapshot() is cheap to call from another one.
+    """
+
+#region Constructor
+
+    def __init__(self, buckets=LATENESS_BUCKETS, late_after=None):
+        """Constructor
+
+        Args:
+            buckets (tuple, optional): Upper bounds of the lateness buckets in clock units. Defaults to LATENESS_BUCKETS.
+            late_after (float, optional): Lateness that makes a step late. Defaults to the first bucket bound.
+        """
+
+        self.buckets = tuple(buckets)
+        """Upper bounds of the lateness buckets.
+        """
+
+        self.late_after = self.buckets[0] if late_after is None else late_after
+        """Lateness that makes a step late.
+        """
+
+        self.timer = Monotonic.now
+        """High resolution timer of the controller and the math time.
+        """
+
+        self.elapsed = Monotonic.elapsed
+        """Seconds between two timer readings, replace it together with the timer.
+        """
+
+        self.reset()
+
+#endregion
+
+#region Public Methods
+
+    def reset(self):
+        """Clear the statistics.
+        """
+
+        self.steps = 0
+        """Steps issued.
+        """
+
+        self.polls = 0
+        """Clock readings of run_speed(), one per call with a step pending.
+        """
+
+        self.late_steps = 0
+        """Steps later than late_after.
+        """
+
+        self.histogram = [0] * (len(self.buckets) + 1)
+        """Steps per lateness bucket.
+        """
+
+        self.max_jitter = 0.0
+        """Largest lateness of a step.
+        """
+
+        self.controller_time = 0.0
+        """Time spent in the step function, the controller and the callbacks.
+        """
+
+        self.math_time = 0.0
+        """Time spent in the state machine.
+        """
+
+        self.last_reading = 0.0
+        """Last reading of the stepper clock.
+        """
+
+        self.last_step = None
+        """Clock reading of the last step.
+        """
+
+    def add_lateness(self, lateness):
+        """Count the lateness of a step.
+
+        Args:
+            lateness (float): Time past the deadline in clock units.
+        """
+
+        index = 0
+        for bound in self.buckets:
+            if lateness < bound:
+                break
+            index += 1
+        self.histogram[index] += 1
+
+        if lateness > self.late_after:
+            self.late_steps += 1
+
+        if lateness > self.max_jitter:
+            self.max_jitter = lateness
+
+    def snapshot(self):
+        """Copy of the statistics.
+
+        Returns:
+            dict: Statistics.
+        """
+
+        steps = self.steps
+
+        return {
+            "steps": steps,
+            "polls": self.polls,
+            "polls_per_step": (self.polls / steps) if steps else 0.0,
+            "late_steps": self.late_steps,
+            "buckets": self.buckets,
+            "histogram": list(self.histogram),
+            "max_jitter": self.max_jitter,
+            "controller_time": self.controller_time,
+            "math_time": self.math_time,
+            }
+
+    @staticmethod
+    def merge(snapshots):
+        """Add up the snapshots of several axes.
+
+        Args:
+            snapshots (list): Snapshots with the same buckets.
+
+        Returns:
+            dict: Statistics of the group, the jitter is the largest one.
+        """
+
+        total = {
+            "steps": 0,
+            "polls": 0,
+            "polls_per_step": 0.0,
+            "late_steps": 0,
+            "buckets": LATENESS_BUCKETS,
+            "histogram": [0] * (len(LATENESS_BUCKETS) + 1),
+            "max_jitter": 0.0,
+            "controller_time": 0.0,
+            "math_time": 0.0,
+            }
+
+        first = True
+        for snapshot in snapshots:
+            if first:
+                total["buckets"] = snapshot["buckets"]
+                total["histogram"] = [0] * len(snapshot["histogram"])
+                first = False
+            for key in ("steps", "polls", "late_steps", "controller_time", "math_time"):
+                total[key] += snapshot[key]
+            for index in range(len(total["histogram"])):
+                total["histogram"][index] += snapshot["histogram"][index]
+            total["max_jitter"] = max(total["max_jitter"], snapshot["max_jitter"])
+
+        if total["steps"]:
+            total["polls_per_step"] = total["polls"] / total["steps"]
+
+        return total
+
+#endregion
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import os
+import struct
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+#region Variables
+
+HEADER = struct.Struct("<4sIIQ")
+"""Trace file header: magic, version, capacity and records written."""
+
+RECORD = struct.Struct("<dddqq")
+"""Trace file record: scheduled time, actual time, interval, position and n."""
+
+MAGIC = b"PAST"
+"""Magic of the trace files."""
+
+FIELDS = ("scheduled", "actual", "interval", "position", "n")
+"""Fields of a record."""
+
+#endregion
+
+class StepTrace:
+    """Fixed size ring of the last steps of an axis.
+
+    Set it as AccelStepper.trace. Every step records the time it was due,
+    the time it fired, the interval, the position and the state machine
+    index, whose sign tells the phase. The ring sits in preallocated
+    arrays, or in a memory mapped file that survives a crash of the
+    process and never grows.
+    """
+
+#region Constructor
+
+    def __init__(self, capacity=4096, path=None):
+        """Constructor
+
+        Args:
+            capacity (int, optional): Steps kept. Defaults to 4096.
+            path (str, optional): Memory map the ring to this file. Defaults to None.
+        """
+
+        self.__capacity = capacity
+        """Steps kept.
+        """
+
+        self.__count = 0
+        """Steps recorded since the start.
+        """
+
+        self.__file = None
+        """Backing file of the memory map.
+        """
+
+        self.__map = None
+        """Memory map of the ring.
+        """
+
+        self.__closed = False
+        """The backing file is closed, the steps are no longer recorded.
+        """
+
+        if path is None:
+            self.__scheduled = array("d", [0.0]) * capacity
+            self.__actual = array("d", [0.0]) * capacity
+            self.__interval = array("d", [0.0]) * capacity
+            self.__position = array("l", [0]) * capacity
+            self.__n = array("l", [0]) * capacity
+            self.record = self.__record_array
+
+        else:
+            self.__open(path)
+            self.record = self.__record_map
+
+#endregion
+
+#region Properties
+
+    @property
+    def capacity(self):
+        """Steps kept.
+
+        Returns:
+            int: Capacity.
+        """
+
+        return self.__capacity
+
+    @property
+    def count(self):
+        """Steps recorded since the start, including the overwritten ones.
+
+        Returns:
+            int: Count.
+        """
+
+        return self.__count
+
+#endregion
+
+#region Private Methods
+
+    def __open(self, path):
+        """Open or create the backing file, an existing trace continues.
+
+        Args:
+            path (str): File path.
+        """
+
+        import mmap
+
+        size = HEADER.size + (RECORD.size * self.__capacity)
+
+        exists = os.path.exists(path) and (os.path.getsize(path) == size)
+        self.__file = open(path, "r+b" if exists else "w+b")
+        if not exists:
+            self.__file.truncate(size)
+
+        self.__map = mmap.mmap(self.__file.fileno(), size)
+
+        if exists:
+            magic, version, capacity, count = HEADER.unpack_from(self.__map, 0)
+            if (magic == MAGIC) and (capacity == self.__capacity):
+                self.__count = count
+
+        HEADER.pack_into(self.__map, 0, MAGIC, 1, self.__capacity, self.__count)
+
+    def __record_array(self, scheduled, actual, interval, position, n):
+        index = self.__count % self.__capacity
+        self.__scheduled[index] = scheduled
+        self.__actual[index] = actual
+        self.__interval[index] = interval
+        self.__position[index] = position
+        self.__n[index] = n
+        self.__count += 1
+
+    def __record_map(self, scheduled, actual, interval, position, n):
+        # A stepper bound before close() keeps calling, its steps are dropped.
+        if self.__closed:
+            return
+
+        index = self.__count % self.__capacity
+        RECORD.pack_into(self.__map, HEADER.size + (RECORD.size * index),
+            scheduled, actual, interval, position, n)
+        self.__count += 1
+        # The count goes last, a crash mid record loses only that record.
+        HEADER.pack_into(self.__map, 0, MAGIC, 1, self.__capacity, self.__count)
+
+    def __read(self, index):
+        if self.__map is None:
+            return (self.__scheduled[index], self.__actual[index],
+                self.__interval[index], self.__position[index], self.__n[index])
+
+        return RECORD.unpack_from(self.__map, HEADER.size + (RECORD.size * index))
+
+#endregion
+
+#region Public Methods
+
+    def records(self):
+        """Records kept, oldest first.
+
+        Raises:
+            ValueError: The memory mapped trace is closed.
+
+        Returns:
+            list: Tuples in the order of FIELDS.
+        """
+
+        if self.__closed:
+            raise ValueError("The step trace is closed, reopen it with StepTrace.load().")
+
+        kept = min(self.__count, self.__capacity)
+        first = self.__count - kept
+
+        return [self.__read((first + offset) % self.__capacity) for offset in range(kept)]
+
+    def clear(self):
+        """Forget the recorded steps.
+        """
+
+        self.__count = 0
+        if self.__map is not None:
+            HEADER.pack_into(self.__map, 0, MAGIC, 1, self.__capacity, 0)
+
+    def flush(self):
+        """Write the memory mapped ring through to the file.
+        """
+
+        if self.__map is not None:
+            self.__map.flush()
+
+    def close(self):
+        """Flush and close the backing file.
+
+        Further steps are not recorded and the records can only be read
+        back with load().
+        """
+
+        if self.__map is not None:
+            self.__map.flush()
+            self.__map.close()
+            self.__file.close()
+            self.__map = None
+            self.__file = None
+            self.__closed = True
+
+    def to_csv(self, path):
+        """Export the records to a CSV file.
+
+        Args:
+            path (str): File path.
+        """
+
+        with open(path, "w") as f:
+            f.write(",".join(FIELDS) + "\n")
+            for record in self.records():
+                f.write("{!r},{!r},{!r},{},{}\n".format(*record))
+
+    def to_numpy(self):
+        """Export the records to a NumPy structured array.
+
+        Returns:
+            numpy.ndarray: Records, oldest first.
+        """
+
+        if numpy is None:
+            raise ImportError("NumPy is not installed.")
+
+        dtype = [("scheduled", "f8"), ("actual", "f8"), ("interval", "f8"),
+            ("position", "i8"), ("n", "i8")]
+
+        return numpy.array(self.records(), dtype=dtype)
+
+    @staticmethod
+    def load(path):
+        """Open a trace file left by an earlier run.
+
+        Args:
+            path (str): File path.
+
+        Returns:
+            StepTrace: Trace that continues in the file.
+        """
+
+        with open(path, "rb") as f:
+            magic, version, capacity, count = HEADER.unpack(f.read(HEADER.size))
+
+        if magic != MAGIC:
+            raise ValueError("Not a step trace file: {}".format(path))
+
+        return StepTrace(capacity, path)
+
+#endregion
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import unittest
+
+from pyaccelstepper.dispatcher import CallbackDispatcher
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class TestCallbackDispatcher(unittest.TestCase):
+    """The ring of CallbackDispatcher has a single reader.
+    """
+
+    def setUp(self):
+        self.positions = []
+
+    def __callback(self, position, direction, time_stamp):
+        self.positions.append(position)
+
+    def test_drain_refused_while_worker_runs(self):
+        dispatcher = CallbackDispatcher()
+        try:
+            with self.assertRaises(RuntimeError):
+                dispatcher.drain()
+        finally:
+            dispatcher.stop()
+
+    def test_stop_runs_the_queue(self):
+        dispatcher = CallbackDispatcher()
+        for position in range(5):
+            dispatcher.post(self.__callback, position, 1, 0.0)
+        dispatcher.stop()
+
+        self.assertEqual(self.positions, [0, 1, 2, 3, 4])
+        self.assertEqual(dispatcher.drain(), 0)
+
+    def test_drain_without_worker(self):
+        dispatcher = CallbackDispatcher(start=False)
+        for position in range(3):
+            dispatcher.post(self.__callback, position, 1, 0.0)
+
+        self.assertEqual(dispatcher.drain(limit=2), 2)
+        self.assertEqual(dispatcher.drain(), 1)
+        self.assertEqual(self.positions, [0, 1, 2])
+
+if __name__ == "__main__":
+    unittest.main()
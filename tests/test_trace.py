@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import os
+import tempfile
+import unittest
+
+from pyaccelstepper.trace import StepTrace
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class TestStepTrace(unittest.TestCase):
+    """Memory mapped StepTrace after close().
+    """
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".trace")
+        os.close(handle)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_record_after_close_is_dropped(self):
+        trace = StepTrace(8, self.path)
+        record = trace.record
+        record(1.0, 1.0, 0.5, 1, 1)
+        trace.close()
+
+        # A stepper bound before close() still holds the record function.
+        record(2.0, 2.0, 0.5, 2, 2)
+        trace.record(3.0, 3.0, 0.5, 3, 3)
+
+        self.assertEqual(trace.count, 1)
+
+    def test_records_after_close_raise(self):
+        trace = StepTrace(8, self.path)
+        trace.record(1.0, 1.0, 0.5, 1, 1)
+        trace.close()
+
+        with self.assertRaises(ValueError):
+            trace.records()
+
+    def test_load_after_close(self):
+        trace = StepTrace(8, self.path)
+        trace.record(1.0, 1.0, 0.5, 1, 1)
+        trace.close()
+
+        reopened = StepTrace.load(self.path)
+        self.assertEqual(reopened.records(), [(1.0, 1.0, 0.5, 1, 1)])
+        reopened.close()
+
+if __name__ == "__main__":
+    unittest.main()
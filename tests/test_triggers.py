@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf8 -*-
+
+"""
+
+MIT License
+
+Copyright (c) [2023] [Orlin Dimitrov]
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial SerialPortions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+import unittest
+
+from pyaccelstepper.accel_stepper import AccelStepper
+from pyaccelstepper.simulation import Simulator
+
+#region File Attributes
+
+__author__ = "Orlin Dimitrov"
+"""Author of the file."""
+
+__copyright__ = "Copyright 2023, Orlin Dimitrov"
+"""Copyright holder"""
+
+__credits__ = []
+"""Credits"""
+
+__license__ = "MIT"
+"""License: https://choosealicense.com/licenses/mit/"""
+
+__version__ = "1.0.0"
+"""Version of the file."""
+
+__maintainer__ = "Orlin Dimitrov"
+"""Name of the maintainer."""
+
+__email__ = "robko01@8bitclub.com"
+"""E-mail of the author."""
+
+__status__ = "Debug"
+"""File status."""
+
+#endregion
+
+class Counter:
+    """Trigger target with a bound method callback.
+    """
+
+    def __init__(self):
+        self.hits = []
+
+    def hit(self, position, direction):
+        self.hits.append(position)
+
+class TestTriggers(unittest.TestCase):
+    """Position triggers of AccelStepper.
+    """
+
+    def __run(self, stepper, target):
+        simulator = Simulator()
+        stepper.configure(clock=simulator.clock, max_speed=500, acceleration=1000)
+        stepper.move_to(target)
+        simulator.add(stepper)
+        simulator.run()
+
+    def test_bound_method_fires(self):
+        counter = Counter()
+        stepper = AccelStepper()
+        stepper.add_trigger(10, counter.hit)
+
+        self.__run(stepper, 20)
+
+        self.assertEqual(counter.hits, [10])
+
+    def test_remove_bound_method(self):
+        # Every attribute access makes a new bound method, removal compares them by equality.
+        counter = Counter()
+        stepper = AccelStepper()
+        stepper.add_trigger(10, counter.hit)
+        stepper.remove_trigger(10, counter.hit)
+
+        self.__run(stepper, 20)
+
+        self.assertEqual(counter.hits, [])
+
+    def test_remove_keeps_other_callbacks(self):
+        first = Counter()
+        second = Counter()
+        stepper = AccelStepper()
+        stepper.add_trigger(10, first.hit)
+        stepper.add_trigger(10, second.hit)
+        stepper.remove_trigger(10, first.hit)
+
+        self.__run(stepper, 20)
+
+        self.assertEqual(first.hits, [])
+        self.assertEqual(second.hits, [10])
+
+if __name__ == "__main__":
+    unittest.main()